@@ -0,0 +1,67 @@
+"""
+Startup-time benchmark for headless solver runs.
+
+Runs `vrp_ga.py` without --visualize in fresh interpreters, reports the
+import and end-to-end times, and fails if any GUI/plotting/PDF module was
+imported along the way.
+
+    python benchmark_startup.py --runs 5 --gens 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Top-level packages a headless solve must not load.
+GUI_MODULES = ("pygame", "matplotlib", "pylab", "reportlab", "tkinter", "PyQt5", "PySide6", "PIL")
+
+_PROBE = """
+import json, runpy, sys, time
+t0 = time.perf_counter()
+import vrp_ga
+t1 = time.perf_counter()
+sys.argv = ["vrp_ga.py"] + {argv!r}
+runpy.run_path({script!r}, run_name="__main__")
+t2 = time.perf_counter()
+gui = sorted({{m.split(".")[0] for m in sys.modules}} & set({gui!r}))
+print("STARTUP " + json.dumps({{"import": t1 - t0, "total": t2 - t0, "gui": gui}}))
+"""
+
+
+def probe(argv: List[str]) -> Dict[str, object]:
+    """One headless run in a fresh interpreter (cwd is a temporary directory,
+    so the report files the CLI writes do not touch the repository)."""
+    code = _PROBE.format(argv=argv, script=os.path.join(ROOT, "vrp_ga.py"), gui=GUI_MODULES)
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    with tempfile.TemporaryDirectory() as cwd:
+        out = subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True, check=True).stdout
+    line = next(l for l in reversed(out.splitlines()) if l.startswith("STARTUP "))
+    return json.loads(line[len("STARTUP "):])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tempo de inicialização do vrp_ga sem visualização")
+    parser.add_argument("--runs", type=int, default=5, help="Execuções (interpretadores novos)")
+    parser.add_argument("--gens", type=int, default=5, help="Gerações por execução")
+    parser.add_argument("--data", type=str, default=None, help="Instância (padrão: aleatória)")
+    args = parser.parse_args()
+
+    argv = ["--gens", str(args.gens), "--seed", "42"] + (["--data", os.path.abspath(args.data)] if args.data else [])
+    results = [probe(argv) for _ in range(args.runs)]
+    imports = [r["import"] * 1000 for r in results]
+    totals = [r["total"] * 1000 for r in results]
+    print(f"import vrp_ga: mediana {statistics.median(imports):.1f} ms (mín {min(imports):.1f})")
+    print(f"execução completa ({args.gens} gerações): mediana {statistics.median(totals):.1f} ms (mín {min(totals):.1f})")
+
+    loaded = sorted({m for r in results for m in r["gui"]})
+    if loaded:
+        raise AssertionError(f"execução sem --visualize importou módulos de interface: {loaded}")
+    print("nenhum módulo de interface importado")
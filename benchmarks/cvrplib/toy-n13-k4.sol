@@ -0,0 +1,5 @@
+Route #1: 8 11 1
+Route #2: 3 4 2 6
+Route #3: 9 5 7
+Route #4: 12 10
+Cost 435.7225
@@ -0,0 +1,4 @@
+Route #1: 2 4 1
+Route #2: 8 3 7
+Route #3: 6 5
+Cost 286.8012
@@ -0,0 +1,4 @@
+Route #1: 4 1 9
+Route #2: 2 10 7
+Route #3: 3 5 8 6
+Cost 264.9464
@@ -4,17 +4,10 @@ Created on Fri Dec 22 16:03:11 2023
 
 @author: SérgioPolimante
 """
-import pylab
-import matplotlib.pyplot as plt
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_agg import FigureCanvasAgg
-import matplotlib
 import pygame
 from typing import List, Tuple
 import numpy as np
 
-matplotlib.use("Agg")
-
 
 def draw_plot(screen: pygame.Surface, x: list, y: list, x_label: str = 'Generation', y_label: str = 'Fitness') -> None:
     """
@@ -27,6 +20,13 @@ def draw_plot(screen: pygame.Surface, x: list, y: list, x_label: str = 'Generati
     - x_label (str): Label for the x-axis (default is 'Generation').
     - y_label (str): Label for the y-axis (default is 'Fitness').
     """
+    # matplotlib is imported on first use: it is the slowest import of the
+    # TSP demo and only the convergence plot needs it
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
     fig, ax = plt.subplots(figsize=(4, 4), dpi=100)
     ax.plot(x, y)
     ax.set_ylabel(y_label)
@@ -38,7 +38,6 @@ def draw_plot(screen: pygame.Surface, x: list, y: list, x_label: str = 'Generati
     raw_data = canvas.tostring_argb()
 
     size = canvas.get_width_height()
-    import numpy as np
     arr = np.frombuffer(raw_data, dtype=np.uint8).reshape((size[1], size[0], 4))
     arr = arr[:, :, [1, 2, 3, 0]]  # ARGB -> RGBA
     surf = pygame.image.frombuffer(arr.tobytes(), size, "RGBA")
@@ -82,7 +82,9 @@ def order_crossover(parent1: List[Tuple[float, float]], parent2: List[Tuple[floa
 
     # Fill in the remaining positions with genes from parent2
     remaining_positions = [i for i in range(length) if i < start_index or i >= end_index]
-    remaining_genes = [gene for gene in parent2 if gene not in child]
+    # set lookup keeps the fill linear instead of quadratic in the tour length
+    child_genes = set(child)
+    remaining_genes = [gene for gene in parent2 if gene not in child_genes]
 
     for position, gene in zip(remaining_positions, remaining_genes):
         child.insert(position, gene)
@@ -11,23 +11,39 @@ from llm_integration import (
 )
 
 parser = argparse.ArgumentParser(description="Interface CLI para LLM Gemini")
+parser.add_argument("--instancia", default=None, help="Instância VRP (JSON, binário, .vrp ou .txt) a resolver; as rotas encontradas viram os dados da consulta")
+parser.add_argument("--gens", type=int, default=200, help="Gerações do GA ao usar --instancia")
 subparsers = parser.add_subparsers(dest="comando")
 
 sp1 = subparsers.add_parser("instrucoes", help="Gerar instruções para motoristas")
-sp1.add_argument("--rota", required=True, help="Dados da rota otimizada")
+sp1.add_argument("--rota", default=None, help="Dados da rota otimizada")
 
 sp2 = subparsers.add_parser("relatorio", help="Gerar relatório de eficiência")
-sp2.add_argument("--dados", required=True, help="Dados agregados das rotas")
+sp2.add_argument("--dados", default=None, help="Dados agregados das rotas")
 
 sp3 = subparsers.add_parser("melhorias", help="Sugerir melhorias de processo")
-sp3.add_argument("--historico", required=True, help="Histórico de rotas e entregas")
+sp3.add_argument("--historico", default=None, help="Histórico de rotas e entregas")
 
 sp4 = subparsers.add_parser("pergunta", help="Perguntar sobre rotas/entregas")
 sp4.add_argument("--pergunta", required=True, help="Pergunta em linguagem natural")
-sp4.add_argument("--contexto", required=True, help="Contexto/dados das rotas")
+sp4.add_argument("--contexto", default=None, help="Contexto/dados das rotas")
 
 args = parser.parse_args()
 
+if args.instancia:
+    from vrp_io import load_vrp
+    from vrp_ga import run_ga
+    from vrp_report import prompt_context
+
+    clients, vehicles = load_vrp(args.instancia)
+    contexto = prompt_context(run_ga(n_gens=args.gens, clients=clients, vehicles=vehicles, verbose=False))
+    for campo in ("rota", "dados", "historico", "contexto"):
+        if getattr(args, campo, "") is None:
+            setattr(args, campo, contexto)
+for campo in ("rota", "dados", "historico", "contexto"):
+    if getattr(args, campo, "") is None:
+        parser.error(f"--{campo} é obrigatório (ou use --instancia)")
+
 if args.comando == "instrucoes":
     print(gerar_instrucoes_rota(args.rota))
 elif args.comando == "relatorio":
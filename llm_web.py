@@ -3,19 +3,20 @@ Template Flask para interface web com Gemini via llm_integration.py
 Necessário: pip install flask requests
 """
 
-from flask import Flask, render_template_string, request, make_response, session
+import json
+import os
+import time
+
+from flask import Flask, render_template_string, request, make_response, session, redirect, url_for
 from llm_integration import (
     gerar_instrucoes_rota,
     gerar_relatorio,
     sugerir_melhorias,
     responder_pergunta,
 )
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
 from io import BytesIO
 from datetime import datetime
+from vrp_jobs import JobManager, QueueFullError, payload_solution, FAILED, FINISHED
 
 # Carregar variáveis do .env automaticamente
 from dotenv import load_dotenv
@@ -23,6 +24,19 @@ load_dotenv()
 
 app = Flask(__name__)
 app.secret_key = 'gemini_rotas_secret_key_2025'
+app.config['MAX_CONTENT_LENGTH'] = 32 * 1024 * 1024  # upload de instância
+
+# Instâncias oferecidas no formulário: só os .json desta pasta, escolhidos pelo
+# nome (nunca um caminho vindo do cliente), ou um arquivo enviado.
+INSTANCE_DIR = os.getenv("VRP_INSTANCE_DIR", os.path.dirname(os.path.abspath(__file__)))
+
+# Solver em processos separados (vrp_jobs); iniciado em __main__ ou no
+# primeiro uso (ex.: `flask run`)
+manager = None
+# instância e consulta de cada job em andamento, até a resposta ser gerada
+# (ou até o job sair do JobManager / expirar sem ninguém buscar a resposta)
+consultas_pendentes = {}
+CONSULTA_TTL = 10 * 60  # segundos após o fim do job
 
 HTML = """
 <!DOCTYPE html>
@@ -30,6 +44,7 @@ HTML = """
 <head>
     <meta charset="UTF-8">
     <title>LLM Gemini – Rotas & Entregas</title>
+    {% if job %}<meta http-equiv="refresh" content="2">{% endif %}
     <style>
         body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
@@ -113,6 +128,21 @@ HTML = """
             margin-bottom: 15px;
             font-size: 1.2em;
         }
+        .erro {
+            margin-bottom: 20px;
+            padding: 15px;
+            background: #fdecea;
+            border-left: 5px solid #e74c3c;
+            border-radius: 5px;
+            color: #c0392b;
+        }
+        .status-job {
+            margin-top: 30px;
+            padding: 20px;
+            background: #ecf0f1;
+            border-radius: 8px;
+            border-left: 5px solid #f39c12;
+        }
         .resposta-conteudo {
             background: white;
             padding: 20px;
@@ -127,7 +157,10 @@ HTML = """
 <body>
     <div class="container">
         <h1>🚚 LLM Gemini – Rotas & Entregas</h1>
-        <form method="post">
+        {% if erro %}
+        <div class="erro">⚠️ {{ erro }}</div>
+        {% endif %}
+        <form method="post" action="/" enctype="multipart/form-data">
             <div class="form-group">
                 <label for="tipo">Tipo de consulta:</label>
                 <select name="tipo" id="tipo">
@@ -143,6 +176,17 @@ HTML = """
                 <textarea name="dados" id="dados" rows="6" placeholder="Cole aqui os dados das rotas otimizadas ou informações relevantes..."></textarea>
             </div>
             
+            <div class="form-group">
+                <label for="instancia">Instância VRP (opcional — resolve e usa as rotas como dados):</label>
+                <select name="instancia" id="instancia">
+                    <option value="">(nenhuma)</option>
+                    {% for nome in instancias %}
+                    <option value="{{ nome }}">{{ nome }}</option>
+                    {% endfor %}
+                </select>
+                <input type="file" name="arquivo" id="arquivo" accept=".json,application/json">
+            </div>
+            
             <div class="form-group">
                 <label for="pergunta">Pergunta (se aplicável):</label>
                 <input type="text" name="pergunta" id="pergunta" placeholder="Digite sua pergunta específica aqui...">
@@ -160,6 +204,16 @@ HTML = """
             </div>
         </form>
         
+        {% if job %}
+        <div class="status-job">
+            <h3>⏳ Resolvendo a instância (job {{ job.id }}: {{ job.status }})</h3>
+            {% if job.best %}
+            <p>Geração {{ job.best.generation }}, fitness {{ "%.2f"|format(job.best.fitness) }}</p>
+            {% endif %}
+            <p>A consulta é enviada ao Gemini quando o solver terminar; esta página se atualiza sozinha.</p>
+        </div>
+        {% endif %}
+
         {% if resposta %}
         <div class="resposta-container">
             <h3 class="resposta-titulo">✅ Resposta do Gemini:</h3>
@@ -171,36 +225,141 @@ HTML = """
 </html>
 """
 
+def instancias_disponiveis():
+    return sorted(
+        nome for nome in os.listdir(INSTANCE_DIR)
+        if nome.endswith('.json') and os.path.isfile(os.path.join(INSTANCE_DIR, nome))
+    )
+
+
+def solver():
+    global manager
+    if manager is None:
+        import atexit
+
+        manager = JobManager(workers=1, max_queued=20).start()
+        atexit.register(manager.close)
+    return manager
+
+
+def descartar_consultas_antigas():
+    """Remove as consultas cujo job o JobManager já descartou ou que
+    terminaram há mais de CONSULTA_TTL segundos sem que a página fosse
+    aberta: cada uma guarda a instância inteira."""
+    agora = time.time()
+    for job_id in list(consultas_pendentes):
+        job = solver().get(job_id)
+        if job is None or (job.finished is not None and agora - job.finished > CONSULTA_TTL):
+            consultas_pendentes.pop(job_id, None)
+
+
+def instancia_do_formulario():
+    """Instância (JSON já decodificado) escolhida na lista ou enviada no
+    formulário; None se nenhuma. ValueError com a mensagem para o usuário."""
+    arquivo = request.files.get('arquivo')
+    if arquivo is not None and arquivo.filename:
+        texto = arquivo.read()
+        origem = arquivo.filename
+    else:
+        nome = request.form.get('instancia', '').strip()
+        if not nome:
+            return None
+        if nome not in instancias_disponiveis():
+            raise ValueError(f"instância desconhecida: {nome}")
+        with open(os.path.join(INSTANCE_DIR, nome), 'rb') as f:
+            texto = f.read()
+        origem = nome
+    try:
+        instance = json.loads(texto)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"{origem}: JSON inválido ({e})") from None
+    if not isinstance(instance, dict):
+        raise ValueError(f"{origem}: esperado um objeto com 'clients' e 'vehicles'")
+    return instance
+
+
+def consultar(tipo, dados, pergunta):
+    """Envia a consulta ao Gemini e guarda tudo na sessão para o PDF."""
+    # Chave Gemini via variável de ambiente
+    api_key = os.getenv("GEMINI_API_KEY")
+    resposta = None
+    if tipo == 'instrucoes':
+        resposta = gerar_instrucoes_rota(dados, api_key)
+    elif tipo == 'relatorio':
+        resposta = gerar_relatorio(dados, api_key)
+    elif tipo == 'melhorias':
+        resposta = sugerir_melhorias(dados, api_key)
+    elif tipo == 'pergunta':
+        resposta = responder_pergunta(pergunta, dados, api_key)
+
+    # Salvar dados na sessão para o PDF
+    session['ultima_resposta'] = resposta
+    session['ultimo_tipo'] = tipo
+    session['ultimos_dados'] = dados
+    session['ultima_pergunta'] = pergunta
+    return resposta
+
+
+def pagina(**kwargs):
+    kwargs.setdefault('resposta', None)
+    kwargs.setdefault('erro', None)
+    kwargs.setdefault('job', None)
+    return render_template_string(HTML, instancias=instancias_disponiveis(), **kwargs)
+
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
-    resposta = None
-    if request.method == 'POST':
-        tipo = request.form['tipo']
-        dados = request.form['dados']
-        pergunta = request.form.get('pergunta', '')
-        # Chave Gemini via variável de ambiente
-        import os
-        api_key = os.getenv("GEMINI_API_KEY")
-        if tipo == 'instrucoes':
-            resposta = gerar_instrucoes_rota(dados, api_key)
-        elif tipo == 'relatorio':
-            resposta = gerar_relatorio(dados, api_key)
-        elif tipo == 'melhorias':
-            resposta = sugerir_melhorias(dados, api_key)
-        elif tipo == 'pergunta':
-            resposta = responder_pergunta(pergunta, dados, api_key)
-        
-        # Salvar dados na sessão para o PDF
-        session['ultima_resposta'] = resposta
-        session['ultimo_tipo'] = tipo
-        session['ultimos_dados'] = dados
-        session['ultima_pergunta'] = pergunta
-        
-    return render_template_string(HTML, resposta=resposta)
+    if request.method == 'GET':
+        return pagina()
+    tipo = request.form['tipo']
+    dados = request.form['dados']
+    pergunta = request.form.get('pergunta', '')
+    if not dados.strip():
+        # Rotas montadas direto da Solution, sem reprocessar relatório em texto;
+        # o GA roda nos workers do JobManager e a página acompanha o job
+        try:
+            instance = instancia_do_formulario()
+            if instance is not None:
+                descartar_consultas_antigas()
+                job = solver().submit(instance)
+                consultas_pendentes[job.id] = (instance, tipo, pergunta)
+                return redirect(url_for('consulta', job_id=job.id))
+        except QueueFullError as e:
+            return pagina(erro=f"Solver ocupado: {e}. Tente novamente em instantes.")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            return pagina(erro=f"Não foi possível carregar a instância: {e}")
+    return pagina(resposta=consultar(tipo, dados, pergunta))
+
+
+@app.route('/consulta/<int:job_id>')
+def consulta(job_id):
+    """Acompanha o job de uma consulta; quando ele termina, gera a resposta."""
+    from vrp_report import prompt_context
+
+    descartar_consultas_antigas()
+    job = solver().get(job_id)
+    if job is None or job_id not in consultas_pendentes:
+        consultas_pendentes.pop(job_id, None)
+        return pagina(erro="Consulta não encontrada (já respondida ou expirada).")
+    if job.status not in FINISHED:
+        return pagina(job=job.to_dict(routes=False))
+    instance, tipo, pergunta = consultas_pendentes.pop(job_id)
+    if job.status == FAILED:
+        return pagina(erro=f"Falha ao resolver a instância: {job.error}")
+    if job.best is None:  # cancelado antes da primeira geração
+        return pagina(erro="O job foi cancelado antes de encontrar uma solução.")
+    dados = prompt_context(payload_solution(job.best["routes"], instance))
+    return pagina(resposta=consultar(tipo, dados, pergunta))
+
 
 @app.route('/exportar-pdf')
 def exportar_pdf():
     """Gera e retorna um PDF com a última resposta gerada."""
+    # reportlab só é carregado quando um PDF é pedido
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
     resposta = session.get('ultima_resposta', 'Nenhuma resposta disponível')
     tipo = session.get('ultimo_tipo', 'consulta')
     dados = session.get('ultimos_dados', '')
@@ -272,4 +431,7 @@ def exportar_pdf():
     return response
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5002)
+    # workers são criados antes de o servidor abrir threads; sem o reloader,
+    # que rodaria o módulo (e o pool) duas vezes
+    solver()
+    app.run(debug=True, port=5002, use_reloader=False)
@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# the modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vrp_models import set_travel_costs  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def straight_line_costs():
+    """Every test starts and ends with straight-line travel costs."""
+    set_travel_costs(None)
+    yield
+    set_travel_costs(None)
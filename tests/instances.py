@@ -0,0 +1,26 @@
+import random
+
+from vrp_models import Client, Vehicle
+
+
+def random_instance(rng: random.Random, n: int, n_vehicles: int, windows: bool = True, refrigeration: bool = True, fractional: bool = False):
+    """Small instance exercising every constraint: time windows (some already
+    closed on arrival), refrigeration, max route time, fractional demands and
+    distinct start/end depots."""
+    clients = []
+    for i in range(n):
+        demand = rng.uniform(0.5, 9.5) if fractional else rng.randint(0, 9)
+        tw_start = rng.uniform(0, 100) if windows and rng.random() < 0.6 else None
+        tw_end = (tw_start or 0) + rng.uniform(-5, 60) if windows and rng.random() < 0.6 else None
+        clients.append(Client(
+            i + 1, rng.uniform(-50, 50), rng.uniform(-50, 50), demand, rng.choice([0, 1.5, 3]),
+            tw_start, tw_end, refrigeration and rng.random() < 0.3,
+        ))
+    vehicles = [
+        Vehicle(
+            k + 1, rng.choice([10, 20, 35, 12.5]), rng.choice([None, 80.0, 200.0]), refrigeration and rng.random() < 0.4,
+            (rng.uniform(-5, 5), 0.0), (0.0, rng.uniform(-5, 5)),
+        )
+        for k in range(n_vehicles)
+    ]
+    return clients, vehicles
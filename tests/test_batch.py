@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+
+from instances import random_instance
+from vrp_batch import BatchEvaluator
+from vrp_eval import RoutedTour, TourEvaluator
+from vrp_fitness import PenaltyWeights, score
+from vrp_models import set_travel_costs
+from vrp_roads import TravelCosts, instance_points
+from vrp_table import ClientTable
+
+
+def _population(rng, n, vehicles, size=12):
+    tours = [rng.sample(range(n), n) for _ in range(size)]
+    # a few tours carrying their own routes, some of them empty
+    for t in tours[:3]:
+        cuts = sorted(rng.randint(0, n) for _ in range(len(vehicles) - 1))
+        counts = [b - a for a, b in zip([0] + cuts, cuts + [n])]
+        tours.append(RoutedTour(t, list(zip(rng.sample(range(len(vehicles)), len(vehicles)), counts))))
+    return tours
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_tour_evaluator(seed):
+    rng = random.Random(seed)
+    clients, vehicles = random_instance(
+        rng, rng.randint(0, 40), rng.randint(1, 8), windows=seed % 4 != 0, fractional=seed % 3 == 1,
+    )
+    table = ClientTable.from_clients(clients)
+    ev, batch = TourEvaluator(table, vehicles), BatchEvaluator(table, vehicles)
+    tours = _population(rng, len(clients), vehicles)
+    expected = [ev.violations(t) for t in tours]
+    got = batch.violations(tours)
+    assert len(got) == len(expected)
+    for g, e in zip(got, expected):
+        # only the straight-line legs may differ, in the last bits
+        assert g == pytest.approx(e, rel=1e-12, abs=1e-9)
+        assert [x == 0 for x in g[1:]] == [x == 0 for x in e[1:]]
+    weights = PenaltyWeights()
+    assert batch.evaluate(tours, weights) == pytest.approx([score(v, weights) for v in expected])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_road_costs_are_exact(seed):
+    rng = random.Random(50 + seed)
+    clients, vehicles = random_instance(rng, rng.randint(1, 30), rng.randint(1, 6))
+    points = instance_points(clients, vehicles)
+    xy = np.asarray(points)
+    # asymmetric costs, so a reversed leg would show
+    matrix = np.hypot(xy[:, None, 0] - xy[None, :, 0], xy[:, None, 1] - xy[None, :, 1]) * 1.3
+    matrix += np.triu(np.full_like(matrix, 2.5), 1)
+    set_travel_costs(TravelCosts(points, matrix, "test"))
+    table = ClientTable.from_clients(clients)
+    ev, batch = TourEvaluator(table, vehicles), BatchEvaluator(table, vehicles)
+    tours = _population(rng, len(clients), vehicles)
+    assert batch.violations(tours) == [ev.violations(t) for t in tours]
+
+
+def test_empty_population():
+    clients, vehicles = random_instance(random.Random(1), 5, 2)
+    assert BatchEvaluator(ClientTable.from_clients(clients), vehicles).violations([]) == []
+
+
+def test_ga_with_batch_evaluation():
+    from vrp_ga import run_ga
+
+    runs = [run_ga(pop_size=20, n_gens=10, batch_eval=b, verbose=False) for b in (False, True)]
+    assert [(r.vehicle.id, [c.id for c in r.clients]) for r in runs[0].routes] == [
+        (r.vehicle.id, [c.id for c in r.clients]) for r in runs[1].routes
+    ]
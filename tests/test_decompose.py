@@ -0,0 +1,20 @@
+import random
+import time
+
+import pytest
+
+from instances import random_instance
+from vrp_decompose import solve_decomposed
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_time_limit_covers_all_sectors(workers):
+    clients, vehicles = random_instance(random.Random(1), 60, 8)
+    t0 = time.perf_counter()
+    sol = solve_decomposed(
+        clients, vehicles, 4, workers=workers, refine_time=0, verbose=False,
+        pop_size=10, n_gens=0, time_limit=0.8,
+    )
+    # one budget for the four sectors, not 0.8 s each (plus process start-up)
+    assert time.perf_counter() - t0 < 1.6
+    assert sorted(c.id for c in sol.all_clients()) == sorted(c.id for c in clients)
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from instances import random_instance
+from vrp_eval import RoutedTour, TourEvaluator
+from vrp_fitness import PenaltyWeights, fitness, violation_vector
+from vrp_repair import repair_solution
+from vrp_split import split_giant_tour
+from vrp_table import ClientTable
+
+
+def _routes(solution):
+    return [(r.vehicle, [c.id for c in r.clients]) for r in solution.routes]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_split_repair_violation_vector(seed):
+    rng = random.Random(seed)
+    clients, vehicles = random_instance(
+        rng, rng.randint(0, 40), rng.randint(1, 8),
+        windows=seed % 5 != 0, refrigeration=seed % 3 != 0, fractional=seed % 4 == 1,
+    )
+    if seed % 3 == 2:  # equal vehicles share one "in use" flag in repair
+        vehicles = [vehicles[rng.randrange(k + 1)] if k and rng.random() < 0.3 else v for k, v in enumerate(vehicles)]
+    table = ClientTable.from_clients(clients)
+    ev = TourEvaluator(table, vehicles)
+    for _ in range(10):
+        tour = rng.sample(range(len(clients)), len(clients))
+        ref = repair_solution(split_giant_tour([table.rows[i] for i in tour], vehicles), vehicles)
+        # float for float, not approximately
+        assert ev.violations(tour) == violation_vector(ref)
+        assert _routes(ev.solution()) == _routes(ref)
+        assert ev.fitness(tour) == pytest.approx(fitness(ref, PenaltyWeights()))
+
+
+def test_routed_tour_is_not_split():
+    clients, vehicles = random_instance(random.Random(1), 12, 3)
+    ev = TourEvaluator(ClientTable.from_clients(clients), vehicles)
+    tour = RoutedTour(range(12), [(2, 5), (0, 0), (1, 7)])
+    sol = ev.solution(tour)
+    assert [(r.vehicle, [c.id for c in r.clients]) for r in sol.routes] == [
+        (vehicles[2], [1, 2, 3, 4, 5]), (vehicles[0], []), (vehicles[1], [6, 7, 8, 9, 10, 11, 12]),
+    ]
+    assert ev.violations(tour) == violation_vector(sol)
+    # slicing drops the routes: back to split + repair
+    assert not isinstance(tour[:], RoutedTour)
+    assert isinstance(tour.copy(), RoutedTour) and tour.copy().routes == tour.routes
+
+
+def test_improvements_decode_lazily():
+    from vrp_ga import iter_ga
+
+    improvements = list(iter_ga(pop_size=10, n_gens=5, verbose=False))
+    assert all(imp._solution is None for imp in improvements)
+    last = improvements[-1]
+    assert last.solution is last.solution
+    # iter_ga's default weights
+    weights = PenaltyWeights(capacity=1000.0, time_window=500.0, refrigeration=5000.0, max_route_time=200.0)
+    assert fitness(last.solution, weights) == pytest.approx(last.fitness)
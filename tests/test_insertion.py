@@ -0,0 +1,61 @@
+import random
+import time
+
+import pytest
+
+from instances import random_instance
+from vrp_fitness import PenaltyWeights, fitness
+from vrp_insertion import insert_clients
+from vrp_local_search import route_cost
+from vrp_models import Route
+from vrp_repair import repair_solution
+from vrp_split import split_giant_tour
+
+
+def _setup(seed, n=60, new=10, n_vehicles=8):
+    clients, vehicles = random_instance(random.Random(seed), n, n_vehicles)
+    sol = repair_solution(split_giant_tour(clients[:-new], vehicles[:-2]), vehicles[:-2])
+    return sol, clients[-new:], vehicles
+
+
+def test_every_client_is_routed_once():
+    sol, new, vehicles = _setup(1)
+    before = sorted(c.id for c in sol.all_clients())
+    existing = {id(r) for r in sol.routes}
+    out = insert_clients(sol, new, vehicles, improve=False)
+    assert out is sol
+    assert sorted(c.id for c in sol.all_clients()) == sorted(before + [c.id for c in new])
+    # offered vehicles stay out of the solution unless they got clients
+    assert all(r.clients for r in sol.routes if id(r) not in existing)
+    assert len({r.vehicle.id for r in sol.routes}) == len(sol.routes)
+
+
+def test_each_insertion_is_the_cheapest_shortlisted_position():
+    # one client, no improvement, shortlist covering everything: the chosen
+    # position is the cheapest one among the routes with room and the right
+    # refrigeration
+    sol, new, vehicles = _setup(2, new=1)
+    weights = PenaltyWeights()
+    c = new[0]
+
+    def fits(r):
+        return (r.vehicle.has_refrigeration or not c.requires_refrigeration) and (
+            sum(x.demand for x in r.clients) + c.demand <= r.vehicle.capacity
+        )
+
+    best = min(
+        route_cost(Route(r.vehicle, r.clients[:i] + [c] + r.clients[i:]), weights) - route_cost(r, weights)
+        for r in sol.routes if fits(r) for i in range(len(r.clients) + 1)
+    )
+    before = fitness(sol, weights)
+    insert_clients(sol, new, weights=weights, improve=False, shortlist=1000, k=1000)
+    assert fitness(sol, weights) - before == pytest.approx(best)
+
+
+def test_improvement_does_not_get_worse_and_budget_holds():
+    sol, new, vehicles = _setup(3)
+    plain = insert_clients(*_setup(3), improve=False)
+    t0 = time.perf_counter()
+    insert_clients(sol, new, vehicles, time_budget=0.2)
+    assert time.perf_counter() - t0 < 0.5
+    assert fitness(sol) <= fitness(plain) + 1e-6
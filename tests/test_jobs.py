@@ -0,0 +1,76 @@
+import json
+import random
+import time
+
+import pytest
+
+from instances import random_instance
+from vrp_io import save_vrp_to_json
+from vrp_jobs import CANCELLED, DONE, QUEUED, RUNNING, JobManager, payload_solution
+
+
+@pytest.fixture
+def instance(tmp_path):
+    clients, vehicles = random_instance(random.Random(1), 30, 3)
+    save_vrp_to_json(str(tmp_path / "inst.json"), clients, vehicles)
+    with open(tmp_path / "inst.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def manager():
+    m = JobManager(workers=1, max_queued=5).start()
+    yield m
+    m.close()
+
+
+def _wait(condition, timeout=30.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.02)
+
+
+def test_job_runs_to_completion(manager, instance):
+    job = manager.submit(instance, {"pop_size": 10, "n_gens": 5})
+    _wait(lambda: job.status == DONE)
+    assert job.best is not None and job.improvements >= 1
+    sol = payload_solution(job.best["routes"], instance)
+    assert sorted(c.id for c in sol.all_clients()) == sorted(c["id"] for c in instance["clients"])
+
+
+def test_cancel_running_job_keeps_best(manager, instance):
+    job = manager.submit(instance, {"pop_size": 10, "n_gens": 0, "time_limit": 60})
+    _wait(lambda: job.status == RUNNING and job.best is not None)
+    t0 = time.monotonic()
+    manager.cancel(job.id)
+    _wait(lambda: job.status == CANCELLED)
+    assert time.monotonic() - t0 < 10
+    assert job.best is not None
+    assert payload_solution(job.best["routes"], instance).routes
+
+    # the worker is free again
+    after = manager.submit(instance, {"pop_size": 10, "n_gens": 2})
+    _wait(lambda: after.status == DONE)
+
+
+def test_cancel_queued_job(manager, instance):
+    running = manager.submit(instance, {"pop_size": 10, "n_gens": 0, "time_limit": 60})
+    queued = manager.submit(instance, {"pop_size": 10, "n_gens": 2})
+    _wait(lambda: running.status == RUNNING)
+    assert queued.status == QUEUED
+    manager.cancel(queued.id)
+    assert queued.status == CANCELLED
+    manager.cancel(running.id)
+    _wait(lambda: running.status == CANCELLED)
+    # the dropped job never ran
+    assert queued.started is None and queued.best is None
+
+
+def test_submit_validates(manager, instance):
+    with pytest.raises(ValueError):
+        manager.submit(instance, {"workers": 4})
+    with pytest.raises(ValueError):
+        manager.submit(instance, {"no_such_param": 1})
+    with pytest.raises(ValueError):
+        manager.submit({"clients": instance["clients"]})
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from instances import random_instance
+from vrp_eval import RoutedTour, TourEvaluator
+from vrp_fitness import PenaltyWeights, score, violation_vector
+from vrp_local_search import RouteSearch, educate, educate_tour, route_cost
+from vrp_models import Route
+from vrp_neighbors import build_candidate_lists
+from vrp_repair import repair_solution
+from vrp_split import split_giant_tour
+from vrp_table import ClientTable
+
+
+def _moves(search):
+    for a in search.routes:
+        for b in search.routes:
+            for i in range(len(a.clients)):
+                for j in range(len(b.clients) + 1):
+                    if a is b:
+                        if j < len(a.clients) and j != i:
+                            for segs in search._intra(a, i, j):
+                                yield a.v, segs
+                    else:
+                        for segs_a, segs_b in search._inter(a, b, i, j):
+                            yield a.v, segs_a
+                            yield b.v, segs_b
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_segment_pricing_matches_route_cost(seed):
+    rng = random.Random(seed)
+    clients, vehicles = random_instance(rng, rng.randint(2, 14), rng.randint(1, 4), fractional=seed % 2 == 1)
+    table = ClientTable.from_clients(clients)
+    ev = TourEvaluator(table, vehicles)
+    ev.load(rng.sample(range(len(clients)), len(clients)))
+    weights = PenaltyWeights()
+    search = RouteSearch(ev, weights, [(v, ev.routes[v]) for v in ev.order])
+    for rd in search.routes:
+        assert rd.cost == pytest.approx(route_cost(Route(vehicles[rd.v], table.to_clients(rd.clients)), weights))
+    for v, segs in _moves(search):
+        expected = route_cost(Route(vehicles[v], table.to_clients(search._clients(segs))), weights)
+        assert search.cost(v, segs) == pytest.approx(expected, rel=1e-9, abs=1e-6)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_educated_tour_keeps_its_routes(seed):
+    rng = random.Random(100 + seed)
+    clients, vehicles = random_instance(rng, rng.randint(0, 25), rng.randint(1, 5))
+    table = ClientTable.from_clients(clients)
+    ev = TourEvaluator(table, vehicles)
+    neighbors = build_candidate_lists(table.rows, 4) if seed % 2 else None
+    tour = rng.sample(range(len(clients)), len(clients))
+    before = score(ev.violations(tour), PenaltyWeights())
+
+    educated = educate_tour(tour, ev, None, None, neighbors)
+    assert isinstance(educated, RoutedTour)
+    assert sorted(educated) == sorted(tour)
+    vector = ev.violations(educated)
+    # evaluated on the educated routes, not re-split
+    assert vector == violation_vector(ev.solution(educated))
+    assert score(vector, PenaltyWeights()) <= before + 1e-6
+    assert ev.violations(educated.copy()) == vector
+
+
+def test_educate_solution_in_place():
+    rng = random.Random(7)
+    clients, vehicles = random_instance(rng, 20, 3)
+    sol = repair_solution(split_giant_tour(clients, vehicles), vehicles)
+    before = score(violation_vector(sol), PenaltyWeights())
+    assert educate(sol) is sol
+    assert sorted(c.id for c in sol.all_clients()) == sorted(c.id for c in clients)
+    assert all(c in clients for c in sol.all_clients())
+    assert score(violation_vector(sol), PenaltyWeights()) <= before + 1e-6
@@ -0,0 +1,70 @@
+import math
+import random
+
+import pytest
+
+from instances import random_instance
+from vrp_models import Client
+from vrp_neighbors import GridIndex, build_candidate_lists, time_window_compatible
+
+
+def brute_force(points, i, k, accept=None):
+    others = [j for j in range(len(points)) if j != i and (accept is None or accept(i, j))]
+    others.sort(key=lambda j: (math.dist(points[i], points[j]), j))
+    return others[:k]
+
+
+@pytest.mark.parametrize("layout", ["uniform", "clustered", "line", "duplicates"])
+def test_grid_matches_brute_force(layout):
+    rng = random.Random(3)
+    if layout == "uniform":
+        points = [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(300)]
+    elif layout == "clustered":
+        centers = [(rng.uniform(0, 1000), rng.uniform(0, 1000)) for _ in range(5)]
+        points = [(cx + rng.gauss(0, 3), cy + rng.gauss(0, 3)) for cx, cy in centers for _ in range(60)]
+    elif layout == "line":
+        points = [(rng.uniform(0, 100), 5.0) for _ in range(200)]
+    else:
+        points = [(float(rng.randint(0, 5)), float(rng.randint(0, 5))) for _ in range(200)]
+    index = GridIndex(points)
+    for i in range(len(points)):
+        for k in (1, 5, 12):
+            got = index.nearest(i, k)
+            expected = brute_force(points, i, k)
+            # equal distances may come in another order
+            assert [math.dist(points[i], points[j]) for j in got] == pytest.approx(
+                [math.dist(points[i], points[j]) for j in expected]
+            )
+            assert i not in got and len(set(got)) == len(got)
+
+
+def test_accept_filter():
+    rng = random.Random(4)
+    points = [(rng.uniform(0, 50), rng.uniform(0, 50)) for _ in range(120)]
+    index = GridIndex(points)
+    accept = lambda i, j: (i + j) % 3 == 0  # noqa: E731
+    for i in range(len(points)):
+        got = index.nearest(i, 6, accept)
+        assert all(accept(i, j) for j in got)
+        assert [math.dist(points[i], points[j]) for j in got] == pytest.approx(
+            [math.dist(points[i], points[j]) for j in brute_force(points, i, 6, accept)]
+        )
+
+
+def test_candidate_lists():
+    clients, _ = random_instance(random.Random(5), 60, 1)
+    lists = build_candidate_lists(clients, 8)
+    points = [c.pos for c in clients]
+    assert len(lists) == len(clients)
+    for i, nbrs in enumerate(lists):
+        assert len(nbrs) == 8
+        assert [math.dist(points[i], points[j]) for j in nbrs] == sorted(math.dist(points[i], points[j]) for j in nbrs)
+    filtered = build_candidate_lists(clients, 8, time_window_filter=True)
+    for i, nbrs in enumerate(filtered):
+        assert all(time_window_compatible(clients[i], clients[j]) for j in nbrs)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2])
+def test_tiny_instances(n):
+    clients = [Client(i + 1, float(i), 0.0, 1.0, 0.0, None, None, False) for i in range(n)]
+    assert build_candidate_lists(clients, 4) == [[j for j in range(n) if j != i] for i in range(n)]
@@ -0,0 +1,36 @@
+import random
+
+from instances import random_instance
+from vrp_eval import TourEvaluator
+from vrp_fitness import PenaltyWeights, score
+from vrp_parallel import ParallelEvaluator, pack_instance, unpack_instance
+from vrp_table import ClientTable
+
+
+def test_pack_unpack_round_trip():
+    clients, vehicles = random_instance(random.Random(1), 30, 4, fractional=True)
+    table, unpacked = unpack_instance(*pack_instance(clients, vehicles))
+    assert table.to_clients() == clients
+    assert unpacked == vehicles
+
+
+def test_parallel_matches_serial():
+    rng = random.Random(2)
+    clients, vehicles = random_instance(rng, 40, 5)
+    serial = TourEvaluator(ClientTable.from_clients(clients), vehicles)
+    tours = [rng.sample(range(len(clients)), len(clients)) for _ in range(25)]
+    weights = PenaltyWeights()
+    with ParallelEvaluator(clients, vehicles, weights, workers=2) as ev:
+        vectors = ev.evaluate_violations(tours)
+        fitnesses = ev.evaluate(tours)
+    assert vectors == [serial.violations(t) for t in tours]
+    assert fitnesses == [score(v, weights) for v in vectors]
+
+
+def test_ga_result_does_not_depend_on_workers():
+    from vrp_ga import run_ga
+
+    runs = [run_ga(pop_size=20, n_gens=10, workers=w, verbose=False) for w in (1, 2)]
+    assert [(r.vehicle.id, [c.id for c in r.clients]) for r in runs[0].routes] == [
+        (r.vehicle.id, [c.id for c in r.clients]) for r in runs[1].routes
+    ]
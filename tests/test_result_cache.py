@@ -0,0 +1,88 @@
+import os
+import random
+
+import numpy as np
+
+from instances import random_instance
+from vrp_io import save_vrp_to_binary
+from vrp_models import Route, Solution, set_travel_costs
+from vrp_result_cache import ResultCache, instance_digest, normalized_params, result_key, solve_cached
+from vrp_roads import TravelCosts, instance_points
+from vrp_table import load_client_table
+
+
+def _key(clients, vehicles, **kwargs):
+    return result_key(instance_digest(clients, vehicles), normalized_params(**kwargs))
+
+
+def test_key_covers_the_result_parameters():
+    clients, vehicles = random_instance(random.Random(1), 20, 3)
+    base = _key(clients, vehicles, seed=3, n_gens=10)
+    assert _key(clients, vehicles, seed=3, n_gens=10) == base
+    # defaults are filled in, so spelling one out does not change the key
+    assert _key(clients, vehicles, seed=3, n_gens=10, pop_size=50) == base
+    assert _key(clients, vehicles, seed=4, n_gens=10) != base
+    assert _key(clients, vehicles, seed=3, n_gens=10, weights_tw=501.0) != base
+    assert _key(clients, vehicles, seed=3, n_gens=11) != base
+    assert _key(clients[:-1], vehicles, seed=3, n_gens=10) != base
+
+
+def test_key_ignores_execution_parameters():
+    clients, vehicles = random_instance(random.Random(2), 20, 3)
+    base = _key(clients, vehicles, seed=3)
+    assert _key(clients, vehicles, seed=3, workers=4, verbose=False, cache_size=1000) == base
+
+
+def test_instance_digest_ignores_the_file_format(tmp_path):
+    clients, vehicles = random_instance(random.Random(3), 30, 3, fractional=True)
+    save_vrp_to_binary(str(tmp_path / "inst.vrpb"), clients, vehicles)
+    table, loaded = load_client_table(str(tmp_path / "inst.vrpb"))
+    assert instance_digest(table, loaded) == instance_digest(clients, vehicles)
+
+
+def test_solve_cached_hits_and_keys_on_road_costs(tmp_path):
+    clients, vehicles = random_instance(random.Random(4), 12, 3)
+    cache = ResultCache(str(tmp_path))
+    kwargs = dict(clients=clients, vehicles=vehicles, pop_size=10, n_gens=5, verbose=False)
+    first, hit = solve_cached(cache, **kwargs)
+    assert not hit
+    again, hit = solve_cached(cache, **kwargs)
+    assert hit
+    assert [(r.vehicle, r.clients) for r in again.routes] == [(r.vehicle, r.clients) for r in first.routes]
+
+    # a road-network cost matrix is part of the key
+    points = instance_points(clients, vehicles)
+    xy = np.asarray(points)
+    matrix = 2 * np.hypot(xy[:, None, 0] - xy[None, :, 0], xy[:, None, 1] - xy[None, :, 1])
+    set_travel_costs(TravelCosts(points, matrix, "double"))
+    _, hit = solve_cached(cache, **kwargs)
+    assert not hit
+    _, hit = solve_cached(cache, **kwargs)
+    assert hit
+
+
+def test_put_get_and_lru_eviction(tmp_path):
+    clients, vehicles = random_instance(random.Random(5), 6, 2)
+    sol = Solution(routes=[Route(vehicles[0], clients[:3]), Route(vehicles[1], clients[3:])])
+    cache = ResultCache(str(tmp_path))
+    cache.put("aa" * 20, 12.5, [c.id for c in clients], sol, {"note": "x"})
+    got = cache.get("aa" * 20, clients, vehicles)
+    assert (got.fitness, got.tour, got.meta["note"]) == (12.5, [c.id for c in clients], "x")
+    assert [(r.vehicle, r.clients) for r in got.solution.routes] == [(r.vehicle, r.clients) for r in sol.routes]
+    assert cache.get("bb" * 20, clients, vehicles) is None
+    # unknown client ids (collision or another instance) are a miss
+    assert cache.get("aa" * 20, clients[1:], vehicles) is None
+
+    keys = [f"{i:02x}" * 20 for i in (1, 2, 3)]
+    for i, key in enumerate(keys):
+        cache.put(key, 0.0, [c.id for c in clients], sol, {"note": "x"})
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    os.utime(cache._path("aa" * 20), (2000, 2000))  # most recently used
+    # room for the two most recently used entries only
+    cache.max_bytes = os.path.getsize(cache._path("aa" * 20)) + os.path.getsize(cache._path(keys[2]))
+    assert cache.evict() == 2
+    assert cache.size() <= cache.max_bytes
+    assert cache.get("aa" * 20, clients, vehicles) is not None
+    assert cache.get(keys[2], clients, vehicles) is not None
+    assert cache.get(keys[0], clients, vehicles) is None
+    assert cache.get(keys[1], clients, vehicles) is None
@@ -0,0 +1,109 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from instances import random_instance
+from vrp_eval import TourEvaluator
+from vrp_fitness import violation_vector
+from vrp_models import set_travel_costs
+from vrp_repair import repair_solution
+from vrp_roads import load_road_graph, road_travel_costs, shortest_path_matrix
+from vrp_split import split_giant_tour
+from vrp_table import ClientTable
+
+
+def _write_graph(path, rng, n, n_arcs, connected=True):
+    """Random graph file: a two-way ring (if connected) plus random two-way
+    and one-way arcs, some with explicit costs."""
+    xy = [(rng.uniform(-60, 60), rng.uniform(-60, 60)) for _ in range(n)]
+    lines = [f"v n{i} {x} {y}" for i, (x, y) in enumerate(xy)]
+    if connected:
+        lines += [f"e n{i} n{(i + 1) % n}" for i in range(n)]
+    for _ in range(n_arcs):
+        u, v = rng.randrange(n), rng.randrange(n)
+        cost = f" {rng.uniform(0, 80)}" if rng.random() < 0.3 else ""
+        lines.append(f"{rng.choice('ea')} n{u} n{v}{cost}  # arco")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return xy
+
+
+def _floyd_warshall(graph):
+    n = len(graph)
+    d = np.full((n, n), math.inf)
+    np.fill_diagonal(d, 0.0)
+    for u in range(n):
+        for k in range(graph.start[u], graph.start[u + 1]):
+            v = graph.adj[k]
+            d[u, v] = min(d[u, v], graph.weight[k])
+    for k in range(n):
+        d = np.minimum(d, d[:, k, None] + d[None, k, :])
+    return d
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_dijkstra_matches_floyd_warshall(tmp_path, seed):
+    rng = random.Random(seed)
+    _write_graph(tmp_path / "g.txt", rng, rng.randint(2, 30), rng.randint(0, 60), connected=seed % 3 != 0)
+    graph = load_road_graph(str(tmp_path / "g.txt"))
+    expected = _floyd_warshall(graph)
+    nodes = sorted(rng.sample(range(len(graph)), rng.randint(1, len(graph))))
+    for workers in (1, 2):
+        got = shortest_path_matrix(graph, nodes, workers=workers)
+        assert got.shape == (len(nodes), len(nodes))
+        assert np.allclose(got, expected[np.ix_(nodes, nodes)], rtol=1e-12, atol=1e-9)
+        assert np.array_equal(np.isinf(got), np.isinf(expected[np.ix_(nodes, nodes)]))
+
+
+def test_one_way_arcs(tmp_path):
+    (tmp_path / "g.txt").write_text("v a 0 0\nv b 3 4\nv c 0 8\na a b\na b c 1.5\ne c a 20\n", encoding="utf-8")
+    graph = load_road_graph(str(tmp_path / "g.txt"))
+    got = shortest_path_matrix(graph, [0, 1, 2])
+    assert got.tolist() == [[0.0, 5.0, 6.5], [21.5, 0.0, 1.5], [20.0, 25.0, 0.0]]
+
+
+def test_bad_graph_lines(tmp_path):
+    (tmp_path / "g.txt").write_text("v a 0 0\ne a b\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="g.txt:2"):
+        load_road_graph(str(tmp_path / "g.txt"))
+    (tmp_path / "g.txt").write_text("v a 0 0\nv b 1 1\ne a b -1\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_road_graph(str(tmp_path / "g.txt"))
+
+
+def test_road_travel_costs_cache_and_disconnected(tmp_path):
+    rng = random.Random(1)
+    _write_graph(tmp_path / "g.txt", rng, 25, 30)
+    clients, vehicles = random_instance(rng, 15, 3)
+    cache = str(tmp_path / "cache")
+    costs = road_travel_costs(str(tmp_path / "g.txt"), clients, vehicles, cache_dir=cache, verbose=False)
+    again = road_travel_costs(str(tmp_path / "g.txt"), clients, vehicles, cache_dir=cache, verbose=False)
+    assert again.digest == costs.digest
+    assert np.array_equal(again.matrix, costs.matrix)
+    assert all(costs(p, p) == 0.0 for p in costs.points)
+    # access legs are straight lines, so no point is closer by road than by air
+    for p in costs.points:
+        for q in costs.points:
+            assert costs(p, q) >= math.hypot(p[0] - q[0], p[1] - q[1]) - 1e-9
+
+    # two components, clients on both sides
+    (tmp_path / "split.txt").write_text(
+        "v a -50 0\nv b -40 0\ne a b\nv c 40 0\nv d 50 0\ne c d\n", encoding="utf-8"
+    )
+    with pytest.raises(ValueError, match="desconexa"):
+        road_travel_costs(str(tmp_path / "split.txt"), clients, vehicles, cache_dir=None, verbose=False)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_evaluator_with_road_costs(tmp_path, seed):
+    rng = random.Random(seed)
+    _write_graph(tmp_path / "g.txt", rng, 30, 40)
+    clients, vehicles = random_instance(rng, rng.randint(1, 25), rng.randint(1, 5))
+    set_travel_costs(road_travel_costs(str(tmp_path / "g.txt"), clients, vehicles, cache_dir=None, verbose=False))
+    table = ClientTable.from_clients(clients)
+    ev = TourEvaluator(table, vehicles)
+    for _ in range(10):
+        tour = rng.sample(range(len(clients)), len(clients))
+        ref = repair_solution(split_giant_tour([table.rows[i] for i in tour], vehicles), vehicles)
+        assert ev.violations(tour) == pytest.approx(violation_vector(ref), rel=1e-12, abs=1e-9)
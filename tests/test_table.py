@@ -0,0 +1,49 @@
+import random
+
+from instances import random_instance
+from vrp_io import save_vrp_to_binary, save_vrp_to_json
+from vrp_models import Route, Solution
+from vrp_table import ClientRow, ClientTable, load_client_table
+
+
+def test_from_clients_round_trip():
+    clients, _ = random_instance(random.Random(1), 50, 1, fractional=True)
+    table = ClientTable.from_clients(clients)
+    assert len(table) == len(clients)
+    assert table.to_clients() == clients
+    assert table.to_clients([3, 0]) == [clients[3], clients[0]]
+    for row, c in zip(table, clients):
+        assert (row.id, row.pos, row.tw_start, row.tw_end) == (c.id, c.pos, c.tw_start, c.tw_end)
+
+
+def test_materialize():
+    clients, vehicles = random_instance(random.Random(2), 10, 2)
+    table = ClientTable.from_clients(clients)
+    sol = Solution(routes=[Route(vehicles[0], table.rows[:4]), Route(vehicles[1], [clients[4]] + table.rows[5:])])
+    out = table.materialize(sol)
+    assert not any(isinstance(c, ClientRow) for c in out.all_clients())
+    assert out.all_clients() == clients
+
+
+def test_load_client_table(tmp_path):
+    clients, vehicles = random_instance(random.Random(3), 40, 3, fractional=True)
+    save_vrp_to_binary(str(tmp_path / "inst.vrpb"), clients, vehicles)
+    save_vrp_to_json(str(tmp_path / "inst.json"), clients, vehicles)
+    for path in ("inst.vrpb", "inst.json"):
+        table, loaded = load_client_table(str(tmp_path / path))
+        assert table.to_clients() == clients
+        assert loaded == vehicles
+
+
+def test_rows_are_built_lazily_once(tmp_path):
+    clients, vehicles = random_instance(random.Random(4), 30, 2)
+    save_vrp_to_binary(str(tmp_path / "inst.vrpb"), clients, vehicles)
+    table, _ = load_client_table(str(tmp_path / "inst.vrpb"))
+    assert not any(table._rows)
+    row = table[7]
+    assert row is table[7] and row is table[7 - len(table)]
+    assert sum(r is not None for r in table._rows) == 1
+    assert table.rows[7] is row
+    assert [r.to_client() for r in table] == clients
+    assert table.field("tw_end") == [c.tw_end for c in clients]
+    assert type(table[0].id) is int and type(table[0].requires_refrigeration) is bool
@@ -9,6 +9,7 @@ import time
 import numpy as np
 import pygame
 from benchmark_att48 import *
+from vrp_profiling import Profiler, NULL_PROFILER
 
 
 # Define constant values
@@ -26,6 +27,11 @@ MUTATION_PROBABILITY = 0.5
 DRAW_SECOND_BEST = False  # Otimização: desabilita desenho do segundo melhor caminho
 EARLY_STOP_PATIENCE = 20  # Parada antecipada: gerações sem melhoria
 
+# Profiling (opcional): métricas por fase/geração em JSON lines e dump cProfile
+PROFILE_TRACE = None  # ex.: "tsp_profile.jsonl"
+PROFILE_CPROFILE = None  # ex.: "tsp.prof"
+PROFILE_MEMORY = False  # pico de memória (tracemalloc) no trace; bem mais lento
+
 # Define colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -81,6 +87,9 @@ gens_since_improvement = 0
 best_generation = 0
 
 
+profiler = Profiler(PROFILE_TRACE, PROFILE_CPROFILE, PROFILE_MEMORY) if PROFILE_TRACE or PROFILE_CPROFILE else NULL_PROFILER
+
+
 # Main game loop
 running = True
 program_start = time.perf_counter()
@@ -97,8 +106,10 @@ while running:
 
     screen.fill(WHITE)
 
-    population_fitness = [calculate_fitness(
-        individual) for individual in population]
+    with profiler.phase("fitness"):
+        population_fitness = [calculate_fitness(
+            individual) for individual in population]
+    profiler.add_evaluations(len(population))
 
     population, population_fitness = sort_population(
         population,  population_fitness)
@@ -117,13 +128,14 @@ while running:
     else:
         gens_since_improvement += 1
 
-    draw_plot(screen, list(range(len(best_fitness_values))),
-              best_fitness_values, y_label="Fitness - Distance (pxls)")
+    with profiler.phase("rendering"):
+        draw_plot(screen, list(range(len(best_fitness_values))),
+                  best_fitness_values, y_label="Fitness - Distance (pxls)")
 
-    draw_cities(screen, cities_locations, RED, NODE_RADIUS)
-    draw_paths(screen, best_solution, BLUE, width=3)
-    if DRAW_SECOND_BEST and len(population) > 1:
-        draw_paths(screen, population[1], rgb_color=(128, 128, 128), width=1)
+        draw_cities(screen, cities_locations, RED, NODE_RADIUS)
+        draw_paths(screen, best_solution, BLUE, width=3)
+        if DRAW_SECOND_BEST and len(population) > 1:
+            draw_paths(screen, population[1], rgb_color=(128, 128, 128), width=1)
 
     # (A medição da geração completa é feita após flip/tick no final do loop)
 
@@ -146,25 +158,30 @@ while running:
             # parent1, parent2 = random.choices(population[:10], k=2)
 
             # solution based on fitness probability
-            probability = 1 / np.array(population_fitness)
-            parent1, parent2 = random.choices(population, weights=probability, k=2)
+            with profiler.phase("selection"):
+                probability = 1 / np.array(population_fitness)
+                parent1, parent2 = random.choices(population, weights=probability, k=2)
 
-            # child1 = order_crossover(parent1, parent2)
-            child1 = order_crossover(parent1, parent1)
+            with profiler.phase("crossover"):
+                # child1 = order_crossover(parent1, parent2)
+                child1 = order_crossover(parent1, parent1)
 
-            child1 = mutate(child1, MUTATION_PROBABILITY)
+            with profiler.phase("mutation"):
+                child1 = mutate(child1, MUTATION_PROBABILITY)
 
             new_population.append(child1)
 
         population = new_population
 
-    pygame.display.flip()
+    with profiler.phase("rendering"):
+        pygame.display.flip()
     clock.tick(FPS)
 
     # Medição de duração da geração após o frame completo (cálculo + desenho + flip + tick)
     gen_duration = time.perf_counter() - gen_start
     gen_durations.append(gen_duration)
     print(f"Generation {generation}: Best fitness = {round(best_fitness, 2)} | Duration = {gen_duration*1000:.2f} ms")
+    profiler.end_generation(generation, best_fitness=best_fitness)
 
 
 # TODO: save the best individual in a file if it is better than the one saved.
@@ -175,5 +192,6 @@ print(f"Total execution time: {total_duration:.3f} s")
 if gen_durations:
     avg_gen = sum(gen_durations) / len(gen_durations)
     print(f"Estimated time per generation (avg): {avg_gen*1000:.2f} ms")
+profiler.close()
 pygame.quit()
 sys.exit()
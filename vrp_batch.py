@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+import numpy as np
+
+from vrp_models import Vehicle, get_travel_costs
+from vrp_fitness import PenaltyWeights, Violations, score
+from vrp_eval import TourEvaluator
+from vrp_table import ClientTable
+
+if TYPE_CHECKING:
+    from vrp_roads import TravelCosts
+
+
+class BatchEvaluator:
+    """Violation vectors of a whole population of giant tours at once.
+
+    Routes come from TourEvaluator (split + repair, or a RoutedTour's own
+    routes): repair moves clients between routes one at a time, so this part
+    stays sequential per tour. The scoring of every route of every tour is
+    then vectorized over the concatenated routes: legs, distances, loads and
+    route times are gathered and summed with NumPy, and the time-window clock
+    (which waits at window starts) advances one route position at a time for
+    all routes together.
+
+    Sums run in the same order as TourEvaluator.vector. With road-network
+    costs (`costs`, by default the active ones from
+    vrp_models.set_travel_costs) legs are matrix lookups and the vectors are
+    identical; with straight lines numpy.hypot may differ from math.hypot in
+    the last bit of a leg.
+    """
+
+    def __init__(self, table: ClientTable, vehicles: Sequence[Vehicle], costs: Optional["TravelCosts"] = None) -> None:
+        costs = costs if costs is not None else get_travel_costs()
+        self.ev = TourEvaluator(table, vehicles, costs)
+        cols = table.columns
+        self.x = np.asarray(cols["x"], dtype=np.float64)
+        self.y = np.asarray(cols["y"], dtype=np.float64)
+        self.demand = np.asarray(cols["demand"], dtype=np.float64)
+        self.service = np.asarray(cols["service_time"], dtype=np.float64)
+        tw_start = np.asarray(cols["tw_start"], dtype=np.float64)
+        tw_end = np.asarray(cols["tw_end"], dtype=np.float64)
+        # missing windows never bind: waiting until -inf, lateness past +inf
+        self.tw_start = np.where(np.isnan(tw_start), -np.inf, tw_start)
+        self.tw_end = np.where(np.isnan(tw_end), np.inf, tw_end)
+        self.any_windows = bool(np.isfinite(self.tw_end).any())
+        self.refrigerated = np.asarray(cols["requires_refrigeration"], dtype=np.bool_)
+        vs = self.ev.vehicles
+        self.capacity = np.array([v.capacity for v in vs], dtype=np.float64)
+        self.v_refrigerated = np.array([v.has_refrigeration for v in vs], dtype=np.bool_)
+        self.v_max_time = np.array([np.inf if v.max_route_time is None else v.max_route_time for v in vs], dtype=np.float64)
+        self.v_start = np.array([v.start_depot for v in vs], dtype=np.float64).reshape(len(vs), 2)
+        self.v_end = np.array([v.end_depot for v in vs], dtype=np.float64).reshape(len(vs), 2)
+        self.matrix = costs.matrix if costs is not None else None
+        if costs is not None:  # legs by matrix index
+            self.node = np.asarray(self.ev.node, dtype=np.int64)
+            self.v_start_node = np.asarray(self.ev.v_start_node, dtype=np.int64)
+            self.v_end_node = np.asarray(self.ev.v_end_node, dtype=np.int64)
+
+    def violations(self, tours: Sequence[Sequence[int]]) -> List[Violations]:
+        ev = self.ev
+        seq: List[int] = []  # clients of every route of every tour, in order
+        lengths: List[int] = []  # clients per route
+        route_vehicle: List[int] = []
+        n_routes: List[int] = []  # routes per tour
+        for tour in tours:
+            ev.load(tour)
+            for v in ev.order:
+                r = ev.routes[v]
+                seq.extend(r)
+                lengths.append(len(r))
+                route_vehicle.append(v)
+            n_routes.append(len(ev.order))
+        if not tours:
+            return []
+
+        c = np.array(seq, dtype=np.int64)
+        length = np.array(lengths, dtype=np.int64)
+        rv = np.array(route_vehicle, dtype=np.int64)
+        n_r = len(length)
+        start = np.cumsum(length) - length  # first position of each route
+        rid = np.repeat(np.arange(n_r), length)  # route of each position
+        busy = length > 0
+        first = np.zeros(len(c), dtype=np.bool_)
+        first[start[busy]] = True
+        last = c[(start + length - 1)[busy]]
+
+        # leg into each position (from the start depot for the first client), and out of the last client
+        end_leg = np.zeros(n_r)
+        if self.matrix is None:
+            px = np.where(first, self.v_start[rv[rid], 0], self.x[np.roll(c, 1)])
+            py = np.where(first, self.v_start[rv[rid], 1], self.y[np.roll(c, 1)])
+            leg = np.hypot(px - self.x[c], py - self.y[c])
+            end_leg[busy] = np.hypot(self.x[last] - self.v_end[rv[busy], 0], self.y[last] - self.v_end[rv[busy], 1])
+        else:
+            node = self.node[c]
+            prev = np.where(first, self.v_start_node[rv[rid]], np.roll(node, 1))
+            leg = self.matrix[prev, node]
+            end_leg[busy] = self.matrix[self.node[last], self.v_end_node[rv[busy]]]
+
+        service = self.service[c]
+        dist = np.bincount(rid, leg, n_r) + end_leg
+        load = np.bincount(rid, self.demand[c], n_r)
+        # route time adds leg, service, leg, service, ... then the last leg
+        steps = np.empty(2 * len(c))
+        steps[0::2] = leg
+        steps[1::2] = service
+        route_time = np.bincount(np.repeat(rid, 2), steps, n_r) + end_leg
+        needs = np.bincount(rid, self.refrigerated[c].astype(np.float64), n_r) > 0
+
+        late = np.zeros(n_r)
+        if self.any_windows and len(c):
+            tw_start, tw_end = self.tw_start[c], self.tw_end[c]
+            routes = np.flatnonzero(busy)
+            pos = start[routes]
+            clock = leg[pos]
+            for k in range(1, int(length.max()) + 1):
+                late[routes] += np.maximum(0.0, clock - tw_end[pos])
+                more = length[routes] > k
+                if not more.any():
+                    break
+                routes, pos, clock = routes[more], pos[more], clock[more]
+                clock = np.maximum(clock, tw_start[pos]) + service[pos] + leg[pos + 1]
+                pos = pos + 1
+
+        cap_v = np.maximum(0.0, load - self.capacity[rv])
+        refr_v = (needs & ~self.v_refrigerated[rv]).astype(np.float64)
+        mrt_v = np.maximum(0.0, route_time - self.v_max_time[rv])
+        tid = np.repeat(np.arange(len(tours)), n_routes)
+        columns = [np.bincount(tid, values, len(tours)) for values in (dist, cap_v, late, refr_v, mrt_v)]
+        return [tuple(row) for row in np.column_stack(columns).tolist()]
+
+    def evaluate(self, tours: Sequence[Sequence[int]], weights: Optional[PenaltyWeights] = None) -> List[float]:
+        weights = weights or PenaltyWeights()
+        return [score(v, weights) for v in self.violations(tours)]
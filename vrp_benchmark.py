@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import glob
+import os
+import statistics
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Sequence
+
+from vrp_models import Client, Vehicle, Route, Solution
+from vrp_fitness import (
+    PenaltyWeights,
+    fitness,
+    capacity_violation,
+    time_window_violation,
+    refrigeration_violation,
+    max_route_time_violation,
+)
+from vrp_io import load_vrp, load_cvrplib_solution
+from vrp_profiling import Profiler
+from vrp_ga import run_ga
+
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+
+
+@dataclass
+class BenchmarkResult:
+    instance: str
+    seed: int
+    cost: float  # total distance of the returned solution
+    fitness: float
+    best_known: Optional[float]
+    gap: Optional[float]  # (cost - best_known) / best_known
+    runtime: float
+    evaluations: int
+    evals_per_sec: float
+    feasible: bool
+
+
+def discover_instances(root: str = BENCHMARK_DIR) -> List[str]:
+    """All CVRPLIB (.vrp) and Solomon (.txt) instances under root."""
+    paths = glob.glob(os.path.join(root, "**", "*.vrp"), recursive=True)
+    paths += glob.glob(os.path.join(root, "**", "*.txt"), recursive=True)
+    return sorted(paths)
+
+
+def is_feasible(solution: Solution) -> bool:
+    return all(
+        capacity_violation(r) == 0
+        and time_window_violation(r) == 0
+        and refrigeration_violation(r) == 0
+        and max_route_time_violation(r) == 0
+        for r in solution.routes
+    )
+
+
+def best_known_cost(path: str, clients: Sequence[Client], vehicles: Sequence[Vehicle]) -> Optional[float]:
+    """Best-known cost from the .sol file next to the instance.
+
+    When the routes can be mapped onto the instance they are re-costed with
+    the solver's own (unrounded Euclidean) distance, so the gap compares like
+    with like; otherwise the reported Cost line is used as is.
+    """
+    sol_path = os.path.splitext(path)[0] + ".sol"
+    if not os.path.exists(sol_path):
+        return None
+    routes, cost = load_cvrplib_solution(sol_path)
+    by_id = {c.id: c for c in clients}
+    if routes and vehicles and all(cid in by_id for r in routes for cid in r):
+        return sum(Route(vehicle=vehicles[0], clients=[by_id[cid] for cid in r]).distance() for r in routes)
+    return cost
+
+
+def run_instance(path: str, seed: int, weights: PenaltyWeights, **ga_kwargs) -> BenchmarkResult:
+    clients, vehicles = load_vrp(path)
+    bks = best_known_cost(path, clients, vehicles)
+    profiler = Profiler()
+    t0 = time.perf_counter()
+    sol = run_ga(
+        seed=seed,
+        clients=clients,
+        vehicles=vehicles,
+        weights_capacity=weights.capacity,
+        weights_tw=weights.time_window,
+        weights_refrig=weights.refrigeration,
+        weights_mrt=weights.max_route_time,
+        verbose=False,
+        profiler=profiler,
+        **ga_kwargs,
+    )
+    runtime = time.perf_counter() - t0
+    stats = profiler.close()
+    cost = sol.total_distance()
+    return BenchmarkResult(
+        instance=os.path.basename(path),
+        seed=seed,
+        cost=cost,
+        fitness=fitness(sol, weights),
+        best_known=bks,
+        gap=(cost - bks) / bks if bks else None,
+        runtime=runtime,
+        evaluations=stats["evaluations"],
+        evals_per_sec=stats["evaluations"] / runtime if runtime > 0 else 0.0,
+        feasible=is_feasible(sol),
+    )
+
+
+def run_benchmark(
+    paths: Sequence[str],
+    seeds: Sequence[int],
+    weights: Optional[PenaltyWeights] = None,
+    verbose: bool = True,
+    **ga_kwargs,
+) -> List[BenchmarkResult]:
+    """Run the GA once per (instance, seed). Extra keyword arguments go to run_ga."""
+    weights = weights or PenaltyWeights()
+    results: List[BenchmarkResult] = []
+    for path in paths:
+        for seed in seeds:
+            r = run_instance(path, seed, weights, **ga_kwargs)
+            results.append(r)
+            if verbose:
+                gap = f"{r.gap:+.2%}" if r.gap is not None else "-"
+                print(
+                    f"{r.instance} seed={seed}: custo={r.cost:.2f} gap={gap} "
+                    f"tempo={r.runtime:.2f}s aval/s={r.evals_per_sec:.0f} viável={'sim' if r.feasible else 'não'}"
+                )
+    return results
+
+
+def summarize(results: Sequence[BenchmarkResult]) -> List[Dict[str, object]]:
+    """Per-instance aggregates: mean/best gap, mean runtime, evals/s, feasibility rate."""
+    groups: Dict[str, List[BenchmarkResult]] = {}
+    for r in results:
+        groups.setdefault(r.instance, []).append(r)
+    rows = []
+    for name, rs in groups.items():
+        gaps = [r.gap for r in rs if r.gap is not None]
+        rows.append({
+            "instance": name,
+            "runs": len(rs),
+            "best_known": rs[0].best_known,
+            "best_cost": min(r.cost for r in rs),
+            "mean_gap": statistics.mean(gaps) if gaps else None,
+            "best_gap": min(gaps) if gaps else None,
+            "mean_runtime": statistics.mean(r.runtime for r in rs),
+            "evals_per_sec": statistics.mean(r.evals_per_sec for r in rs),
+            "feasibility_rate": sum(r.feasible for r in rs) / len(rs),
+        })
+    return rows
+
+
+def print_summary(rows: Sequence[Dict[str, object]]) -> None:
+    def pct(v: Optional[float]) -> str:
+        return "-" if v is None else f"{v:+.2%}"
+
+    print(f"\n{'instância':<16} {'runs':>4} {'BKS':>9} {'melhor':>9} {'gap méd':>8} {'gap mín':>8} {'tempo':>7} {'aval/s':>8} {'viável':>7}")
+    for r in rows:
+        bks = "-" if r["best_known"] is None else f"{r['best_known']:.2f}"
+        print(
+            f"{r['instance']:<16} {r['runs']:>4} {bks:>9} {r['best_cost']:>9.2f} {pct(r['mean_gap']):>8} "
+            f"{pct(r['best_gap']):>8} {r['mean_runtime']:>6.2f}s {r['evals_per_sec']:>8.0f} {r['feasibility_rate']:>7.0%}"
+        )
+
+
+def write_csv(path: str, results: Sequence[BenchmarkResult]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(asdict(results[0])) if results else [])
+        writer.writeheader()
+        for r in results:
+            writer.writerow(asdict(r))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do VRP GA em instâncias CVRPLIB/Solomon")
+    parser.add_argument("instances", nargs="*", help="Arquivos .vrp/.txt (padrão: todos em benchmarks/)")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3], help="Seeds por instância")
+    parser.add_argument("--pop-size", type=int, default=50, help="Tamanho da população")
+    parser.add_argument("--gens", type=int, default=200, help="Número de gerações (0 = sem limite; use com --time-limit/--patience)")
+    parser.add_argument("--time-limit", type=float, default=None, help="Tempo máximo por execução (s)")
+    parser.add_argument("--patience", type=int, default=None, help="Parada antecipada: gerações sem melhoria")
+    parser.add_argument("--mutation", type=float, default=0.4, help="Probabilidade de mutação")
+    parser.add_argument("--education", type=float, default=0.0, help="Probabilidade de busca local por filho")
+    parser.add_argument("--neighbors", type=int, default=0, help="Vizinhos para mutação/busca local granular (0 = todos)")
+    parser.add_argument("--adaptive-penalties", action="store_true", help="Pesos de penalidade adaptativos")
+    parser.add_argument("--workers", type=int, default=1, help="Processos para avaliação paralela do fitness")
+    parser.add_argument("--csv", type=str, default=None, help="Grava os resultados por execução em CSV")
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        args.instances or discover_instances(),
+        args.seeds,
+        pop_size=args.pop_size,
+        n_gens=args.gens,
+        time_limit=args.time_limit,
+        patience=args.patience,
+        mutation_prob=args.mutation,
+        education_prob=args.education,
+        neighbors_k=args.neighbors,
+        workers=args.workers,
+        adaptive_penalties=args.adaptive_penalties,
+    )
+    print_summary(summarize(results))
+    if args.csv:
+        write_csv(args.csv, results)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import hashlib
+import struct
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+from vrp_fitness import PenaltyWeights
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def tour_key(tour: Sequence[int], weights: Optional[PenaltyWeights] = None) -> bytes:
+    """16-byte digest of an integer giant tour, plus the penalty weights if the
+    cached value depends on them (weight-free violation vectors do not). The
+    routes a vrp_eval.RoutedTour carries are part of the key."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(array("i", tour).tobytes())
+    routes = getattr(tour, "routes", None)
+    if routes is not None:
+        h.update(b"routes")
+        h.update(array("i", [x for r in routes for x in r]).tobytes())
+    if weights is not None:
+        h.update(struct.pack("<4d", weights.capacity, weights.time_window, weights.refrigeration, weights.max_route_time))
+    return h.digest()
+
+
+class FitnessCache:
+    """Bounded LRU cache of giant-tour evaluations (fitness values or
+    violation vectors).
+
+    Counters are kept both for the whole run (`total`) and for the current
+    generation (`generation`, reset by `end_generation`).
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._data: "OrderedDict[bytes, Any]" = OrderedDict()
+        self.total = CacheStats()
+        self.generation = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: bytes) -> Optional[Any]:
+        value = self._data.get(key)
+        if value is None:
+            self.total.misses += 1
+            self.generation.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.total.hits += 1
+        self.generation.hits += 1
+        return value
+
+    def put(self, key: bytes, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.total.evictions += 1
+            self.generation.evictions += 1
+
+    def end_generation(self) -> CacheStats:
+        """Return this generation's counters and start a new window."""
+        stats = self.generation
+        self.generation = CacheStats()
+        return stats
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from vrp_models import Client, Vehicle, Solution, get_travel_costs, set_travel_costs
+from vrp_fitness import PenaltyWeights, fitness
+from vrp_local_search import educate
+from vrp_neighbors import build_candidate_lists
+
+
+def polar_sectors(clients: List[Client], vehicles: List[Vehicle], n_sectors: int) -> List[List[Client]]:
+    """Cut clients into angular sectors around the depots with similar total demand.
+    The first sector starts after the widest empty angle, so no sector straddles it."""
+    if not clients:
+        return []
+    cx = sum(v.start_depot[0] for v in vehicles) / len(vehicles)
+    cy = sum(v.start_depot[1] for v in vehicles) / len(vehicles)
+    by_angle = sorted(clients, key=lambda c: math.atan2(c.y - cy, c.x - cx))
+    angles = [math.atan2(c.y - cy, c.x - cx) for c in by_angle]
+    gaps = [(angles[(i + 1) % len(angles)] - angles[i]) % (2 * math.pi) for i in range(len(angles))]
+    cut = (max(range(len(gaps)), key=gaps.__getitem__) + 1) % len(by_angle)
+    ordered = by_angle[cut:] + by_angle[:cut]
+
+    n_sectors = max(1, min(n_sectors, len(ordered)))
+    use_demand = any(c.demand > 0 for c in ordered)
+    total = sum(c.demand for c in ordered) if use_demand else float(len(ordered))
+    sectors: List[List[Client]] = [[] for _ in range(n_sectors)]
+    acc = 0.0
+    for c in ordered:
+        s = min(n_sectors - 1, int(acc / total * n_sectors))
+        sectors[s].append(c)
+        acc += c.demand if use_demand else 1.0
+    return [s for s in sectors if s]
+
+
+def assign_vehicles(sectors: List[List[Client]], vehicles: List[Vehicle]) -> List[List[Vehicle]]:
+    """Give every sector at least one vehicle, refrigerated ones first to sectors
+    that need refrigeration, then the rest to the sector with the largest
+    uncovered demand."""
+    demand = [sum(c.demand for c in s) for s in sectors]
+    refr = [sum(1 for c in s if c.requires_refrigeration) for s in sectors]
+    fleet: List[List[Vehicle]] = [[] for _ in sectors]
+    pool = sorted(vehicles, key=lambda v: -v.capacity)
+
+    for s in sorted(range(len(sectors)), key=lambda s: -refr[s]):
+        if refr[s] == 0:
+            break
+        rv = next((v for v in pool if v.has_refrigeration), None)
+        if rv is None:
+            break
+        fleet[s].append(rv)
+        pool.remove(rv)
+    for s in range(len(sectors)):
+        if not fleet[s] and pool:
+            fleet[s].append(pool.pop(0))
+    while pool:
+        s = max(range(len(sectors)), key=lambda s: demand[s] - sum(v.capacity for v in fleet[s]))
+        fleet[s].append(pool.pop(0))
+    return fleet
+
+
+def _solve_sector(job: Tuple[List[Client], List[Vehicle], Dict[str, Any], Optional[float], int]) -> Solution:
+    from vrp_ga import run_ga
+
+    sub_clients, sub_vehicles, ga_kwargs, deadline, left = job
+    if deadline is not None:
+        # an equal share of what is left of the caller's budget, counting the
+        # sectors this process still has to solve (this one included)
+        ga_kwargs = dict(ga_kwargs, time_limit=max(0.0, deadline - time.time()) / left)
+    return run_ga(clients=sub_clients, vehicles=sub_vehicles, verbose=False, **ga_kwargs)
+
+
+def boundary_exchange(
+    solution: Solution,
+    sectors: List[List[Client]],
+    weights: PenaltyWeights,
+    time_budget: Optional[float] = None,
+    k: int = 10,
+) -> Solution:
+    """Local search restricted to pairs of nearby clients from different sectors."""
+    clients = [c for s in sectors for c in s]
+    sector_of = {c: i for i, s in enumerate(sectors) for c in s}
+    cand = build_candidate_lists(clients, k)
+    neighbors = {
+        clients[i]: [clients[j] for j in nbrs if sector_of[clients[j]] != sector_of[clients[i]]]
+        for i, nbrs in enumerate(cand)
+    }
+    return educate(solution, weights, time_budget, neighbors)
+
+
+def solve_decomposed(
+    clients: List[Client],
+    vehicles: List[Vehicle],
+    n_sectors: int,
+    weights: Optional[PenaltyWeights] = None,
+    workers: int = 1,
+    refine_time: Optional[float] = 5.0,
+    seed: int = 1,
+    verbose: bool = True,
+    **ga_kwargs: Any,
+) -> Solution:
+    """Cluster-first, route-second: solve each polar sector with run_ga (in a
+    process pool when workers > 1), merge the routes and optionally refine
+    across sector boundaries. refine_time=0 disables the refinement pass.
+
+    A `time_limit` in ga_kwargs is the budget of all sector GAs together (one
+    wall-clock deadline), not of each one; refine_time comes on top."""
+    if weights is None:
+        weights = PenaltyWeights()
+    ga_kwargs.update(
+        weights_capacity=weights.capacity,
+        weights_tw=weights.time_window,
+        weights_refrig=weights.refrigeration,
+        weights_mrt=weights.max_route_time,
+    )
+    sectors = polar_sectors(clients, vehicles, min(n_sectors, len(vehicles)))
+    fleets = assign_vehicles(sectors, vehicles)
+    time_limit = ga_kwargs.get("time_limit")
+    deadline = time.time() + time_limit if time_limit is not None else None
+    per_process = min(max(1, workers), len(sectors))
+    jobs = [
+        (s, f, dict(ga_kwargs, seed=seed + i), deadline, math.ceil((len(sectors) - i) / per_process))
+        for i, (s, f) in enumerate(zip(sectors, fleets))
+    ]
+
+    if workers > 1:
+        # sector workers use the same road-network costs (if any)
+        with ProcessPoolExecutor(max_workers=workers, initializer=set_travel_costs, initargs=(get_travel_costs(),)) as ex:
+            parts = list(ex.map(_solve_sector, jobs))
+    else:
+        parts = [_solve_sector(job) for job in jobs]
+
+    merged = Solution(routes=[r for p in parts for r in p.routes])
+    if verbose:
+        for i, (s, f, p) in enumerate(zip(sectors, fleets, parts)):
+            print(f"Setor {i + 1}: {len(s)} clientes, {len(f)} veículos, fitness = {fitness(p, weights):.2f}")
+        print(f"Fitness combinado: {fitness(merged, weights):.2f}")
+    if refine_time is None or refine_time > 0:
+        merged = boundary_exchange(merged, sectors, weights, refine_time)
+        if verbose:
+            print(f"Fitness após troca nas fronteiras: {fitness(merged, weights):.2f}")
+    return merged
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+from math import hypot
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from vrp_models import Vehicle, Route, Solution, get_travel_costs
+from vrp_fitness import PenaltyWeights, Violations, score
+from vrp_table import ClientTable
+
+if TYPE_CHECKING:
+    from vrp_roads import TravelCosts
+
+
+class RoutedTour(list):
+    """Giant tour of client indices that carries its own routes: `routes` is
+    (vehicle index, number of clients) per route, in route order, covering
+    the tour left to right. TourEvaluator evaluates these routes as given,
+    without split/repair, so educated offspring keep the routes the local
+    search found. Crossover, mutation and slicing return plain lists."""
+
+    __slots__ = ("routes",)
+
+    def __init__(self, clients: Iterable[int], routes: Sequence[Tuple[int, int]]) -> None:
+        super().__init__(clients)
+        self.routes = tuple(routes)
+
+    def copy(self) -> "RoutedTour":
+        return RoutedTour(self, self.routes)
+
+
+class TourEvaluator:
+    """Split + repair + violation vector for giant tours of client indices,
+    without building Solution, Route or Client objects.
+
+    Gives the same numbers as split_giant_tour -> repair_solution ->
+    violation_vector over the table rows, float for float. Routes live in
+    one client-index list per vehicle, cleared and reused by every call, and
+    the instance is held as plain per-field lists. Route loads are kept as
+    running sums when all demands are integral (then exact), and re-summed
+    in route order otherwise, as repair_solution does.
+
+    `split`, `repair` and `vector` are the three steps (separate for the
+    profiler); `violations` runs them all, or, for a RoutedTour, `assign`
+    and `vector`. `solution` materializes the current routes for the final
+    answer or display. One evaluator per
+    thread or process: the buffers are shared between calls.
+
+    With road-network costs (`costs`, by default the active ones from
+    vrp_models.set_travel_costs) each leg is a lookup in the cost matrix
+    instead of a straight-line distance.
+    """
+
+    def __init__(self, table: ClientTable, vehicles: Sequence[Vehicle], costs: Optional["TravelCosts"] = None) -> None:
+        self.table = table
+        self.vehicles = list(vehicles)
+        # per-field lists straight from the table columns (no ClientRow objects)
+        self.x = table.field("x")
+        self.y = table.field("y")
+        self.demand = table.field("demand")
+        self.service = table.field("service_time")
+        self.tw_start = table.field("tw_start")
+        self.tw_end = table.field("tw_end")
+        self.refrigerated = table.field("requires_refrigeration")
+        self.capacity = [v.capacity for v in self.vehicles]
+        self.v_refrigerated = [v.has_refrigeration for v in self.vehicles]
+        self.v_max_time = [v.max_route_time for v in self.vehicles]
+        self.v_start = [v.start_depot for v in self.vehicles]
+        self.v_end = [v.end_depot for v in self.vehicles]
+        costs = costs if costs is not None else get_travel_costs()
+        self.matrix = costs.rows if costs is not None else None
+        if costs is not None:  # legs by matrix index
+            self.node = [costs.node(p) for p in zip(self.x, self.y)]
+            self.v_start_node = [costs.node(p) for p in self.v_start]
+            self.v_end_node = [costs.node(p) for p in self.v_end]
+        # point ids for leg(): clients by index, then start and end depot per vehicle
+        self.px = self.x + [p[0] for v in self.vehicles for p in (v.start_depot, v.end_depot)]
+        self.py = self.y + [p[1] for v in self.vehicles for p in (v.start_depot, v.end_depot)]
+        if costs is not None:
+            self.pnode = self.node + [n for pair in zip(self.v_start_node, self.v_end_node) for n in pair]
+        # repair tests vehicle use by dataclass equality: equal vehicles share a group
+        first = {}
+        self.v_group = [first.setdefault(v, i) for i, v in enumerate(self.vehicles)]
+        dem = np.asarray(table.columns["demand"], dtype=np.float64)
+        self.exact_loads = bool(np.all((dem == np.floor(dem)) & (np.abs(dem) < 2 ** 53)))
+        self.any_refrigerated = bool(np.any(table.columns["requires_refrigeration"]))
+
+        self.routes: List[List[int]] = [[] for _ in self.vehicles]  # clients per vehicle
+        self.order: List[int] = []  # vehicles in route order
+        self._load = [0.0] * len(self.vehicles)
+        self._group_used = [False] * len(self.vehicles)
+
+    def start_point(self, v: int) -> int:
+        return len(self.x) + 2 * v
+
+    def end_point(self, v: int) -> int:
+        return len(self.x) + 2 * v + 1
+
+    def leg(self, p: int, q: int) -> float:
+        """Travel cost between two point ids (see start_point / end_point)."""
+        m = self.matrix
+        if m is None:
+            px, py = self.px, self.py
+            return hypot(px[p] - px[q], py[p] - py[q])
+        return m[self.pnode[p]][self.pnode[q]]
+
+    def _route_load(self, v: int) -> float:
+        if self.exact_loads:
+            return self._load[v]
+        dem = self.demand
+        return sum(dem[j] for j in self.routes[v])
+
+    def _clear(self) -> None:
+        for v in self.order:
+            self.routes[v].clear()
+            self._group_used[self.v_group[v]] = False
+        self.order.clear()
+
+    def assign(self, tour: Sequence[int], routes: Sequence[Tuple[int, int]]) -> None:
+        """Fill the route buffers with given routes ((vehicle, count) per
+        route over the tour) instead of splitting."""
+        self._clear()
+        dem = self.demand
+        k = 0
+        for v, n in routes:
+            r = self.routes[v]
+            r.extend(tour[k:k + n])
+            k += n
+            l = 0.0
+            for j in r:
+                l += dem[j]
+            self._load[v] = l
+            self.order.append(v)
+            self._group_used[self.v_group[v]] = True
+
+    def load(self, tour: Sequence[int]) -> None:
+        """Routes of a tour into the buffers: its own for a RoutedTour, else
+        split + repair."""
+        if isinstance(tour, RoutedTour):
+            self.assign(tour, tour.routes)
+        else:
+            self.split(tour)
+            self.repair()
+
+    def split(self, tour: Sequence[int]) -> None:
+        """split_giant_tour into the route buffers."""
+        routes, order, load, dem, cap = self.routes, self.order, self._load, self.demand, self.capacity
+        self._clear()
+        n, n_vehicles = len(tour), len(cap)
+        i = v = 0
+        while i < n and v < n_vehicles:
+            r = routes[v]
+            c = cap[v]
+            l = 0.0
+            while i < n:
+                d = dem[tour[i]]
+                if l + d <= c:
+                    r.append(tour[i])
+                    l += d
+                    i += 1
+                else:
+                    break
+            load[v] = l
+            order.append(v)
+            v += 1
+        # leftover clients (if any) go into the last route
+        if i < n:
+            last = order[-1]
+            r = routes[last]
+            while i < n:
+                r.append(tour[i])
+                load[last] += dem[tour[i]]
+                i += 1
+        for v in order:
+            self._group_used[self.v_group[v]] = True
+
+    def repair(self) -> None:
+        """repair_solution on the route buffers."""
+        routes, order, load, dem, cap = self.routes, self.order, self._load, self.demand, self.capacity
+        route_load = self._route_load
+
+        # refrigerated clients out of non-refrigerated routes
+        refr_routes = [v for v in order if self.v_refrigerated[v]] if self.any_refrigerated else ()
+        if refr_routes:
+            needs = self.refrigerated
+            # spare capacity per refrigerated route, as the check computes it;
+            # clients heavier than the largest are skipped without a scan
+            room = [cap[u] - route_load(u) for u in refr_routes]
+            most = max(room)
+            for v in order:
+                if self.v_refrigerated[v]:
+                    continue
+                r = routes[v]
+                k = 0
+                while k < len(r):
+                    j = r[k]
+                    if needs[j] and most >= dem[j]:
+                        for t, u in enumerate(refr_routes):
+                            if room[t] >= dem[j]:
+                                routes[u].append(j)
+                                load[u] += dem[j]
+                                del r[k]
+                                load[v] -= dem[j]
+                                room[t] = cap[u] - route_load(u)
+                                most = max(room)
+                                break
+                        else:
+                            k += 1
+                    else:
+                        k += 1
+
+        # capacity: push tail clients to later routes, or to an unused vehicle
+        group, used = self.v_group, self._group_used
+        idx = 0
+        while idx < len(order):
+            v = order[idx]
+            r = routes[v]
+            while route_load(v) > cap[v] and r:
+                j = r.pop()
+                load[v] -= dem[j]
+                for t in range(idx + 1, len(order)):
+                    u = order[t]
+                    if cap[u] - route_load(u) >= dem[j]:
+                        routes[u].append(j)
+                        load[u] += dem[j]
+                        break
+                else:
+                    spare = next((w for w in range(len(cap)) if not used[group[w]]), None)
+                    if spare is None:
+                        r.append(j)  # put back (will incur penalty)
+                        load[v] += dem[j]
+                        break
+                    routes[spare].append(j)
+                    load[spare] = dem[j]
+                    order.append(spare)
+                    used[group[spare]] = True
+            idx += 1
+
+    def vector(self) -> Violations:
+        """violation_vector of the routes in the buffers."""
+        x, y, dem, service = self.x, self.y, self.demand, self.service
+        tw_start, tw_end, needs = self.tw_start, self.tw_end, self.refrigerated
+        m = self.matrix
+        node = self.node if m is not None else None
+        dist = cap_v = tw_v = refr_v = mrt_v = 0.0
+        for v in self.order:
+            r = self.routes[v]
+            max_time = self.v_max_time[v]
+            if not r:
+                # mirrors violation_vector on an empty route: capacity_violation
+                # and max_route_time_violation see load 0 and route time 0.0,
+                # so these are non-zero only for negative limits
+                cap_v += max(0.0, 0 - self.capacity[v])
+                if max_time is not None:
+                    mrt_v += max(0.0, 0.0 - max_time)
+                continue
+            j = r[0]
+            if m is None:
+                sx, sy = self.v_start[v]
+                leg = hypot(sx - x[j], sy - y[j])
+            else:
+                leg = m[self.v_start_node[v]][node[j]]
+            d = leg  # distance
+            t = leg  # route time (no waiting)
+            clock = leg  # time-window clock (with waiting)
+            late = 0.0
+            total = 0
+            requires = False
+            for k in range(len(r) - 1):
+                a, b = r[k], r[k + 1]
+                total += dem[a]
+                requires = requires or needs[a]
+                leg = hypot(x[a] - x[b], y[a] - y[b]) if m is None else m[node[a]][node[b]]
+                d += leg
+                t += service[a]
+                t += leg
+                if tw_end[a] is not None:
+                    late += max(0.0, clock - tw_end[a])
+                begin = max(clock, tw_start[a]) if tw_start[a] is not None else clock
+                clock = begin + service[a] + leg
+            a = r[-1]
+            total += dem[a]
+            requires = requires or needs[a]
+            if m is None:
+                ex, ey = self.v_end[v]
+                leg = hypot(x[a] - ex, y[a] - ey)
+            else:
+                leg = m[node[a]][self.v_end_node[v]]
+            d += leg
+            t += service[a]
+            t += leg
+            if tw_end[a] is not None:
+                late += max(0.0, clock - tw_end[a])
+
+            dist += d
+            cap_v += max(0.0, total - self.capacity[v])
+            tw_v += late
+            refr_v += 1.0 if requires and not self.v_refrigerated[v] else 0.0
+            if max_time is not None:
+                mrt_v += max(0.0, t - max_time)
+        return (dist, cap_v, tw_v, refr_v, mrt_v)
+
+    def violations(self, tour: Sequence[int]) -> Violations:
+        self.load(tour)
+        return self.vector()
+
+    def fitness(self, tour: Sequence[int], weights: Optional[PenaltyWeights] = None) -> float:
+        return score(self.violations(tour), weights or PenaltyWeights())
+
+    def solution(self, tour: Optional[Sequence[int]] = None) -> Solution:
+        """Solution with Client objects for tour (or for the routes currently
+        in the buffers)."""
+        if tour is not None:
+            self.load(tour)
+        return Solution(routes=[
+            Route(vehicle=self.vehicles[v], clients=self.table.to_clients(self.routes[v])) for v in self.order
+        ])
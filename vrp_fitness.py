@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Optional, Sequence, Tuple
 from dataclasses import dataclass
-from vrp_models import Solution, Route, euclidean
+from vrp_models import Solution, Route, travel_cost
 
 
 @dataclass
@@ -19,14 +19,14 @@ def evaluate_route_time(route: Route) -> float:
     if not route.clients:
         return 0.0
     # depot to first
-    t += euclidean(route.vehicle.start_depot, route.clients[0].pos)
+    t += travel_cost(route.vehicle.start_depot, route.clients[0].pos)
     # service + travel
     for a, b in zip(route.clients[:-1], route.clients[1:]):
         t += a.service_time
-        t += euclidean(a.pos, b.pos)
+        t += travel_cost(a.pos, b.pos)
     # last service + back to depot
     t += route.clients[-1].service_time
-    t += euclidean(route.clients[-1].pos, route.vehicle.end_depot)
+    t += travel_cost(route.clients[-1].pos, route.vehicle.end_depot)
     return t
 
 
@@ -35,7 +35,7 @@ def time_window_violation(route: Route) -> float:
     If arrival < tw_start, assume waiting allowed (no penalty)."""
     if not route.clients:
         return 0.0
-    t = euclidean(route.vehicle.start_depot, route.clients[0].pos)
+    t = travel_cost(route.vehicle.start_depot, route.clients[0].pos)
     violation = 0.0
     for a, b in zip(route.clients[:-1], route.clients[1:]):
         # arrive at a
@@ -44,7 +44,7 @@ def time_window_violation(route: Route) -> float:
             violation += max(0.0, t - a.tw_end)
         # serve a (if arrive earlier than start, we assume wait -> no penalty)
         start_time = max(t, a.tw_start) if a.tw_start is not None else t
-        t = start_time + a.service_time + euclidean(a.pos, b.pos)
+        t = start_time + a.service_time + travel_cost(a.pos, b.pos)
     # last client
     last = route.clients[-1]
     if last.tw_end is not None:
@@ -85,3 +85,96 @@ def fitness(solution: Solution, weights: Optional[PenaltyWeights] = None) -> flo
         mrt = max_route_time_violation(r)
         cost += dist + (weights.capacity * cap) + (weights.time_window * tw) + (weights.refrigeration * refr) + (weights.max_route_time * mrt)
     return cost
+
+
+# Raw fitness components: (distance, capacity, time_window, refrigeration, max_route_time).
+Violations = Tuple[float, float, float, float, float]
+
+
+def violation_vector(solution: Solution) -> Violations:
+    """Weight-free components of fitness: total distance and the total of each
+    violation. fitness(solution, w) == score(violation_vector(solution), w) up
+    to float summation order."""
+    dist = cap = tw = refr = mrt = 0.0
+    for r in solution.routes:
+        dist += r.distance()
+        cap += capacity_violation(r)
+        tw += time_window_violation(r)
+        refr += refrigeration_violation(r)
+        mrt += max_route_time_violation(r)
+    return (dist, cap, tw, refr, mrt)
+
+
+def score(v: Violations, weights: PenaltyWeights) -> float:
+    return (
+        v[0]
+        + weights.capacity * v[1]
+        + weights.time_window * v[2]
+        + weights.refrigeration * v[3]
+        + weights.max_route_time * v[4]
+    )
+
+
+class AdaptivePenalties:
+    """Adjusts each penalty weight towards a target feasibility ratio.
+
+    `record` counts, for every evaluated individual, which constraints it
+    satisfies. Every `every` generations `end_generation` compares each
+    constraint's feasible ratio with `target`: below target - tolerance the
+    weight is multiplied by `up`, above target + tolerance by `down` (as in
+    Vidal et al.'s HGS), clamped to `bounds`. It returns the new weights, or
+    None if nothing changed.
+    """
+
+    FIELDS = ("capacity", "time_window", "refrigeration", "max_route_time")
+
+    def __init__(
+        self,
+        weights: PenaltyWeights,
+        target: float = 0.2,
+        every: int = 10,
+        up: float = 1.2,
+        down: float = 0.85,
+        tolerance: float = 0.05,
+        bounds: Tuple[float, float] = (1e-2, 1e7),
+    ) -> None:
+        self.weights = weights
+        self.target = target
+        self.every = every
+        self.up = up
+        self.down = down
+        self.tolerance = tolerance
+        self.bounds = bounds
+        self.ratios: Tuple[float, ...] = ()  # feasible ratio per constraint in the last window
+        self._feasible = [0] * len(self.FIELDS)
+        self._seen = 0
+        self._gens = 0
+
+    def record(self, vectors: Sequence[Violations]) -> None:
+        for v in vectors:
+            for k in range(len(self.FIELDS)):
+                if v[k + 1] <= 0.0:
+                    self._feasible[k] += 1
+        self._seen += len(vectors)
+
+    def end_generation(self) -> Optional[PenaltyWeights]:
+        self._gens += 1
+        if self._gens < self.every or not self._seen:
+            return None
+        self.ratios = tuple(f / self._seen for f in self._feasible)
+        self._feasible = [0] * len(self.FIELDS)
+        self._seen = 0
+        self._gens = 0
+        lo, hi = self.bounds
+        new = {}
+        for name, ratio in zip(self.FIELDS, self.ratios):
+            value = getattr(self.weights, name)
+            if ratio < self.target - self.tolerance:
+                value *= self.up
+            elif ratio > self.target + self.tolerance:
+                value *= self.down
+            new[name] = min(hi, max(lo, value))
+        if all(new[n] == getattr(self.weights, n) for n in self.FIELDS):
+            return None
+        self.weights = PenaltyWeights(**new)
+        return self.weights
@@ -1,25 +1,29 @@
 from __future__ import annotations
 
+import itertools
+import os
 import random
 import time
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Union
 import argparse
 
 from vrp_models import Client, Vehicle, Solution
 from vrp_split import split_giant_tour
 from vrp_repair import repair_solution
-from vrp_fitness import (
-    fitness, PenaltyWeights,
-    evaluate_route_time,
-    capacity_violation,
-    time_window_violation,
-    refrigeration_violation,
-    max_route_time_violation,
-)
+from vrp_fitness import fitness, PenaltyWeights, AdaptivePenalties, Violations, score
 from vrp_mutations import mutate_vrp
+from vrp_local_search import educate_tour
+from vrp_neighbors import build_candidate_lists
 from genetic_algorithm import order_crossover
-from vrp_io import load_vrp_from_json
-from vrp_visualize import draw_solution
+from vrp_parallel import ParallelEvaluator
+from vrp_batch import BatchEvaluator
+from vrp_cache import FitnessCache, tour_key
+from vrp_table import ClientTable, load_client_table
+from vrp_eval import RoutedTour, TourEvaluator
+from vrp_warmstart import load_prior_routes, map_to_instance, seed_population
+from vrp_profiling import Profiler, NULL_PROFILER
+from vrp_report import export_solution
 
 
 def generate_random_clients(n: int, seed: int = 0) -> List[Client]:
@@ -51,126 +55,448 @@ def evaluate_tour(tour: List[Client], vehicles: List[Vehicle], w: PenaltyWeights
     return fitness(sol, w)
 
 
-def run_ga(
+@dataclass
+class Improvement:
+    """A new best solution found by iter_ga.
+
+    `solution` is decoded from the tour on first access, so consumers that
+    only read the fitness or the tour (or just keep the last improvement)
+    build no Route/Client objects for the others.
+    """
+    generation: int
+    elapsed: float  # seconds since the GA started
+    fitness: float
+    tour: List[int]  # giant tour as indices into the client list
+    decoder: Callable[[List[int]], Solution] = field(repr=False, compare=False)
+    _solution: Optional[Solution] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def solution(self) -> Solution:
+        if self._solution is None:
+            self._solution = self.decoder(self.tour)
+        return self._solution
+
+
+def iter_ga(
     pop_size: int = 50,
-    n_gens: int = 200,
+    n_gens: Optional[int] = 200,
     mutation_prob: float = 0.4,
     seed: int = 1,
-    clients: Optional[List[Client]] = None,
+    clients: Optional[Union[List[Client], ClientTable]] = None,
     vehicles: Optional[List[Vehicle]] = None,
     weights_capacity: float = 1000.0,
     weights_tw: float = 500.0,
     weights_refrig: float = 5000.0,
     weights_mrt: float = 200.0,
-):
+    workers: int = 1,
+    batch_eval: bool = False,
+    cache_size: int = 0,
+    education_prob: float = 0.0,
+    education_time: float = 0.05,
+    neighbors_k: int = 0,
+    neighbors_tw: bool = False,
+    verbose: bool = True,
+    initial_tour: Optional[List[int]] = None,
+    warm_ratio: float = 0.5,
+    time_limit: Optional[float] = None,
+    target_fitness: Optional[float] = None,
+    patience: Optional[int] = None,
+    profiler: Optional[Profiler] = None,
+    adaptive_penalties: bool = False,
+    target_feasible: float = 0.2,
+    adapt_every: int = 10,
+    stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[Improvement]:
+    """Anytime GA: yields an Improvement every time the best fitness improves,
+    so callers can stop at any deadline and keep the best so far.
+
+    Stops after n_gens generations (None or 0 = unbounded), after time_limit
+    seconds, once the best fitness reaches target_fitness, or after `patience`
+    generations without improvement, or when `stop()` returns True (checked
+    once per generation, e.g. for cancellation), whichever comes first.
+
+    With `batch_eval` each generation's new tours are scored together by
+    vrp_batch.BatchEvaluator (NumPy over all their routes) instead of one by
+    one; worth it from a few hundred individuals up. workers > 1 takes
+    precedence.
+
+    `profiler` (vrp_profiling.Profiler) records time and call counts per phase
+    (selection, crossover, mutation, education, split, repair, fitness) and
+    writes one trace line per generation; without it nothing is measured.
+
+    Individuals are evaluated once into weight-free violation vectors (cached by
+    tour alone) and scored arithmetically with the current weights. With
+    `adaptive_penalties`, each weight is adjusted every `adapt_every`
+    generations so that about `target_feasible` of the population satisfies
+    that constraint (vrp_fitness.AdaptivePenalties); the best solution is then
+    the best feasible one if any has been found.
+    """
+    if not n_gens and time_limit is None and target_fitness is None and patience is None:
+        raise ValueError("n_gens ilimitado exige time_limit, target_fitness ou patience")
     random.seed(seed)
     clients = clients if clients is not None else generate_random_clients(18, seed)
     vehicles = vehicles if vehicles is not None else build_vehicles()
     w = PenaltyWeights(capacity=weights_capacity, time_window=weights_tw, refrigeration=weights_refrig, max_route_time=weights_mrt)
+    prof = profiler if profiler is not None else NULL_PROFILER
+    penalties = AdaptivePenalties(w, target_feasible, adapt_every) if adaptive_penalties else None
+
+    # genome = client indices into the table; Client objects are only built
+    # for the returned solution. A ClientTable (vrp_table.load_client_table)
+    # is used as is.
+    table = clients if isinstance(clients, ClientTable) else ClientTable.from_clients(clients)
 
-    # initialize population of giant tours
-    base = clients[:]
-    population: List[List[Client]] = [random.sample(base, len(base)) for _ in range(pop_size)]
+    # granular neighbourhoods: mutations and local search only pair close clients
+    neighbors = None
+    if neighbors_k > 0:
+        neighbors = build_candidate_lists(table.rows, neighbors_k, neighbors_tw)
 
-    # evaluate
-    def fit(ind: List[Client]) -> float:
-        return evaluate_tour(ind, vehicles, w)
+    # initialize population of giant tours (optionally seeded from a prior solution)
+    population: List[List[int]] = []
+    if initial_tour is not None:
+        population = seed_population(initial_tour, max(1, min(pop_size, int(round(pop_size * warm_ratio)))))
+    population += [random.sample(range(len(table)), len(table)) for _ in range(pop_size - len(population))]
+
+    # evaluate on index routes in reused buffers; no Solution/Route objects
+    tour_eval = TourEvaluator(table, vehicles)
+
+    def fit(ind: List[int]) -> Violations:
+        if not prof.enabled:
+            return tour_eval.violations(ind)
+        if isinstance(ind, RoutedTour):  # educated: its routes, no split/repair
+            with prof.phase("fitness"):
+                return tour_eval.violations(ind)
+        with prof.phase("split"):
+            tour_eval.split(ind)
+        with prof.phase("repair"):
+            tour_eval.repair()
+        with prof.phase("fitness"):
+            return tour_eval.vector()
+
+    # parallel backend: workers receive only client indices
+    evaluator = ParallelEvaluator(table, vehicles, w, workers) if workers > 1 else None
+    batch = BatchEvaluator(table, vehicles) if batch_eval and evaluator is None else None
+    cache = FitnessCache(cache_size) if cache_size > 0 else None
+
+    def evaluate_batch(pop: List[List[int]]) -> List[Violations]:
+        prof.add_evaluations(len(pop))
+        if batch is not None:
+            with prof.phase("batch_evaluation"):  # split + repair per tour, scoring vectorized
+                return batch.violations(pop)
+        if evaluator is None:
+            return [fit(ind) for ind in pop]
+        # workers get bare index arrays, so educated tours (RoutedTour) are
+        # evaluated here on their own routes
+        out: List[Optional[Violations]] = [fit(ind) if isinstance(ind, RoutedTour) else None for ind in pop]
+        plain = [i for i, v in enumerate(out) if v is None]
+        if plain:
+            with prof.phase("parallel_evaluation"):  # split + repair + fitness in the workers
+                for i, v in zip(plain, evaluator.evaluate_violations([pop[i] for i in plain])):
+                    out[i] = v
+        return out
+
+    def evaluate_population(pop: List[List[int]]) -> List[Violations]:
+        if cache is None:
+            return evaluate_batch(pop)
+        out: List[Optional[Violations]] = [None] * len(pop)
+        pending = {}  # key -> positions of the same missing tour
+        for i, ind in enumerate(pop):
+            key = tour_key(ind)  # vectors do not depend on the weights
+            if key in pending:
+                pending[key].append(i)
+                continue
+            val = cache.get(key)
+            if val is None:
+                pending[key] = [i]
+            else:
+                out[i] = val
+        if pending:
+            keys = list(pending)
+            for key, val in zip(keys, evaluate_batch([pop[pending[k][0]] for k in keys])):
+                cache.put(key, val)
+                for i in pending[key]:
+                    out[i] = val
+        return out
+
+    def decode(ind: List[int]) -> Solution:
+        return tour_eval.solution(ind)
+
+    def feasible(v: Violations) -> bool:
+        return not (v[1] or v[2] or v[3] or v[4])
 
     start = time.perf_counter()
     best = None
     best_f = float('inf')
+    best_v: Optional[Violations] = None
+    gens_since_improvement = 0
+    stop_reason = None
+
+    try:
+        for g in (range(1, n_gens + 1) if n_gens else itertools.count(1)):
+            vectors = evaluate_population(population)
+            if penalties is not None:
+                penalties.record(vectors)
+                new_w = penalties.end_generation()
+                if new_w is not None:
+                    w = new_w
+                    if best_v is not None:
+                        best_f = score(best_v, w)
+                    if verbose:
+                        ratios = ", ".join(f"{r:.0%}" for r in penalties.ratios)
+                        print(
+                            f"Pesos ajustados: cap={w.capacity:.1f}, tw={w.time_window:.1f}, "
+                            f"refrig={w.refrigeration:.1f}, mrt={w.max_route_time:.1f} (viáveis cap/tw/refrig/mrt: {ratios})"
+                        )
+            # rescoring under the current weights is pure arithmetic
+            paired = sorted(zip(population, vectors, [score(v, w) for v in vectors]), key=lambda x: x[2])
+            population = [p for p, _, _ in paired]
+            vectors = [v for _, v, _ in paired]
+            fitnesses = [f for _, _, f in paired]
 
-    for g in range(1, n_gens + 1):
-        fitnesses = [fit(ind) for ind in population]
-        paired = list(zip(population, fitnesses))
-        paired.sort(key=lambda x: x[1])
-        population = [p for p, _ in paired]
-        fitnesses = [f for _, f in paired]
-
-        if fitnesses[0] < best_f:
-            best_f = fitnesses[0]
-            best = population[0][:]
-
-        print(f"Gen {g}: best = {best_f:.2f}")
-
-        new_pop: List[List[Client]] = [population[0]]  # elitism
-        # fitness-proportional selection (invert for minimization)
-        inv = [1.0 / (f + 1e-9) for f in fitnesses]
-        for _ in range(pop_size - 1):
-            p1, p2 = random.choices(population, weights=inv, k=2)
-            child = order_crossover(p1, p2)
-            child = mutate_vrp(child, mutation_prob)
-            new_pop.append(child)
-        population = new_pop
+            improvement = None
+            cand = 0
+            if penalties is None:
+                better = fitnesses[0] < best_f
+            else:  # feasible beats infeasible whatever the current weights
+                cand = next((i for i, v in enumerate(vectors) if feasible(v)), 0)
+                better = best_v is None or (not feasible(vectors[cand]), fitnesses[cand]) < (not feasible(best_v), best_f)
+            if better:
+                best_f = fitnesses[cand]
+                best_v = vectors[cand]
+                best = population[cand].copy()
+                gens_since_improvement = 0
+                improvement = Improvement(g, time.perf_counter() - start, best_f, best.copy(), decode)
+            else:
+                gens_since_improvement += 1
+
+            extra = {"best_fitness": best_f}
+            if penalties is not None:
+                extra["weights"] = [getattr(w, n) for n in AdaptivePenalties.FIELDS]
+            if cache is None:
+                if verbose:
+                    print(f"Gen {g}: best = {best_f:.2f}")
+                prof.end_generation(g, **extra)
+            else:
+                cs = cache.end_generation()
+                if verbose:
+                    print(
+                        f"Gen {g}: best = {best_f:.2f} | cache: hit {cs.hit_rate:.0%} "
+                        f"(hits={cs.hits}, misses={cs.misses}, evictions={cs.evictions})"
+                    )
+                prof.end_generation(g, cache_hit_rate=cs.hit_rate, **extra)
+            if improvement is not None:
+                yield improvement
+
+            if target_fitness is not None and best_f <= target_fitness:
+                stop_reason = f"fitness alvo {target_fitness:.2f} atingido na geração {g}"
+            elif patience is not None and gens_since_improvement >= patience:
+                stop_reason = f"nenhuma melhoria por {patience} gerações consecutivas"
+            elif time_limit is not None and time.perf_counter() - start >= time_limit:
+                stop_reason = f"limite de tempo de {time_limit:.1f}s atingido na geração {g}"
+            elif stop is not None and stop():
+                stop_reason = f"interrompido na geração {g}"
+            if stop_reason is not None:
+                break
+
+            new_pop: List[List[int]] = [population[0]]  # elitism
+            if cand:
+                new_pop.append(population[cand])  # and the best feasible one
+            # fitness-proportional selection (invert for minimization)
+            inv = [1.0 / (f + 1e-9) for f in fitnesses]
+            while len(new_pop) < pop_size:
+                with prof.phase("selection"):
+                    p1, p2 = random.choices(population, weights=inv, k=2)
+                with prof.phase("crossover"):
+                    child = order_crossover(p1, p2)
+                with prof.phase("mutation"):
+                    child = mutate_vrp(child, mutation_prob, neighbors)
+                # education: local search on the decoded routes; the child
+                # keeps them (RoutedTour) instead of being split again
+                if education_prob > 0 and random.random() < education_prob:
+                    with prof.phase("education"):
+                        child = educate_tour(child, tour_eval, w, education_time, neighbors)
+                new_pop.append(child)
+            population = new_pop
+    finally:
+        if evaluator is not None:
+            evaluator.close()
 
     total = time.perf_counter() - start
-    print(f"Tempo total: {total:.2f}s | Melhor fitness: {best_f:.2f}")
+    if verbose and stop_reason is not None:
+        print(f"Parada antecipada: {stop_reason}.")
+    if verbose:
+        print(f"Tempo total: {total:.2f}s | Melhor fitness: {best_f:.2f}")
+    if verbose and cache is not None:
+        print(f"Cache: hit {cache.total.hit_rate:.0%} (hits={cache.total.hits}, misses={cache.total.misses}, evictions={cache.total.evictions})")
 
-    # return best solution materialized
-    sol = split_giant_tour(best, vehicles)
-    sol = repair_solution(sol, vehicles)
-    return sol
+
+def run_ga(*args, on_improvement: Optional[Callable[[Improvement], None]] = None, **kwargs) -> Solution:
+    """Run iter_ga (same parameters) to the end and return the best solution.
+    on_improvement, if given, is called with each Improvement as it is found."""
+    last = None
+    for last in iter_ga(*args, **kwargs):
+        if on_improvement is not None:
+            on_improvement(last)
+    return last.solution
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="VRP GA runner")
-    parser.add_argument("--data", type=str, default=None, help="Caminho para JSON com clients/vehicles (ex.: sample_vrp.json)")
+    parser.add_argument("--data", type=str, default=None, help="Caminho para JSON com clients/vehicles (ex.: sample_vrp.json) ou diretório binário (vrp_io.py)")
     parser.add_argument("--pop-size", type=int, default=50, help="Tamanho da população")
-    parser.add_argument("--gens", type=int, default=200, help="Número de gerações")
+    parser.add_argument("--gens", type=int, default=200, help="Número de gerações (0 = sem limite; use com --time-limit/--target/--patience)")
+    parser.add_argument("--time-limit", type=float, default=None, help="Tempo máximo de execução (s)")
+    parser.add_argument("--target", type=float, default=None, help="Para ao atingir este fitness")
+    parser.add_argument("--patience", type=int, default=None, help="Parada antecipada: gerações sem melhoria")
     parser.add_argument("--mutation", type=float, default=0.4, help="Probabilidade de mutação")
     parser.add_argument("--seed", type=int, default=1, help="Seed aleatória")
     parser.add_argument("--visualize", action="store_true", help="Exibir visualização Pygame ao final")
+    parser.add_argument("--live", action="store_true", help="Visualização ao vivo: mostra cada nova melhor solução e a curva de convergência durante a execução")
     parser.add_argument("--w-cap", type=float, default=1000.0, help="Peso penalidade de capacidade")
     parser.add_argument("--w-tw", type=float, default=500.0, help="Peso penalidade de janela de tempo")
     parser.add_argument("--w-refrig", type=float, default=5000.0, help="Peso penalidade de refrigeração")
     parser.add_argument("--w-mrt", type=float, default=200.0, help="Peso penalidade de tempo máximo de rota")
+    parser.add_argument("--cache-size", type=int, default=0, help="Entradas do cache LRU de fitness (0 = desativado)")
+    parser.add_argument("--education", type=float, default=0.0, help="Probabilidade de aplicar busca local (educação) em cada filho")
+    parser.add_argument("--education-time", type=float, default=0.05, help="Tempo máximo (s) da busca local por filho")
+    parser.add_argument("--neighbors", type=int, default=0, help="Vizinhos mais próximos por cliente para mutação/busca local granular (0 = todos)")
+    parser.add_argument("--neighbors-tw", action="store_true", help="Filtra vizinhos por compatibilidade de janela de tempo")
+    parser.add_argument("--sectors", type=int, default=0, help="Decomposição: resolve N setores polares separadamente e combina (0 = desativado)")
+    parser.add_argument("--refine-time", type=float, default=5.0, help="Tempo (s) da troca nas fronteiras entre setores (0 = sem refinamento)")
+    parser.add_argument("--warm-start", type=str, default=None, help="Solução anterior (JSON ou rotas_otimizadas.txt) para semear a população")
+    parser.add_argument("--warm-ratio", type=float, default=0.5, help="Fração da população semeada a partir da solução anterior")
+    parser.add_argument("--workers", type=int, default=1, help="Processos para avaliação paralela do fitness (1 = serial)")
+    parser.add_argument("--batch-eval", action="store_true", help="Avalia os novos indivíduos de cada geração em lote com NumPy (vrp_batch.py); compensa em populações grandes")
+    parser.add_argument("--roads", type=str, default=None, help="Grafo de ruas (lista de arestas, ver vrp_roads.py): custos de viagem pelos caminhos mínimos na malha em vez de linha reta")
+    parser.add_argument("--roads-cache", type=str, default=".vrp_cache", help="Diretório do cache da matriz de custos da malha viária")
+    parser.add_argument("--roads-workers", type=int, default=os.cpu_count() or 1, help="Processos para o cálculo dos caminhos mínimos")
+    parser.add_argument("--adaptive-penalties", action="store_true", help="Ajusta os pesos de penalidade durante a execução (os --w-* são os valores iniciais)")
+    parser.add_argument("--target-feasible", type=float, default=0.2, help="Fração alvo da população viável em cada restrição (com --adaptive-penalties)")
+    parser.add_argument("--adapt-every", type=int, default=10, help="Gerações entre ajustes dos pesos (com --adaptive-penalties)")
+    parser.add_argument("--result-cache", type=str, default=None, help="Diretório do cache de resultados em disco (mesma instância + parâmetros = resposta imediata)")
+    parser.add_argument("--result-cache-mb", type=float, default=256.0, help="Tamanho máximo do cache de resultados (MB)")
+    parser.add_argument("--report", action="append", default=[], help="Relatório adicional (.txt, .json ou .csv); pode repetir")
+    parser.add_argument("--profile", type=str, default=None, help="Grava métricas por fase/geração em JSON lines (ex.: perfil.jsonl)")
+    parser.add_argument("--cprofile", type=str, default=None, help="Grava estatísticas cProfile (.prof) para snakeviz/flamegraph")
+    parser.add_argument("--profile-memory", action="store_true", help="Inclui o pico de memória (tracemalloc) no --profile; deixa a execução bem mais lenta")
     args = parser.parse_args()
 
+    profiler = Profiler(args.profile, args.cprofile, args.profile_memory) if args.profile or args.cprofile else None
+
     if args.data:
-        cls, vs = load_vrp_from_json(args.data)
+        # a table, not Client objects: binary instances go from their columns
+        # straight to the GA; rows stand in for clients below
+        cls, vs = load_client_table(args.data)
     else:
         cls, vs = None, None
 
-    sol = run_ga(
+    if args.roads:
+        from vrp_models import set_travel_costs
+        from vrp_roads import road_travel_costs
+
+        # the default instance is materialized only for the matrix (see --live)
+        set_travel_costs(road_travel_costs(
+            args.roads,
+            cls if cls is not None else generate_random_clients(18, args.seed),
+            vs if vs is not None else build_vehicles(),
+            cache_dir=args.roads_cache,
+            workers=args.roads_workers,
+        ))
+
+    live = None
+    if args.live:
+        from vrp_live import LivePublisher
+
+        # the default instance is materialized for the viewer only, so the
+        # GA still draws it from its own random stream
+        live = LivePublisher(
+            cls.to_clients() if cls is not None else generate_random_clients(18, args.seed),
+            vs if vs is not None else build_vehicles(),
+            weights=PenaltyWeights(args.w_cap, args.w_tw, args.w_refrig, args.w_mrt),
+        ).start()
+
+    ga_kwargs = dict(
         pop_size=args.pop_size,
         n_gens=args.gens,
         mutation_prob=args.mutation,
-        seed=args.seed,
-        clients=cls,
-        vehicles=vs,
-        weights_capacity=args.w_cap,
-        weights_tw=args.w_tw,
-        weights_refrig=args.w_refrig,
-        weights_mrt=args.w_mrt,
+        cache_size=args.cache_size,
+        batch_eval=args.batch_eval,
+        education_prob=args.education,
+        education_time=args.education_time,
+        neighbors_k=args.neighbors,
+        neighbors_tw=args.neighbors_tw,
+        time_limit=args.time_limit,
+        target_fitness=args.target,
+        patience=args.patience,
+        adaptive_penalties=args.adaptive_penalties,
+        target_feasible=args.target_feasible,
+        adapt_every=args.adapt_every,
     )
-    if args.visualize:
+    if args.sectors > 0:
+        from vrp_decompose import solve_decomposed
+
+        sol = solve_decomposed(
+            cls.to_clients() if cls is not None else generate_random_clients(18, args.seed),
+            vs if vs is not None else build_vehicles(),
+            args.sectors,
+            weights=PenaltyWeights(
+                capacity=args.w_cap,
+                time_window=args.w_tw,
+                refrigeration=args.w_refrig,
+                max_route_time=args.w_mrt,
+            ),
+            workers=args.workers,
+            refine_time=args.refine_time,
+            seed=args.seed,
+            **ga_kwargs,
+        )
+    else:
+        initial_tour = None
+        if args.warm_start:
+            cls = cls if cls is not None else generate_random_clients(18, args.seed)
+            prior = [cid for route in load_prior_routes(args.warm_start) for cid in route]
+            initial_tour = map_to_instance(prior, cls)
+        run_kwargs = dict(
+            seed=args.seed,
+            clients=cls,
+            vehicles=vs,
+            initial_tour=initial_tour,
+            warm_ratio=args.warm_ratio,
+            weights_capacity=args.w_cap,
+            weights_tw=args.w_tw,
+            weights_refrig=args.w_refrig,
+            weights_mrt=args.w_mrt,
+            workers=args.workers,
+            profiler=profiler,
+            on_improvement=live.publish if live is not None else None,
+            **ga_kwargs,
+        )
+        if args.result_cache:
+            from vrp_result_cache import ResultCache, solve_cached
+
+            t0 = time.perf_counter()
+            sol, hit = solve_cached(ResultCache(args.result_cache, int(args.result_cache_mb * 1024 * 1024)), **run_kwargs)
+            if hit:
+                print(f"Resultado obtido do cache em {(time.perf_counter() - t0) * 1000:.1f} ms | Fitness: {fitness(sol, PenaltyWeights(args.w_cap, args.w_tw, args.w_refrig, args.w_mrt)):.2f}")
+        else:
+            sol = run_ga(**run_kwargs)
+    if live is not None:
+        with (profiler or NULL_PROFILER).phase("rendering"):
+            live.close(sol)  # final solution; returns when the window is closed
+    elif args.visualize:
+        from vrp_visualize import draw_solution  # pygame only when rendering
+
         w = PenaltyWeights(
             capacity=args.w_cap,
             time_window=args.w_tw,
             refrigeration=args.w_refrig,
             max_route_time=args.w_mrt,
         )
-        draw_solution(sol, weights=w)
+        with (profiler or NULL_PROFILER).phase("rendering"):
+            draw_solution(sol, weights=w)
+    if profiler is not None:
+        profiler.close()
 
     # Exportação automática dos dados das rotas para relatório
-    def exportar_rotas_txt(sol, arquivo="rotas_otimizadas.txt"):
-        with open(arquivo, "w") as f:
-            f.write("Relatório de Rotas Otimizadas\n\n")
-            for idx, route in enumerate(sol.routes):
-                f.write(f"Rota {idx+1}:\n")
-                f.write(f"  Veículo: {route.vehicle.id}\n")
-                f.write(f"  Clientes: {[c.id for c in route.clients]}\n")
-                f.write(f"  Demanda total: {route.total_demand()}\n")
-                f.write(f"  Distância: {route.distance():.2f}\n")
-                f.write(f"  Tempo estimado: {evaluate_route_time(route):.2f}\n")
-                f.write(f"  Penalidades: cap={capacity_violation(route):.2f}, tw={time_window_violation(route):.2f}, refrig={refrigeration_violation(route):.2f}, mrt={max_route_time_violation(route):.2f}\n\n")
-            f.write("\nResumo:\n")
-            total_dist = sum(r.distance() for r in sol.routes)
-            tot_cap_v = sum(capacity_violation(r) for r in sol.routes)
-            tot_tw_v = sum(time_window_violation(r) for r in sol.routes)
-            tot_refr_v = sum(refrigeration_violation(r) for r in sol.routes)
-            tot_mrt_v = sum(max_route_time_violation(r) for r in sol.routes)
-            f.write(f"Distância total: {total_dist:.2f}\n")
-            f.write(f"Violação total: cap={tot_cap_v:.2f}, tw={tot_tw_v:.2f}, refrig={tot_refr_v:.2f}, mrt={tot_mrt_v:.2f}\n")
-
-    exportar_rotas_txt(sol)
+    export_solution(sol, "rotas_otimizadas.txt")
+    for path in args.report:
+        export_solution(sol, path)
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from vrp_io import CLIENT_COLUMNS, VEHICLE_COLUMNS, none_if_nan, open_client_columns, write_vehicle_columns, write_binary_meta
+
+
+LAYOUTS = ("random", "clustered", "mixed")
+
+
+@dataclass
+class GeneratorConfig:
+    """Parameters of a synthetic instance.
+
+    layout: "random" (uniform), "clustered" (Gaussian blobs around `clusters`
+    centres) or "mixed" (each client clustered with probability `mixed_ratio`).
+    Time windows: a `tw_share` fraction of clients gets a window whose width is
+    about `tw_width` x horizon (smaller = tighter), opening no earlier than
+    the direct travel time from the depot. Fleet: vehicle capacities drawn from
+    `fleet_mix` ({capacity: share}), enough vehicles for the total demand times
+    `fleet_slack`, refrigerated vehicles added until they can carry the
+    refrigerated demand times the same slack.
+    """
+
+    n_clients: int = 1000
+    seed: int = 0
+    layout: str = "mixed"
+    width: float = 1000.0
+    height: float = 1000.0
+    clusters: int = 20
+    cluster_spread: float = 0.03  # cluster std. dev. as a fraction of the region
+    mixed_ratio: float = 0.5
+    max_demand: int = 4
+    service_time: Tuple[float, float] = (0.5, 2.0)
+    tw_share: float = 0.25
+    tw_width: float = 0.2
+    refrigerated_share: float = 0.15
+    fleet_mix: Dict[float, float] = field(default_factory=lambda: {16.0: 0.5, 24.0: 0.3, 40.0: 0.2})
+    fleet_slack: float = 1.1
+    max_route_time: Optional[float] = None
+
+    @property
+    def depot(self) -> Tuple[float, float]:
+        return (self.width / 2.0, self.height / 2.0)
+
+    @property
+    def horizon(self) -> float:
+        return 2.0 * (self.width + self.height)
+
+
+def iter_client_chunks(cfg: GeneratorConfig, chunk_size: int = 65536) -> Iterator[Dict[str, np.ndarray]]:
+    """Client columns (vrp_io.CLIENT_COLUMNS) in chunks of at most chunk_size
+    rows. Only one chunk is alive at a time; the output depends on chunk_size
+    only through the order the random stream is consumed."""
+    if cfg.layout not in LAYOUTS:
+        raise ValueError(f"layout deve ser um de {LAYOUTS}, não {cfg.layout!r}")
+    rng = np.random.default_rng(cfg.seed)
+    size = np.array([cfg.width, cfg.height])
+    centres = rng.uniform(0.05, 0.95, size=(max(1, cfg.clusters), 2)) * size
+    depot = np.array(cfg.depot)
+    horizon = cfg.horizon
+
+    for start in range(0, cfg.n_clients, chunk_size):
+        m = min(chunk_size, cfg.n_clients - start)
+        xy = rng.uniform(0.0, 1.0, size=(m, 2)) * size
+        if cfg.layout != "random":
+            clustered = np.ones(m, dtype=bool) if cfg.layout == "clustered" else rng.random(m) < cfg.mixed_ratio
+            k = int(clustered.sum())
+            blobs = centres[rng.integers(0, len(centres), size=k)] + rng.normal(0.0, cfg.cluster_spread, size=(k, 2)) * size
+            xy[clustered] = np.clip(blobs, 0.0, size)
+
+        tw_start = np.full(m, np.nan)
+        tw_end = np.full(m, np.nan)
+        has_tw = rng.random(m) < cfg.tw_share
+        k = int(has_tw.sum())
+        if k:
+            d0 = np.hypot(*(xy[has_tw] - depot).T)
+            width = cfg.tw_width * horizon * rng.uniform(0.5, 1.5, size=k)
+            latest = np.maximum(d0, horizon - width)
+            tw_start[has_tw] = d0 + rng.random(k) * (latest - d0)
+            tw_end[has_tw] = tw_start[has_tw] + width
+
+        yield {
+            "id": np.arange(start + 1, start + m + 1, dtype=np.int64),
+            "x": xy[:, 0],
+            "y": xy[:, 1],
+            "demand": rng.integers(1, cfg.max_demand + 1, size=m).astype(np.float64),
+            "service_time": rng.uniform(*cfg.service_time, size=m),
+            "tw_start": tw_start,
+            "tw_end": tw_end,
+            "requires_refrigeration": rng.random(m) < cfg.refrigerated_share,
+        }
+
+
+def build_fleet(cfg: GeneratorConfig, total_demand: float, refrigerated_demand: float) -> Dict[str, np.ndarray]:
+    """Vehicle columns (vrp_io.VEHICLE_COLUMNS) sized for the generated demand."""
+    rng = np.random.default_rng(cfg.seed + 1)
+    caps = np.array(sorted(cfg.fleet_mix), dtype=np.float64)
+    shares = np.array([cfg.fleet_mix[c] for c in sorted(cfg.fleet_mix)], dtype=np.float64)
+    shares /= shares.sum()
+    n = max(1, math.ceil(total_demand * cfg.fleet_slack / float(caps @ shares)))
+    capacity = rng.choice(caps, size=n, p=shares)
+    refrigerated = np.zeros(n, dtype=bool)
+    need = refrigerated_demand * cfg.fleet_slack
+    # refrigerate vehicles in random order until their capacity covers the need
+    if need > 0:
+        perm = rng.permutation(n)
+        k = np.searchsorted(np.cumsum(capacity[perm]), need) + 1
+        refrigerated[perm[:k]] = True
+    dx, dy = cfg.depot
+    return {
+        "id": np.arange(1, n + 1, dtype=np.int64),
+        "capacity": capacity,
+        "max_route_time": np.full(n, np.nan if cfg.max_route_time is None else cfg.max_route_time),
+        "has_refrigeration": refrigerated,
+        "start_x": np.full(n, dx),
+        "start_y": np.full(n, dy),
+        "end_x": np.full(n, dx),
+        "end_y": np.full(n, dy),
+    }
+
+
+def write_binary(path: str, cfg: GeneratorConfig, chunk_size: int = 65536) -> None:
+    """Stream the instance into the vrp_io binary layout (memory-mapped .npy columns)."""
+    cols = open_client_columns(path, cfg.n_clients)
+    total = refrigerated = 0.0
+    pos = 0
+    for chunk in iter_client_chunks(cfg, chunk_size):
+        m = len(chunk["id"])
+        for name in CLIENT_COLUMNS:
+            cols[name][pos:pos + m] = chunk[name]
+        total += float(chunk["demand"].sum())
+        refrigerated += float(chunk["demand"][chunk["requires_refrigeration"]].sum())
+        pos += m
+    for arr in cols.values():
+        arr.flush()
+    del cols
+    fleet = build_fleet(cfg, total, refrigerated)
+    write_vehicle_columns(path, fleet)
+    write_binary_meta(path, cfg.n_clients, len(fleet["id"]))
+
+
+def write_json(path: str, cfg: GeneratorConfig, chunk_size: int = 65536) -> None:
+    """Stream the instance as JSON (vrp_io.load_vrp_from_json schema), one client per line."""
+    total = refrigerated = 0.0
+    first = True
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n  "clients": [\n')
+        for chunk in iter_client_chunks(cfg, chunk_size):
+            rows = zip(*(chunk[name].tolist() for name in CLIENT_COLUMNS))
+            for cid, x, y, demand, service, tws, twe, refr in rows:
+                rec = {"id": cid, "x": round(x, 3), "y": round(y, 3), "demand": demand, "service_time": round(service, 3)}
+                if not math.isnan(tws):
+                    rec["tw_start"] = round(tws, 3)
+                    rec["tw_end"] = round(twe, 3)
+                if refr:
+                    rec["requires_refrigeration"] = True
+                f.write(("    " if first else ",\n    ") + json.dumps(rec))
+                first = False
+            total += float(chunk["demand"].sum())
+            refrigerated += float(chunk["demand"][chunk["requires_refrigeration"]].sum())
+        fleet = build_fleet(cfg, total, refrigerated)
+        vs = {name: fleet[name].tolist() for name in VEHICLE_COLUMNS}
+        vehicles = [
+            {
+                "id": vs["id"][i],
+                "capacity": vs["capacity"][i],
+                "has_refrigeration": vs["has_refrigeration"][i],
+                "max_route_time": none_if_nan(vs["max_route_time"][i]),
+                "start_depot": [vs["start_x"][i], vs["start_y"][i]],
+                "end_depot": [vs["end_x"][i], vs["end_y"][i]],
+            }
+            for i in range(len(vs["id"]))
+        ]
+        f.write('\n  ],\n  "vehicles": [\n    ')
+        f.write(",\n    ".join(json.dumps(v) for v in vehicles))
+        f.write("\n  ]\n}\n")
+
+
+def _parse_fleet_mix(text: str) -> Dict[float, float]:
+    """"16:0.5,24:0.3,40:0.2" -> {16.0: 0.5, 24.0: 0.3, 40.0: 0.2}"""
+    out: Dict[float, float] = {}
+    for part in text.split(","):
+        cap, _, share = part.partition(":")
+        out[float(cap)] = float(share or 1.0)
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gerador de instâncias VRP sintéticas (1k a 1M clientes)")
+    parser.add_argument("out", help="Arquivo .json ou diretório binário (ex.: inst_100k.vrpb)")
+    parser.add_argument("--n", type=int, default=1000, help="Número de clientes")
+    parser.add_argument("--seed", type=int, default=0, help="Seed aleatória")
+    parser.add_argument("--layout", choices=LAYOUTS, default="mixed", help="Distribuição espacial dos clientes")
+    parser.add_argument("--clusters", type=int, default=20, help="Número de aglomerados (clustered/mixed)")
+    parser.add_argument("--mixed-ratio", type=float, default=0.5, help="Fração de clientes em aglomerados (mixed)")
+    parser.add_argument("--size", type=float, nargs=2, default=(1000.0, 1000.0), metavar=("W", "H"), help="Dimensões da região")
+    parser.add_argument("--tw-share", type=float, default=0.25, help="Fração de clientes com janela de tempo")
+    parser.add_argument("--tw-width", type=float, default=0.2, help="Largura média da janela como fração do horizonte (menor = mais apertada)")
+    parser.add_argument("--refrig-share", type=float, default=0.15, help="Fração de clientes que exigem refrigeração")
+    parser.add_argument("--fleet-mix", type=str, default="16:0.5,24:0.3,40:0.2", help="Capacidades e proporções da frota (cap:fração,...)")
+    parser.add_argument("--fleet-slack", type=float, default=1.1, help="Folga de capacidade da frota sobre a demanda total")
+    parser.add_argument("--max-route-time", type=float, default=None, help="Tempo máximo de rota dos veículos")
+    parser.add_argument("--chunk", type=int, default=65536, help="Clientes gerados/gravados por bloco")
+    parser.add_argument("--format", choices=("auto", "json", "binary"), default="auto", help="Formato de saída (auto: .json = JSON, senão binário)")
+    args = parser.parse_args()
+
+    cfg = GeneratorConfig(
+        n_clients=args.n,
+        seed=args.seed,
+        layout=args.layout,
+        width=args.size[0],
+        height=args.size[1],
+        clusters=args.clusters,
+        mixed_ratio=args.mixed_ratio,
+        tw_share=args.tw_share,
+        tw_width=args.tw_width,
+        refrigerated_share=args.refrig_share,
+        fleet_mix=_parse_fleet_mix(args.fleet_mix),
+        fleet_slack=args.fleet_slack,
+        max_route_time=args.max_route_time,
+    )
+    fmt = args.format
+    if fmt == "auto":
+        fmt = "json" if os.path.splitext(args.out)[1].lower() == ".json" else "binary"
+    if fmt == "json":
+        write_json(args.out, cfg, args.chunk)
+    else:
+        write_binary(args.out, cfg, args.chunk)
+    print(f"Instância gerada: {args.out} ({cfg.n_clients} clientes, layout {cfg.layout})")
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import heapq
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from vrp_models import Client, Vehicle, Route, Solution
+from vrp_fitness import PenaltyWeights
+from vrp_eval import TourEvaluator
+from vrp_local_search import RouteData, RouteSearch
+from vrp_neighbors import GridIndex
+from vrp_table import ClientTable
+
+
+def _fits(search: RouteSearch, rd: RouteData, u: int) -> bool:
+    ev = search.ev
+    if ev.refrigerated[u] and not ev.v_refrigerated[rd.v]:
+        return False
+    return rd.load[-1] + ev.demand[u] <= ev.capacity[rd.v]
+
+
+def _detour(search: RouteSearch, rd: RouteData, u: int, i: int) -> float:
+    """Extra distance of inserting u before the i-th client of rd."""
+    ev = search.ev
+    prev = rd.clients[i - 1] if i else ev.start_point(rd.v)
+    nxt = rd.clients[i] if i < len(rd.clients) else ev.end_point(rd.v)
+    return ev.leg(prev, u) + ev.leg(u, nxt) - ev.leg(prev, nxt)
+
+
+def insert_clients(
+    solution: Solution,
+    new_clients: Sequence[Client],
+    vehicles: Optional[Sequence[Vehicle]] = None,
+    weights: Optional[PenaltyWeights] = None,
+    time_budget: float = 0.2,
+    improve: bool = True,
+    shortlist: int = 8,
+    k: int = 10,
+) -> Solution:
+    """Insert new orders into a live solution (modified in place).
+
+    Each client goes to its cheapest position: the positions next to its k
+    nearest already routed clients (and in empty routes) are ranked by
+    detour, and the best `shortlist` are then scored exactly with the
+    penalized route cost from the per-route data of
+    vrp_local_search.RouteSearch (neighbouring legs, prefix sums and the
+    forward time-window slack; no trial route is built). Routes with room and
+    the right refrigeration are preferred; if none exists, all routes are
+    considered (and the violation is penalized). If no neighbour is in an
+    allowed route, every position of the allowed routes is ranked. Unused
+    vehicles from `vehicles` may open new routes. Tightly-windowed, then
+    heavier, clients are inserted first.
+
+    `time_budget` (seconds) covers the whole call. Every client is always
+    inserted: once the budget is spent, the remaining ones go to their
+    smallest-detour position without exact scoring. With `improve`, the time
+    left is spent on a local search restricted to the k nearest neighbours
+    of the new clients.
+    """
+    if weights is None:
+        weights = PenaltyWeights()
+    deadline = time.perf_counter() + time_budget
+
+    existing = {id(r) for r in solution.routes}
+    in_use = {r.vehicle for r in solution.routes}
+    for v in vehicles or ():
+        if v not in in_use:
+            solution.routes.append(Route(vehicle=v))
+    if not solution.routes:
+        raise ValueError("a solução não tem rotas nem veículos disponíveis para inserção")
+
+    everyone = solution.all_clients() + list(new_clients)
+    evaluator = TourEvaluator(ClientTable.from_clients(everyone), [r.vehicle for r in solution.routes])
+    start = 0
+    routes = []
+    for v, r in enumerate(solution.routes):
+        routes.append((v, list(range(start, start + len(r.clients)))))
+        start += len(r.clients)
+    search = RouteSearch(evaluator, weights, routes)
+    states = search.routes
+    index = GridIndex([x.pos for x in everyone])
+    where: Dict[int, Tuple[int, int]] = {}  # routed client -> (route, position)
+
+    def locate(si: int) -> None:
+        for i, c in enumerate(states[si].clients):
+            where[c] = (si, i)
+
+    for si in range(len(states)):
+        locate(si)
+
+    def positions(u: int, allowed: Sequence[int]) -> Iterable[Tuple[int, int]]:
+        ok = set(allowed)
+        out = {(si, 0) for si in allowed if not states[si].clients}
+        for v in index.nearest(u, k, lambda _, j: j in where):
+            si, i = where[v]
+            if si in ok:
+                out.update(((si, i), (si, i + 1)))
+        if out:
+            return out
+        return [(si, i) for si in allowed for i in range(len(states[si].clients) + 1)]
+
+    order = sorted(
+        range(start, len(everyone)),
+        key=lambda u: (everyone[u].tw_end is None, (everyone[u].tw_end or 0.0) - (everyone[u].tw_start or 0.0), -everyone[u].demand),
+    )
+    for u in order:
+        allowed = [si for si, s in enumerate(states) if _fits(search, s, u)] or list(range(len(states)))
+        exact = time.perf_counter() < deadline
+        best: List[Tuple[float, int, int]] = []  # shortlist by detour: (-detour, state, pos)
+        size = shortlist if exact else 1
+        for si, i in positions(u, allowed):
+            d = _detour(search, states[si], u, i)
+            if len(best) < size:
+                heapq.heappush(best, (-d, si, i))
+            elif d < -best[0][0]:
+                heapq.heapreplace(best, (-d, si, i))
+        if exact and len(best) > 1:
+            single = search.route(states[best[0][1]].v, [u])
+
+            def delta(t: Tuple[int, int]) -> float:
+                s, i = states[t[0]], t[1]
+                return search.cost(s.v, [(s, 0, i, False), (single, 0, 1, False), (s, i, len(s.clients), False)]) - s.cost
+
+            si, pos = min(((si, i) for _, si, i in best), key=delta)
+        else:
+            _, si, pos = max(best)
+        s = states[si]
+        states[si] = search.route(s.v, s.clients[:pos] + [u] + s.clients[pos:])
+        locate(si)
+
+    if improve and new_clients and time.perf_counter() < deadline:
+        neighbors = [index.nearest(u, k) if u >= start else [] for u in range(len(everyone))]
+        search.improve(deadline, neighbors)
+
+    for r, s in zip(solution.routes, search.routes):
+        r.clients = [everyone[u] for u in s.clients]
+    # drop vehicles that were offered but not used
+    solution.routes = [r for r in solution.routes if r.clients or id(r) in existing]
+    return solution
@@ -1,13 +1,34 @@
 from __future__ import annotations
 
 import json
-from typing import List, Dict, Any
+import math
+import os
+import re
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
 from vrp_models import Client, Vehicle
 
 
+# Columnar binary layout: one raw .npy file per column under clients/ and
+# vehicles/, plus meta.json. Optional values (time windows, max route time)
+# are stored as NaN. Arrays are memory-mapped on load (no copy, no parsing).
+BINARY_FORMAT = "vrp-columnar"
+BINARY_VERSION = 1
+CLIENT_COLUMNS = ("id", "x", "y", "demand", "service_time", "tw_start", "tw_end", "requires_refrigeration")
+VEHICLE_COLUMNS = ("id", "capacity", "max_route_time", "has_refrigeration", "start_x", "start_y", "end_x", "end_y")
+_INT_COLUMNS = {"id"}
+_BOOL_COLUMNS = {"requires_refrigeration", "has_refrigeration"}
+
+
 def load_vrp_from_json(path: str) -> tuple[List[Client], List[Vehicle]]:
     with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+        return parse_vrp_json(json.load(f))
+
+
+def parse_vrp_json(data: Dict[str, Any]) -> tuple[List[Client], List[Vehicle]]:
+    """Clients and vehicles from an already-decoded JSON instance (e.g. an HTTP body)."""
     clients: List[Client] = []
     for c in data.get("clients", []):
         clients.append(
@@ -68,3 +89,304 @@ def save_vrp_to_json(path: str, clients: List[Client], vehicles: List[Vehicle])
     }
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _column_dtype(name: str):
+    if name in _INT_COLUMNS:
+        return np.int64
+    if name in _BOOL_COLUMNS:
+        return np.bool_
+    return np.float64
+
+
+def nan_if_none(v: Any) -> float:
+    return math.nan if v is None else float(v)
+
+
+def _json_to_columns(data: Dict[str, Any]) -> tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    cs = data.get("clients", [])
+    vs = data.get("vehicles", [])
+    clients = {
+        "id": np.fromiter((int(c["id"]) for c in cs), np.int64, len(cs)),
+        "x": np.fromiter((float(c["x"]) for c in cs), np.float64, len(cs)),
+        "y": np.fromiter((float(c["y"]) for c in cs), np.float64, len(cs)),
+        "demand": np.fromiter((float(c.get("demand", 0.0)) for c in cs), np.float64, len(cs)),
+        "service_time": np.fromiter((float(c.get("service_time", 0.0)) for c in cs), np.float64, len(cs)),
+        "tw_start": np.fromiter((nan_if_none(c.get("tw_start")) for c in cs), np.float64, len(cs)),
+        "tw_end": np.fromiter((nan_if_none(c.get("tw_end")) for c in cs), np.float64, len(cs)),
+        "requires_refrigeration": np.fromiter((bool(c.get("requires_refrigeration", False)) for c in cs), np.bool_, len(cs)),
+    }
+    starts = [v.get("start_depot", [0.0, 0.0]) for v in vs]
+    ends = [v.get("end_depot", st) for v, st in zip(vs, starts)]
+    vehicles = {
+        "id": np.array([int(v["id"]) for v in vs], dtype=np.int64),
+        "capacity": np.array([float(v.get("capacity", 0.0)) for v in vs], dtype=np.float64),
+        "max_route_time": np.array([nan_if_none(v.get("max_route_time")) for v in vs], dtype=np.float64),
+        "has_refrigeration": np.array([bool(v.get("has_refrigeration", False)) for v in vs], dtype=np.bool_),
+        "start_x": np.array([float(st[0]) for st in starts], dtype=np.float64),
+        "start_y": np.array([float(st[1]) for st in starts], dtype=np.float64),
+        "end_x": np.array([float(e[0]) for e in ends], dtype=np.float64),
+        "end_y": np.array([float(e[1]) for e in ends], dtype=np.float64),
+    }
+    return clients, vehicles
+
+
+def write_binary_meta(path: str, n_clients: int, n_vehicles: int) -> None:
+    meta = {
+        "format": BINARY_FORMAT,
+        "version": BINARY_VERSION,
+        "n_clients": int(n_clients),
+        "n_vehicles": int(n_vehicles),
+    }
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+def write_binary_columns(path: str, clients: Dict[str, np.ndarray], vehicles: Dict[str, np.ndarray]) -> None:
+    """Write column dicts (see CLIENT_COLUMNS / VEHICLE_COLUMNS) as a binary instance directory."""
+    os.makedirs(os.path.join(path, "clients"), exist_ok=True)
+    for name in CLIENT_COLUMNS:
+        np.save(os.path.join(path, "clients", name + ".npy"), np.asarray(clients[name], dtype=_column_dtype(name)))
+    write_vehicle_columns(path, vehicles)
+    write_binary_meta(path, len(clients["id"]), len(vehicles["id"]))
+
+
+def open_client_columns(path: str, n_clients: int) -> Dict[str, np.memmap]:
+    """Preallocate the clients/*.npy files of a binary instance and return them
+    as writable memory maps, for writers that fill the columns chunk by chunk.
+    Vehicles and meta.json are written separately (write_vehicle_columns,
+    write_binary_meta)."""
+    os.makedirs(os.path.join(path, "clients"), exist_ok=True)
+    return {
+        name: np.lib.format.open_memmap(
+            os.path.join(path, "clients", name + ".npy"), mode="w+", dtype=_column_dtype(name), shape=(n_clients,)
+        )
+        for name in CLIENT_COLUMNS
+    }
+
+
+def write_vehicle_columns(path: str, vehicles: Dict[str, np.ndarray]) -> None:
+    os.makedirs(os.path.join(path, "vehicles"), exist_ok=True)
+    for name in VEHICLE_COLUMNS:
+        np.save(os.path.join(path, "vehicles", name + ".npy"), np.asarray(vehicles[name], dtype=_column_dtype(name)))
+
+
+def convert_json_to_binary(json_path: str, out_path: str) -> None:
+    """Convert a JSON instance (load_vrp_from_json schema) to the binary layout,
+    without building Client/Vehicle objects."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    write_binary_columns(out_path, *_json_to_columns(data))
+
+
+def save_vrp_to_binary(path: str, clients: List[Client], vehicles: List[Vehicle]) -> None:
+    client_cols = {
+        "id": [c.id for c in clients],
+        "x": [c.x for c in clients],
+        "y": [c.y for c in clients],
+        "demand": [c.demand for c in clients],
+        "service_time": [c.service_time for c in clients],
+        "tw_start": [nan_if_none(c.tw_start) for c in clients],
+        "tw_end": [nan_if_none(c.tw_end) for c in clients],
+        "requires_refrigeration": [c.requires_refrigeration for c in clients],
+    }
+    vehicle_cols = {
+        "id": [v.id for v in vehicles],
+        "capacity": [v.capacity for v in vehicles],
+        "max_route_time": [nan_if_none(v.max_route_time) for v in vehicles],
+        "has_refrigeration": [v.has_refrigeration for v in vehicles],
+        "start_x": [v.start_depot[0] for v in vehicles],
+        "start_y": [v.start_depot[1] for v in vehicles],
+        "end_x": [v.end_depot[0] for v in vehicles],
+        "end_y": [v.end_depot[1] for v in vehicles],
+    }
+    write_binary_columns(path, client_cols, vehicle_cols)
+
+
+def load_vrp_arrays(path: str, mmap_mode: Optional[str] = "r") -> tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """Memory-map the columns of a binary instance directory (zero copy)."""
+    with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("format") != BINARY_FORMAT or meta.get("version") != BINARY_VERSION:
+        raise ValueError(f"{path}: formato binário não suportado: {meta.get('format')} v{meta.get('version')}")
+    clients = {n: np.load(os.path.join(path, "clients", n + ".npy"), mmap_mode=mmap_mode) for n in CLIENT_COLUMNS}
+    vehicles = {n: np.load(os.path.join(path, "vehicles", n + ".npy"), mmap_mode=mmap_mode) for n in VEHICLE_COLUMNS}
+    return clients, vehicles
+
+
+def none_if_nan(v: float) -> Optional[float]:
+    return None if math.isnan(v) else v
+
+
+def load_vrp_from_binary(path: str) -> tuple[List[Client], List[Vehicle]]:
+    """Build Client/Vehicle objects from a binary instance (same result as the JSON loader)."""
+    cc, vc = load_vrp_arrays(path)
+    c = {n: cc[n].tolist() for n in CLIENT_COLUMNS}
+    clients = [
+        Client(
+            id=c["id"][i],
+            x=c["x"][i],
+            y=c["y"][i],
+            demand=c["demand"][i],
+            service_time=c["service_time"][i],
+            tw_start=none_if_nan(c["tw_start"][i]),
+            tw_end=none_if_nan(c["tw_end"][i]),
+            requires_refrigeration=c["requires_refrigeration"][i],
+        )
+        for i in range(len(c["id"]))
+    ]
+    return clients, vehicles_from_columns(vc)
+
+
+def vehicles_from_columns(columns: Dict[str, np.ndarray]) -> List[Vehicle]:
+    """Vehicle objects from the vehicle columns of a binary instance."""
+    v = {n: columns[n].tolist() for n in VEHICLE_COLUMNS}
+    return [
+        Vehicle(
+            id=v["id"][i],
+            capacity=v["capacity"][i],
+            max_route_time=none_if_nan(v["max_route_time"][i]),
+            has_refrigeration=v["has_refrigeration"][i],
+            start_depot=(v["start_x"][i], v["start_y"][i]),
+            end_depot=(v["end_x"][i], v["end_y"][i]),
+        )
+        for i in range(len(v["id"]))
+    ]
+
+
+def _cvrplib_sections(text: str) -> tuple[Dict[str, str], Dict[str, List[List[str]]]]:
+    """Split a TSPLIB/CVRPLIB file into `KEY : value` specs and data sections."""
+    specs: Dict[str, str] = {}
+    sections: Dict[str, List[List[str]]] = {}
+    current: Optional[str] = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line == "EOF":
+            continue
+        head = line.split()[0].rstrip(":")
+        if head.endswith("_SECTION"):
+            current = head
+            sections[current] = []
+        elif ":" in line and not line[0].isdigit() and line[0] != "-":
+            key, value = line.split(":", 1)
+            specs[key.strip().upper()] = value.strip()
+            current = None
+        elif current is not None:
+            sections[current].append(line.split())
+    return specs, sections
+
+
+def load_cvrplib(path: str, n_vehicles: Optional[int] = None) -> tuple[List[Client], List[Vehicle]]:
+    """Load a CVRPLIB (TSPLIB-style .vrp) instance.
+
+    Client ids follow the CVRPLIB solution convention: node i gets id i - 1,
+    so the depot (node 1) is 0 and ids match the .sol route listings. The
+    fleet is `n_vehicles` identical vehicles at the depot; if not given it is
+    read from VEHICLES, the "-kN" name suffix or "No of trucks" in COMMENT,
+    falling back to ceil(total demand / capacity). DISTANCE (max route
+    length) and SERVICE_TIME are honoured when present. Distances are the
+    solver's unrounded Euclidean ones, not TSPLIB's rounded EUC_2D.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        specs, sections = _cvrplib_sections(f.read())
+    if specs.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper() not in ("EUC_2D", "CEIL_2D", "ATT"):
+        raise ValueError(f"{path}: EDGE_WEIGHT_TYPE {specs['EDGE_WEIGHT_TYPE']} não suportado (apenas coordenadas)")
+    coords = {int(r[0]): (float(r[1]), float(r[2])) for r in sections["NODE_COORD_SECTION"]}
+    demands = {int(r[0]): float(r[1]) for r in sections.get("DEMAND_SECTION", [])}
+    depots = [int(r[0]) for r in sections.get("DEPOT_SECTION", []) if int(r[0]) > 0] or [min(coords)]
+    depot = coords[depots[0]]
+    capacity = float(specs["CAPACITY"])
+    service = float(specs.get("SERVICE_TIME", 0.0))
+    max_route = float(specs["DISTANCE"]) if "DISTANCE" in specs else None
+
+    clients = [
+        Client(id=node - 1, x=xy[0], y=xy[1], demand=demands.get(node, 0.0), service_time=service)
+        for node, xy in sorted(coords.items())
+        if node not in depots
+    ]
+    if n_vehicles is None:
+        m = (
+            re.search(r"\d+", specs.get("VEHICLES", ""))
+            or re.search(r"-k(\d+)", specs.get("NAME", ""))
+            or re.search(r"trucks:\s*(\d+)", specs.get("COMMENT", ""))
+        )
+        if m:
+            n_vehicles = int(m.group(m.lastindex or 0))
+        else:
+            n_vehicles = max(1, math.ceil(sum(c.demand for c in clients) / capacity))
+    vehicles = [
+        Vehicle(id=k + 1, capacity=capacity, max_route_time=max_route, start_depot=depot, end_depot=depot)
+        for k in range(n_vehicles)
+    ]
+    return clients, vehicles
+
+
+def load_cvrplib_solution(path: str) -> tuple[List[List[int]], Optional[float]]:
+    """Routes (client ids, depot excluded) and the reported cost of a
+    CVRPLIB .sol file ("Route #1: 3 5 2" lines, then "Cost 123")."""
+    routes: List[List[int]] = []
+    cost: Optional[float] = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.lower().startswith("route"):
+                routes.append([int(t) for t in line.split(":", 1)[1].split()])
+            elif line.lower().startswith("cost"):
+                cost = float(line.split()[1])
+    return routes, cost
+
+
+def load_solomon(path: str) -> tuple[List[Client], List[Vehicle]]:
+    """Load a Solomon VRPTW instance (C101.txt style).
+
+    Customer 0 is the depot; its due date becomes every vehicle's
+    max_route_time. Ready time/due date map to tw_start/tw_end and the
+    vehicle count and capacity come from the VEHICLE block. Note that the
+    solver's route time does not include waiting, so the horizon is checked
+    on travel + service only.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [ln.split() for ln in f]
+    n_vehicles = capacity = None
+    rows: List[List[float]] = []
+    for k, toks in enumerate(lines):
+        if toks and toks[0].upper() == "NUMBER" and n_vehicles is None:
+            n_vehicles, capacity = int(lines[k + 1][0]), float(lines[k + 1][1])
+        elif len(toks) == 7 and all(t.replace(".", "", 1).isdigit() for t in toks):
+            rows.append([float(t) for t in toks])
+    if n_vehicles is None or not rows:
+        raise ValueError(f"{path}: arquivo Solomon inválido")
+    _, dx, dy, _, _, horizon, _ = rows[0]
+    clients = [
+        Client(id=int(r[0]), x=r[1], y=r[2], demand=r[3], service_time=r[6], tw_start=r[4], tw_end=r[5])
+        for r in rows[1:]
+    ]
+    vehicles = [
+        Vehicle(id=k + 1, capacity=capacity, max_route_time=horizon, start_depot=(dx, dy), end_depot=(dx, dy))
+        for k in range(n_vehicles)
+    ]
+    return clients, vehicles
+
+
+def load_vrp(path: str) -> tuple[List[Client], List[Vehicle]]:
+    """Load an instance from a JSON file, a binary instance directory, a
+    CVRPLIB .vrp file or a Solomon .txt file."""
+    if os.path.isdir(path):
+        return load_vrp_from_binary(path)
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".vrp":
+        return load_cvrplib(path)
+    if ext == ".txt":
+        return load_solomon(path)
+    return load_vrp_from_json(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Conversão de instâncias VRP JSON -> binário colunar")
+    parser.add_argument("json_path", help="Instância JSON de entrada")
+    parser.add_argument("out_path", help="Diretório de saída (ex.: instancia.vrpb)")
+    args = parser.parse_args()
+    convert_json_to_binary(args.json_path, args.out_path)
+    print(f"Instância convertida: {args.out_path}")
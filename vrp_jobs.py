@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import inspect
+import itertools
+import multiprocessing as mp
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from vrp_models import Route, Solution
+from vrp_io import parse_vrp_json
+from vrp_result_cache import CachedResult, ResultCache, instance_digest, normalized_params, result_key
+
+
+# iter_ga parameters a job may set; the rest belong to the service.
+_SERVICE_PARAMS = {"clients", "vehicles", "verbose", "workers", "profiler", "stop"}
+
+QUEUED, RUNNING, DONE, CANCELLED, FAILED = "queued", "running", "done", "cancelled", "failed"
+FINISHED = (DONE, CANCELLED, FAILED)
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+def job_params() -> List[str]:
+    from vrp_ga import iter_ga
+
+    return [p for p in inspect.signature(iter_ga).parameters if p not in _SERVICE_PARAMS]
+
+
+def routes_payload(solution: Solution) -> List[Dict[str, Any]]:
+    return [{"vehicle": r.vehicle.id, "clients": [c.id for c in r.clients]} for r in solution.routes]
+
+
+def payload_solution(routes: List[Dict[str, Any]], instance: Dict[str, Any]) -> Solution:
+    """Inverse of routes_payload over the job's instance."""
+    clients, vehicles = parse_vrp_json(instance)
+    by_id = {c.id: c for c in clients}
+    vehicle_by_id = {v.id: v for v in vehicles}
+    return Solution(routes=[
+        Route(vehicle=vehicle_by_id[r["vehicle"]], clients=[by_id[cid] for cid in r["clients"]]) for r in routes
+    ])
+
+
+@dataclass
+class Job:
+    id: int
+    params: Dict[str, Any]
+    status: str = QUEUED
+    submitted: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    worker: Optional[int] = None
+    best: Optional[Dict[str, Any]] = None  # generation, elapsed, fitness, routes
+    improvements: int = 0
+    cached: bool = False
+    error: Optional[str] = None
+
+    def to_dict(self, routes: bool = True) -> Dict[str, Any]:
+        best = self.best
+        if best is not None and not routes:
+            best = {k: v for k, v in best.items() if k != "routes"}
+        return {
+            "id": self.id,
+            "status": self.status,
+            "params": self.params,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+            "worker": self.worker,
+            "improvements": self.improvements,
+            "cached": self.cached,
+            "best": best,
+            "error": self.error,
+        }
+
+
+def _worker_main(idx: int, jobs: mp.Queue, events: mp.Queue, cancel, cache_dir: Optional[str], cache_bytes: int) -> None:
+    """Long-lived solver process: imports and numpy stay warm between jobs.
+    Reports every improvement back to the manager, stops at the next generation
+    once cancel[idx] holds the running job's id, and stores finished results in
+    the shared on-disk result cache."""
+    from vrp_ga import iter_ga
+
+    cache = ResultCache(cache_dir, cache_bytes) if cache_dir else None
+    while True:
+        item = jobs.get()
+        if item is None:
+            return
+        job_id, instance, params = item
+        events.put(("started", job_id, idx))
+        try:
+            clients, vehicles = parse_vrp_json(instance)
+            t0 = time.perf_counter()
+            last = None
+            for last in iter_ga(clients=clients, vehicles=vehicles, verbose=False, workers=1, stop=lambda: cancel[idx] == job_id, **params):
+                best = {"generation": last.generation, "elapsed": last.elapsed, "fitness": last.fitness, "routes": routes_payload(last.solution)}
+                events.put(("improvement", job_id, best))
+            if cancel[idx] == job_id:
+                events.put((CANCELLED, job_id, None))
+                continue
+            if cache is not None and last is not None:
+                cache.put(
+                    result_key(instance_digest(clients, vehicles), normalized_params(**params)),
+                    last.fitness, [clients[i].id for i in last.tour], last.solution,
+                    {"params": normalized_params(**params), "generation": last.generation, "runtime": time.perf_counter() - t0},
+                )
+            events.put((DONE, job_id, None))
+        except Exception as e:  # report and keep the worker alive
+            events.put((FAILED, job_id, f"{type(e).__name__}: {e}"))
+
+
+class JobManager:
+    """Queue of VRP jobs served by a fixed pool of warm solver processes.
+
+    The pool size is the concurrency limit; at most max_queued jobs wait.
+    A collector thread applies the workers' events (started, improvement,
+    done, cancelled, failed) to the Job records, which the HTTP layer reads.
+    Only the last keep_finished finished jobs are kept. With cache_dir, jobs
+    already in the result cache (vrp_result_cache) are answered at submit time
+    without touching the queue.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queued: int = 100,
+        keep_finished: int = 200,
+        cache_dir: Optional[str] = None,
+        cache_mb: float = 256.0,
+    ) -> None:
+        self.workers = workers
+        self.max_queued = max_queued
+        self.keep_finished = keep_finished
+        self.cache_dir = cache_dir
+        self.cache_bytes = int(cache_mb * 1024 * 1024)
+        self.allowed_params = set(job_params())
+        self._cache = ResultCache(cache_dir, self.cache_bytes) if cache_dir else None
+        self._ctx = mp.get_context()
+        self._jobs_q = self._ctx.Queue()
+        self._events = self._ctx.Queue()
+        self._cancel = self._ctx.Array("q", [0] * workers, lock=False)
+        self._procs: List[mp.Process] = []
+        self._collector: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._jobs: Dict[int, Job] = {}
+        self._ids = itertools.count(1)
+
+    def start(self) -> "JobManager":
+        for idx in range(self.workers):
+            p = self._ctx.Process(
+                target=_worker_main,
+                args=(idx, self._jobs_q, self._events, self._cancel, self.cache_dir, self.cache_bytes),
+                daemon=True,
+            )
+            p.start()
+            self._procs.append(p)
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+        return self
+
+    def submit(self, instance: Dict[str, Any], params: Optional[Dict[str, Any]] = None) -> Job:
+        params = dict(params or {})
+        unknown = set(params) - self.allowed_params
+        if unknown:
+            raise ValueError(f"parâmetros desconhecidos: {sorted(unknown)}")
+        if not instance.get("clients") or not instance.get("vehicles"):
+            raise ValueError("a instância precisa de 'clients' e 'vehicles'")
+        hit = self._cached(instance, params)
+        with self._lock:
+            if hit is None and sum(j.status == QUEUED for j in self._jobs.values()) >= self.max_queued:
+                raise QueueFullError(f"fila cheia ({self.max_queued} jobs aguardando)")
+            job = Job(id=next(self._ids), params=params)
+            self._jobs[job.id] = job
+            if hit is not None:
+                job.best = {"generation": hit.meta.get("generation"), "elapsed": 0.0, "fitness": hit.fitness, "routes": routes_payload(hit.solution)}
+                job.cached = True
+                self._finish(job, DONE)
+                return job
+        self._jobs_q.put((job.id, instance, params))
+        return job
+
+    def _cached(self, instance: Dict[str, Any], params: Dict[str, Any]) -> Optional[CachedResult]:
+        if self._cache is None:
+            return None
+        clients, vehicles = parse_vrp_json(instance)
+        return self._cache.get(result_key(instance_digest(clients, vehicles), normalized_params(**params)), clients, vehicles)
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: int) -> Optional[Job]:
+        """Queued jobs are dropped when a worker picks them up; running jobs stop
+        at their next generation and keep their best solution so far."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return job
+            if job.status == RUNNING:
+                self._cancel[job.worker] = job_id
+            else:
+                self._finish(job, CANCELLED)
+            return job
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished = time.time()
+        done = [j for j in self._jobs.values() if j.status in FINISHED]
+        for old in sorted(done, key=lambda j: j.finished)[:max(0, len(done) - self.keep_finished)]:
+            del self._jobs[old.id]
+
+    def _collect(self) -> None:
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            kind, job_id, data = event
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if kind == "started" and (job is None or job.status == CANCELLED):
+                    self._cancel[data] = job_id  # cancelled (and maybe pruned) while queued
+                    continue
+                if job is None:
+                    continue
+                if kind == "started":
+                    job.status, job.worker, job.started = RUNNING, data, time.time()
+                elif job.status in FINISHED:
+                    continue
+                elif kind == "improvement":
+                    job.best = data
+                    job.improvements += 1
+                elif kind == DONE:
+                    self._finish(job, DONE)
+                elif kind == CANCELLED:
+                    self._finish(job, CANCELLED)
+                elif kind == FAILED:
+                    job.error = data
+                    self._finish(job, FAILED)
+
+    def close(self) -> None:
+        with self._lock:
+            for job in list(self._jobs.values()):
+                if job.status == RUNNING:
+                    self._cancel[job.worker] = job.id
+                elif job.status == QUEUED:
+                    self._finish(job, CANCELLED)
+        for _ in self._procs:
+            self._jobs_q.put(None)
+        for p in self._procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        self._events.put(None)
+        if self._collector is not None:
+            self._collector.join(timeout=5)
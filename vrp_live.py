@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import queue
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from vrp_models import Client, Vehicle, Route, Solution
+from vrp_fitness import PenaltyWeights
+
+if TYPE_CHECKING:
+    from vrp_ga import Improvement
+
+RoutesPayload = List[Tuple[int, List[int]]]  # (vehicle id, client ids) per route
+CurvePoint = Tuple[int, float, float]  # generation, elapsed, fitness
+
+
+def encode_routes(solution: Solution) -> RoutesPayload:
+    return [(r.vehicle.id, [c.id for c in r.clients]) for r in solution.routes]
+
+
+def decode_routes(routes: RoutesPayload, clients_by_id: Dict[int, Client], vehicles_by_id: Dict[int, Vehicle]) -> Solution:
+    return Solution(routes=[
+        Route(vehicle=vehicles_by_id[vid], clients=[clients_by_id[cid] for cid in cids]) for vid, cids in routes
+    ])
+
+
+class LivePublisher:
+    """Solver side of the live view: starts the viewer process and sends it
+    each improvement. Use `publish` as run_ga's on_improvement.
+
+    publish never blocks. The queue holds at most `maxsize` updates; when the
+    viewer falls behind the update is dropped, and its convergence points go
+    out with the next one, so the curve stays complete while intermediate
+    solutions are skipped. Only ids travel through the queue; the viewer gets
+    the instance once, at start.
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[Client],
+        vehicles: Sequence[Vehicle],
+        weights: Optional[PenaltyWeights] = None,
+        maxsize: int = 2,
+    ) -> None:
+        ctx = mp.get_context()
+        self._queue = ctx.Queue(maxsize)
+        self._queue.cancel_join_thread()  # a closed viewer must not hang the solver at exit
+        self._proc = ctx.Process(target=_viewer_main, args=(list(clients), list(vehicles), weights, self._queue))
+        self._pending: List[CurvePoint] = []
+        self._latest: Optional["Improvement"] = None  # decoded only when sent
+        self.sent = 0
+        self.dropped = 0
+
+    def start(self) -> "LivePublisher":
+        self._proc.start()
+        return self
+
+    def publish(self, imp: "Improvement") -> None:
+        self._pending.append((imp.generation, imp.elapsed, imp.fitness))
+        self._latest = imp
+        if not self._proc.is_alive():  # window closed: keep solving
+            return
+        if self._queue.full():  # skip decoding an update that would be dropped
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait((self._pending, encode_routes(imp.solution), False))
+        except queue.Full:
+            self.dropped += 1
+            return
+        self.sent += 1
+        self._pending, self._latest = [], None
+
+    def close(self, solution: Optional[Solution] = None, wait: bool = True) -> None:
+        """Send the final solution (the GA is over, so this may block briefly)
+        and, with wait, return once the user closes the window."""
+        if self._proc.is_alive():
+            if solution is None and self._latest is not None:
+                solution = self._latest.solution
+            routes = encode_routes(solution) if solution is not None else None
+            try:
+                self._queue.put((self._pending, routes, True), timeout=5)
+            except queue.Full:
+                pass
+            self._pending, self._latest = [], None
+        if wait:
+            self._proc.join()
+
+
+class LiveFeed:
+    """Viewer side: `poll` drains everything queued and returns only the
+    newest solution (or None), accumulating the convergence curve."""
+
+    def __init__(self, updates: "mp.Queue", clients: Sequence[Client], vehicles: Sequence[Vehicle]) -> None:
+        self._queue = updates
+        self._clients = {c.id: c for c in clients}
+        self._vehicles = {v.id: v for v in vehicles}
+        self.curve: List[Tuple[int, float]] = []  # (generation, best fitness)
+        self.generation: Optional[int] = None
+        self.elapsed: Optional[float] = None
+        self.fitness: Optional[float] = None
+        self.done = False
+
+    def poll(self) -> Optional[Solution]:
+        routes = None
+        while True:
+            try:
+                points, newest, done = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self.curve.extend((g, f) for g, _, f in points)
+            if points:
+                self.generation, self.elapsed, self.fitness = points[-1]
+            if newest is not None:
+                routes = newest
+            self.done = self.done or done
+        return decode_routes(routes, self._clients, self._vehicles) if routes is not None else None
+
+    def status(self) -> str:
+        if self.generation is None:
+            return "concluído" if self.done else "aguardando a primeira solução..."
+        text = f"geração {self.generation} | {self.elapsed:.1f}s | fitness {self.fitness:.2f}"
+        return text + (" | concluído" if self.done else "")
+
+
+def _viewer_main(clients: List[Client], vehicles: List[Vehicle], weights: Optional[PenaltyWeights], updates: "mp.Queue") -> None:
+    from vrp_visualize import draw_solution  # pygame only in the viewer process
+
+    draw_solution(Solution(routes=[]), weights=weights, feed=LiveFeed(updates, clients, vehicles))
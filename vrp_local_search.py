@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from vrp_models import Client, Route, Solution
+from vrp_fitness import (
+    PenaltyWeights,
+    capacity_violation,
+    time_window_violation,
+    refrigeration_violation,
+    max_route_time_violation,
+)
+from vrp_eval import RoutedTour, TourEvaluator
+from vrp_table import ClientTable
+
+EPS = 1e-9
+INF = float("inf")
+
+
+def route_cost(route: Route, weights: PenaltyWeights) -> float:
+    """Penalized cost of one route; summing it over routes gives `fitness`."""
+    return (
+        route.distance()
+        + (weights.capacity * capacity_violation(route))
+        + (weights.time_window * time_window_violation(route))
+        + (weights.refrigeration * refrigeration_violation(route))
+        + (weights.max_route_time * max_route_time_violation(route))
+    )
+
+
+class RouteData:
+    """One route (vehicle index + client indices) with the prefix data that
+    prices a move from its endpoints.
+
+    Prefix sums over the first k clients (length L + 1): load, service,
+    refrigerated clients, clients with a time window, lateness. Over the legs
+    between the first k + 1 clients (length L): forward and reverse leg costs,
+    so a reversed slice is priced without walking it. Per client: arrival and
+    departure clocks (waiting model of time_window_violation) and forward
+    slack, the delay at arrival that adds no lateness from there to the end.
+    """
+
+    __slots__ = (
+        "v", "clients", "load", "service", "refrigerated", "windows", "late",
+        "fwd", "bwd", "arr", "dep", "slack", "cost",
+    )
+
+    def __init__(self, v: int, clients: List[int]) -> None:
+        self.v = v
+        self.clients = clients
+
+
+Segment = Tuple[RouteData, int, int, bool]  # clients[i:j] of a route, reversed or not
+
+
+class RouteSearch:
+    """Route-based local search on client indices (HGS-style "education").
+
+    Moves are described as concatenations of route segments and priced with
+    RouteData: distance, load, service, refrigeration and route time in O(1)
+    per segment. Lateness (no time warp here: a late arrival stays late
+    downstream) is not concatenable in O(1) in general; it is skipped when
+    the segments hold no window, reused when the new arrival clock equals the
+    cached one, or, for the final segment, when the delay fits in the forward
+    slack; otherwise the segment is walked until its clock meets the cached
+    schedule. Route data is rebuilt (O(L)) only for routes of accepted moves.
+    """
+
+    def __init__(self, evaluator: TourEvaluator, weights: PenaltyWeights, routes: Sequence[Tuple[int, List[int]]]) -> None:
+        self.ev = evaluator
+        self.weights = weights
+        self.routes: List[RouteData] = [self.route(v, list(clients)) for v, clients in routes]
+
+    # --- pricing -------------------------------------------------------------
+
+    def _price(self, v: int, dist: float, load: float, service: float, refrigerated: int, late: float) -> float:
+        ev, w = self.ev, self.weights
+        cost = dist + w.capacity * max(0.0, load - ev.capacity[v]) + w.time_window * late
+        if refrigerated and not ev.v_refrigerated[v]:
+            cost += w.refrigeration
+        max_time = ev.v_max_time[v]
+        if max_time is not None:
+            cost += w.max_route_time * max(0.0, dist + service - max_time)
+        return cost
+
+    def route(self, v: int, clients: List[int]) -> RouteData:
+        """RouteData for vehicle v serving clients, with its cost."""
+        ev = self.ev
+        leg, dem, svc, needs = ev.leg, ev.demand, ev.service, ev.refrigerated
+        tw_start, tw_end = ev.tw_start, ev.tw_end
+        rd = RouteData(v, clients)
+        load, service, refr, windows, late = [0.0], [0.0], [0], [0], [0.0]
+        fwd, bwd, arr, dep = [0.0], [0.0], [], []
+        t = leg(ev.start_point(v), clients[0]) if clients else 0.0
+        first_leg = t
+        for k, c in enumerate(clients):
+            load.append(load[-1] + dem[c])
+            service.append(service[-1] + svc[c])
+            refr.append(refr[-1] + needs[c])
+            te, ts = tw_end[c], tw_start[c]
+            windows.append(windows[-1] + (te is not None or ts is not None))
+            arr.append(t)
+            late.append(late[-1] + (t - te if te is not None and t > te else 0.0))
+            d = (ts if ts is not None and ts > t else t) + svc[c]
+            dep.append(d)
+            if k + 1 < len(clients):
+                nxt = clients[k + 1]
+                step = leg(c, nxt)
+                fwd.append(fwd[-1] + step)
+                bwd.append(bwd[-1] + leg(nxt, c))
+                t = d + step
+        slack = [0.0] * len(clients)
+        after = INF
+        for k in range(len(clients) - 1, -1, -1):
+            c, a = clients[k], arr[k]
+            te, ts = tw_end[c], tw_start[c]
+            own = INF if te is None else max(0.0, te - a)
+            wait = 0.0 if ts is None else max(0.0, ts - a)
+            after = min(own, wait + after)
+            slack[k] = after
+        rd.load, rd.service, rd.refrigerated, rd.windows, rd.late = load, service, refr, windows, late
+        rd.fwd, rd.bwd, rd.arr, rd.dep, rd.slack = fwd, bwd, arr, dep, slack
+        if clients:
+            dist = first_leg + fwd[-1] + leg(clients[-1], ev.end_point(v))
+            rd.cost = self._price(v, dist, load[-1], service[-1], refr[-1], late[-1])
+        else:
+            rd.cost = 0.0
+        return rd
+
+    def cost(self, v: int, segments: Sequence[Segment]) -> float:
+        """Penalized cost of vehicle v serving the concatenated segments."""
+        ev = self.ev
+        leg = ev.leg
+        segs = [s for s in segments if s[2] > s[1]]
+        if not segs:
+            return 0.0
+        dist = 0.0
+        load = service = 0.0
+        refr = windows = 0
+        prev = ev.start_point(v)
+        for rd, i, j, rev in segs:
+            first, last = (rd.clients[j - 1], rd.clients[i]) if rev else (rd.clients[i], rd.clients[j - 1])
+            dist += leg(prev, first) + ((rd.bwd[j - 1] - rd.bwd[i]) if rev else (rd.fwd[j - 1] - rd.fwd[i]))
+            load += rd.load[j] - rd.load[i]
+            service += rd.service[j] - rd.service[i]
+            refr += rd.refrigerated[j] - rd.refrigerated[i]
+            windows += rd.windows[j] - rd.windows[i]
+            prev = last
+        dist += leg(prev, ev.end_point(v))
+        late = self._lateness(v, segs, windows) if windows else 0.0
+        return self._price(v, dist, load, service, refr, late)
+
+    def _lateness(self, v: int, segs: Sequence[Segment], windows: int) -> float:
+        ev = self.ev
+        leg, svc, tw_start, tw_end = ev.leg, ev.service, ev.tw_start, ev.tw_end
+        late = 0.0
+        first = segs[0][0].clients[segs[0][2] - 1] if segs[0][3] else segs[0][0].clients[segs[0][1]]
+        t = leg(ev.start_point(v), first)  # arrival at the segment's first client
+        for n, (rd, i, j, rev) in enumerate(segs):
+            if not windows:
+                break  # no window ahead: nothing more can be late
+            inside = rd.windows[j] - rd.windows[i]
+            windows -= inside
+            cl = rd.clients
+            final = n == len(segs) - 1
+            tail = final and j == len(cl)  # slack runs to the end of rd
+            if not inside:  # no waiting, no lateness
+                d = t + (rd.service[j] - rd.service[i]) + ((rd.bwd[j - 1] - rd.bwd[i]) if rev else (rd.fwd[j - 1] - rd.fwd[i]))
+            elif not rev:
+                k = i
+                while True:
+                    a = rd.arr[k]
+                    if t == a or (tail and a <= t <= a + rd.slack[k]):
+                        late += rd.late[j] - rd.late[k]  # same schedule from here on
+                        d = rd.dep[j - 1]
+                        break
+                    c = cl[k]
+                    te, ts = tw_end[c], tw_start[c]
+                    if te is not None and t > te:
+                        late += t - te
+                    d = (ts if ts is not None and ts > t else t) + svc[c]
+                    k += 1
+                    if k == j:
+                        break
+                    t = d + leg(c, cl[k])
+            else:
+                for k in range(j - 1, i - 1, -1):
+                    c = cl[k]
+                    te, ts = tw_end[c], tw_start[c]
+                    if te is not None and t > te:
+                        late += t - te
+                    d = (ts if ts is not None and ts > t else t) + svc[c]
+                    if k > i:
+                        t = d + leg(c, cl[k - 1])
+            if not final:
+                nrd, ni, nj, nrev = segs[n + 1]
+                last = cl[i] if rev else cl[j - 1]
+                t = d + leg(last, nrd.clients[nj - 1] if nrev else nrd.clients[ni])
+        return late
+
+    # --- moves ---------------------------------------------------------------
+
+    @staticmethod
+    def _intra(a: RouteData, i: int, j: int) -> Iterator[List[Segment]]:
+        """Relocate i to position j of the route without it, swap and 2-opt (i < j)."""
+        n = len(a.clients)
+        if j < i:
+            yield [(a, 0, j, False), (a, i, i + 1, False), (a, j, i, False), (a, i + 1, n, False)]
+            return
+        yield [(a, 0, i, False), (a, i + 1, j + 1, False), (a, i, i + 1, False), (a, j + 1, n, False)]
+        yield [(a, 0, i, False), (a, j, j + 1, False), (a, i + 1, j, False), (a, i, i + 1, False), (a, j + 1, n, False)]
+        yield [(a, 0, i, False), (a, i, j + 1, True), (a, j + 1, n, False)]
+
+    @staticmethod
+    def _inter(a: RouteData, b: RouteData, i: int, j: int) -> Iterator[Tuple[List[Segment], List[Segment]]]:
+        """Relocate, swap and 2-opt* between position i of a and j of b
+        (j == len(b) is the slot after b's last client)."""
+        na, nb = len(a.clients), len(b.clients)
+        yield [(a, 0, i, False), (a, i + 1, na, False)], [(b, 0, j, False), (a, i, i + 1, False), (b, j, nb, False)]
+        if j < nb:
+            yield (
+                [(a, 0, i, False), (b, j, j + 1, False), (a, i + 1, na, False)],
+                [(b, 0, j, False), (a, i, i + 1, False), (b, j + 1, nb, False)],
+            )
+        yield [(a, 0, i, False), (b, j, nb, False)], [(b, 0, j, False), (a, i, na, False)]
+
+    @staticmethod
+    def _clients(segments: Sequence[Segment]) -> List[int]:
+        out: List[int] = []
+        for rd, i, j, rev in segments:
+            out.extend(rd.clients[j - 1:i - 1 if i else None:-1] if rev else rd.clients[i:j])
+        return out
+
+    def improve(self, deadline: Optional[float] = None, neighbors: Optional[Sequence[Sequence[int]]] = None) -> None:
+        """First-improvement intra/inter-route relocate, swap, 2-opt and
+        2-opt* until no move improves or the deadline (perf_counter) passes.
+        With candidate lists (client index -> neighbour indices), a client u
+        is only moved next to one of its neighbours or into an empty route."""
+        routes = self.routes
+        where: Dict[int, Tuple[int, int]] = {}
+
+        def locate(r: int) -> None:
+            for k, c in enumerate(routes[r].clients):
+                where[c] = (r, k)
+
+        if neighbors is not None:
+            for r in range(len(routes)):
+                locate(r)
+
+        def targets(u: int) -> Iterator[Tuple[int, int]]:
+            if neighbors is None:
+                for r2, rb in enumerate(routes):
+                    for j in range(len(rb.clients) + 1):
+                        yield r2, j
+                return
+            for v in neighbors[u]:
+                if v in where:
+                    r2, j = where[v]
+                    yield r2, j
+                    yield r2, j + 1
+            for r2, rb in enumerate(routes):
+                if not rb.clients:
+                    yield r2, 0
+
+        def accept(r: int, segments: Sequence[Segment]) -> RouteData:
+            return self.route(routes[r].v, self._clients(segments))
+
+        def try_client(r1: int, i: int) -> bool:
+            a = routes[r1]
+            for r2, j in targets(a.clients[i]):
+                if r2 == r1:
+                    if j >= len(a.clients) or j == i:
+                        continue
+                    for segs in self._intra(a, i, j):
+                        if self.cost(a.v, segs) < a.cost - EPS:
+                            routes[r1] = accept(r1, segs)
+                            if neighbors is not None:
+                                locate(r1)
+                            return True
+                    continue
+                b = routes[r2]
+                for segs_a, segs_b in self._inter(a, b, i, j):
+                    ca = self.cost(a.v, segs_a)
+                    if ca - a.cost >= b.cost - EPS:
+                        continue  # b would have to get cheaper than free
+                    if ca + self.cost(b.v, segs_b) < a.cost + b.cost - EPS:
+                        routes[r1], routes[r2] = accept(r1, segs_a), accept(r2, segs_b)
+                        if neighbors is not None:
+                            locate(r1)
+                            locate(r2)
+                        return True
+            return False
+
+        improved = True
+        while improved:
+            improved = False
+            for r1 in range(len(routes)):
+                i = 0
+                while i < len(routes[r1].clients):
+                    if deadline is not None and time.perf_counter() > deadline:
+                        return
+                    if try_client(r1, i):
+                        improved = True
+                    else:
+                        i += 1
+
+
+def _index_neighbors(
+    clients: Sequence[Client], index: Mapping[Client, int], neighbors: Mapping[Client, Sequence[Client]]
+) -> List[List[int]]:
+    return [[index[v] for v in neighbors.get(c, ()) if v in index] for c in clients]
+
+
+def educate(
+    solution: Solution,
+    weights: Optional[PenaltyWeights] = None,
+    time_budget: Optional[float] = None,
+    neighbors: Optional[Mapping[Client, Sequence[Client]]] = None,
+) -> Solution:
+    """Route-based local search (HGS-style "education"), see RouteSearch.
+
+    Applies first-improvement intra/inter-route relocate, swap, 2-opt and
+    2-opt* moves on the penalized route cost until no move improves or the
+    time budget (seconds) runs out. With candidate lists (`neighbors`, see
+    vrp_neighbors.candidate_map) a client u is only moved next to one of its
+    neighbours v (or into an empty route), instead of scanning every
+    position; clients missing from the mapping are only moved to empty
+    routes. The solution is modified in place.
+    """
+    if weights is None:
+        weights = PenaltyWeights()
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    clients = solution.all_clients()
+    index = {c: k for k, c in enumerate(clients)}
+    evaluator = TourEvaluator(ClientTable.from_clients(clients), [r.vehicle for r in solution.routes])
+    search = RouteSearch(evaluator, weights, [(v, [index[c] for c in r.clients]) for v, r in enumerate(solution.routes)])
+    search.improve(deadline, _index_neighbors(clients, index, neighbors) if neighbors is not None else None)
+    for r, rd in zip(solution.routes, search.routes):
+        r.clients = [clients[k] for k in rd.clients]
+    return solution
+
+
+def educate_tour(
+    tour: Sequence[int],
+    evaluator: TourEvaluator,
+    weights: Optional[PenaltyWeights] = None,
+    time_budget: Optional[float] = None,
+    neighbors: Optional[Sequence[Sequence[int]]] = None,
+) -> RoutedTour:
+    """Decode a giant tour (client indices), educate its routes and return
+    them as a RoutedTour, so the GA evaluates exactly the educated routes."""
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    evaluator.load(tour)
+    search = RouteSearch(evaluator, weights or PenaltyWeights(), [(v, evaluator.routes[v]) for v in evaluator.order])
+    search.improve(deadline, neighbors)
+    return RoutedTour(
+        [c for rd in search.routes for c in rd.clients],
+        [(rd.v, len(rd.clients)) for rd in search.routes],
+    )
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 import math
 
+if TYPE_CHECKING:
+    from vrp_roads import TravelCosts
+
 
 Point = Tuple[float, float]
 
@@ -12,6 +15,29 @@ def euclidean(a: Point, b: Point) -> float:
     return math.hypot(a[0] - b[0], a[1] - b[1])
 
 
+# Road-network costs in use (see vrp_roads); None = straight-line distance.
+_travel_costs: Optional["TravelCosts"] = None
+
+
+def set_travel_costs(costs: Optional["TravelCosts"]) -> None:
+    """Make travel_cost (route distance and time) use a road-network matrix,
+    or straight lines again with None. Process-wide; pool workers set it in
+    their initializer."""
+    global _travel_costs
+    _travel_costs = costs
+
+
+def get_travel_costs() -> Optional["TravelCosts"]:
+    return _travel_costs
+
+
+def travel_cost(a: Point, b: Point) -> float:
+    """Travel distance (= time) from a to b."""
+    if _travel_costs is None:
+        return math.hypot(a[0] - b[0], a[1] - b[1])
+    return _travel_costs(a, b)
+
+
 @dataclass(frozen=True)
 class Client:
     id: int
@@ -48,12 +74,12 @@ class Route:
             return 0.0
         d = 0.0
         # depot to first
-        d += euclidean(self.vehicle.start_depot, self.clients[0].pos)
+        d += travel_cost(self.vehicle.start_depot, self.clients[0].pos)
         # between clients
         for a, b in zip(self.clients[:-1], self.clients[1:]):
-            d += euclidean(a.pos, b.pos)
+            d += travel_cost(a.pos, b.pos)
         # last to depot end
-        d += euclidean(self.clients[-1].pos, self.vehicle.end_depot)
+        d += travel_cost(self.clients[-1].pos, self.vehicle.end_depot)
         return d
 
     def total_demand(self) -> float:
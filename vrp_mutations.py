@@ -1,22 +1,52 @@
 from __future__ import annotations
 
 import random
-from typing import List, TypeVar
+from typing import List, Mapping, Optional, Sequence, Tuple, TypeVar
 
 T = TypeVar("T")
 
+# Candidate lists: neighbors[gene] -> genes worth placing next to it
+# (see vrp_neighbors.build_candidate_lists). When given, mutations only
+# consider moves between a gene and one of its neighbours.
+Neighbors = Mapping[T, Sequence[T]]
 
-def swap_mutation(seq: List[T]) -> List[T]:
+
+def _neighbor_pair(seq: List[T], neighbors: Neighbors) -> Optional[Tuple[int, int]]:
+    i = random.randrange(len(seq))
+    nbrs = neighbors[seq[i]]
+    if not nbrs:
+        return None
+    j = seq.index(random.choice(nbrs))
+    return i, j
+
+
+def swap_mutation(seq: List[T], neighbors: Optional[Neighbors] = None) -> List[T]:
     if len(seq) < 2:
         return seq
-    a, b = random.sample(range(len(seq)), 2)
+    if neighbors is not None:
+        pair = _neighbor_pair(seq, neighbors)
+        if pair is None:
+            return seq
+        a, b = pair
+    else:
+        a, b = random.sample(range(len(seq)), 2)
     seq[a], seq[b] = seq[b], seq[a]
     return seq
 
 
-def relocate_mutation(seq: List[T]) -> List[T]:
+def relocate_mutation(seq: List[T], neighbors: Optional[Neighbors] = None) -> List[T]:
     if len(seq) < 2:
         return seq
+    if neighbors is not None:
+        # move a gene right after one of its neighbours
+        pair = _neighbor_pair(seq, neighbors)
+        if pair is None:
+            return seq
+        i, j = pair
+        elem = seq.pop(i)
+        # after the pop, the neighbour sits at j (j < i) or j - 1 (j > i)
+        seq.insert(j + 1 if j < i else j, elem)
+        return seq
     i = random.randrange(len(seq))
     elem = seq.pop(i)
     j = random.randrange(len(seq) + 1)
@@ -24,17 +54,28 @@ def relocate_mutation(seq: List[T]) -> List[T]:
     return seq
 
 
-def two_opt_mutation(seq: List[T]) -> List[T]:
+def two_opt_mutation(seq: List[T], neighbors: Optional[Neighbors] = None) -> List[T]:
     if len(seq) < 4:
         return seq
+    if neighbors is not None:
+        # reverse the segment that makes a gene adjacent to its neighbour
+        pair = _neighbor_pair(seq, neighbors)
+        if pair is None:
+            return seq
+        i, j = pair
+        if i < j:
+            seq[i + 1:j + 1] = reversed(seq[i + 1:j + 1])
+        else:
+            seq[j:i] = reversed(seq[j:i])
+        return seq
     i = random.randrange(len(seq) - 1)
     j = random.randrange(i + 1, len(seq))
     seq[i:j] = reversed(seq[i:j])
     return seq
 
 
-def mutate_vrp(seq: List[T], mutation_probability: float) -> List[T]:
+def mutate_vrp(seq: List[T], mutation_probability: float, neighbors: Optional[Neighbors] = None) -> List[T]:
     if random.random() >= mutation_probability:
         return seq
     op = random.choice([swap_mutation, relocate_mutation, two_opt_mutation])
-    return op(seq)
+    return op(seq, neighbors)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from vrp_models import Client, euclidean, travel_cost
+
+
+class GridIndex:
+    """Uniform grid over client coordinates for k-nearest-neighbour queries.
+
+    Cells are sized so that each holds about `per_cell` points; a query scans
+    rings of cells around the query point and stops once no unvisited cell can
+    contain a closer point.
+
+    Distances are straight-line, also when road-network costs are active
+    (vrp_models.set_travel_costs): the neighbours are then only an
+    approximation of the nearest points by travel cost, which can be far off
+    across one-way streets, rivers or other barriers.
+    """
+
+    def __init__(self, points: Sequence[Tuple[float, float]], per_cell: float = 4.0) -> None:
+        self.points = list(points)
+        n = len(self.points)
+        if n == 0:
+            self.min_x = self.min_y = 0.0
+            self.cell = 1.0
+            self.cols = self.rows = 1
+            self.cells: Dict[Tuple[int, int], List[int]] = {}
+            return
+        xs = [p[0] for p in self.points]
+        ys = [p[1] for p in self.points]
+        self.min_x, self.min_y = min(xs), min(ys)
+        span_x = max(1e-9, max(xs) - self.min_x)
+        span_y = max(1e-9, max(ys) - self.min_y)
+        self.cell = max(1e-9, math.sqrt(span_x * span_y * per_cell / n), max(span_x, span_y) / max(1, n))
+        self.cols = int(span_x / self.cell) + 1
+        self.rows = int(span_y / self.cell) + 1
+        self.cells = {}
+        for i, (x, y) in enumerate(self.points):
+            self.cells.setdefault(self._cell_of(x, y), []).append(i)
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        return int((x - self.min_x) / self.cell), int((y - self.min_y) / self.cell)
+
+    def _ring(self, cx: int, cy: int, r: int):
+        if r == 0:
+            yield cx, cy
+            return
+        for dx in range(-r, r + 1):
+            yield cx + dx, cy - r
+            yield cx + dx, cy + r
+        for dy in range(-r + 1, r):
+            yield cx - r, cy + dy
+            yield cx + r, cy + dy
+
+    def nearest(
+        self,
+        i: int,
+        k: int,
+        accept: Optional[Callable[[int, int], bool]] = None,
+    ) -> List[int]:
+        """Indices of the k points closest to point i (excluding i itself),
+        optionally keeping only those j with accept(i, j)."""
+        if k <= 0:
+            return []
+        x, y = self.points[i]
+        cx, cy = self._cell_of(x, y)
+        best: List[Tuple[float, int]] = []  # max-heap via negated distance
+        max_r = max(self.cols, self.rows)
+        for r in range(max_r + 1):
+            for cell in self._ring(cx, cy, r):
+                for j in self.cells.get(cell, ()):
+                    if j == i or (accept is not None and not accept(i, j)):
+                        continue
+                    d = euclidean((x, y), self.points[j])
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, j))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, j))
+            # every point outside the scanned block is at least r * cell away
+            if len(best) == k and -best[0][0] <= r * self.cell:
+                break
+        return [j for _, j in sorted(best, key=lambda t: (-t[0], t[1]))]
+
+
+def time_window_compatible(a: Client, b: Client) -> bool:
+    """True if b can be reached in time after serving a, or a after b."""
+    def reachable(u: Client, v: Client) -> bool:
+        if v.tw_end is None:
+            return True
+        ready = (u.tw_start or 0.0) + u.service_time + travel_cost(u.pos, v.pos)
+        return ready <= v.tw_end
+
+    return reachable(a, b) or reachable(b, a)
+
+
+def build_candidate_lists(
+    clients: Sequence[Client],
+    k: int = 10,
+    time_window_filter: bool = False,
+) -> List[List[int]]:
+    """For each client (by position in `clients`), the positions of its k
+    nearest clients, nearest first. With time_window_filter, pairs that
+    cannot be served consecutively in either order are skipped.
+
+    Nearness is straight-line (GridIndex) even under road-network costs, so
+    there the lists approximate the nearest clients by travel cost. They only
+    restrict which pairs mutations and local search try; every move is still
+    priced with the active costs."""
+    index = GridIndex([c.pos for c in clients])
+    accept = None
+    if time_window_filter:
+        def accept(i: int, j: int) -> bool:
+            return time_window_compatible(clients[i], clients[j])
+    k = min(k, max(0, len(clients) - 1))
+    return [index.nearest(i, k, accept) for i in range(len(clients))]
+
+
+def candidate_map(clients: Sequence[Client], candidates: Sequence[Sequence[int]]) -> Dict[Client, List[Client]]:
+    """Re-key index candidate lists by Client, for genomes/solutions holding Client objects."""
+    return {clients[i]: [clients[j] for j in nbrs] for i, nbrs in enumerate(candidates)}
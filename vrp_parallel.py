@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from vrp_models import Client, Vehicle, get_travel_costs, set_travel_costs
+from vrp_fitness import PenaltyWeights, Violations, score
+from vrp_eval import TourEvaluator
+from vrp_io import CLIENT_COLUMNS, VEHICLE_COLUMNS, nan_if_none, none_if_nan
+from vrp_table import ClientTable
+
+
+def pack_instance(clients: Union[Sequence[Client], ClientTable], vehicles: Sequence[Vehicle]) -> Tuple[np.ndarray, np.ndarray]:
+    """Flatten clients/vehicles into two float64 matrices, one row per
+    client/vehicle in vrp_io.CLIENT_COLUMNS / VEHICLE_COLUMNS order.
+    Optional values (time windows, max route time) are stored as NaN.
+    A ClientTable is stacked from its columns."""
+    if isinstance(clients, ClientTable):
+        c_arr = np.column_stack([np.asarray(clients.columns[name], dtype=np.float64) for name in CLIENT_COLUMNS])
+    else:
+        c_arr = np.array(
+            [
+                (c.id, c.x, c.y, c.demand, c.service_time, nan_if_none(c.tw_start), nan_if_none(c.tw_end), float(c.requires_refrigeration))
+                for c in clients
+            ],
+            dtype=np.float64,
+        ).reshape(len(clients), len(CLIENT_COLUMNS))
+    v_arr = np.array(
+        [
+            (
+                v.id, v.capacity, nan_if_none(v.max_route_time), float(v.has_refrigeration),
+                v.start_depot[0], v.start_depot[1], v.end_depot[0], v.end_depot[1],
+            )
+            for v in vehicles
+        ],
+        dtype=np.float64,
+    ).reshape(len(vehicles), len(VEHICLE_COLUMNS))
+    return c_arr, v_arr
+
+
+def unpack_instance(c_arr: np.ndarray, v_arr: np.ndarray) -> Tuple[ClientTable, List[Vehicle]]:
+    """Inverse of pack_instance. Integer-valued fields round-trip exactly."""
+    columns = {name: c_arr[:, k] for k, name in enumerate(CLIENT_COLUMNS)}
+    columns["id"] = columns["id"].astype(np.int64)
+    columns["requires_refrigeration"] = columns["requires_refrigeration"] > 0
+    table = ClientTable(columns)
+    vehicles = [
+        Vehicle(
+            id=int(row[0]),
+            capacity=row[1],
+            max_route_time=none_if_nan(row[2]),
+            has_refrigeration=bool(row[3]),
+            start_depot=(row[4], row[5]),
+            end_depot=(row[6], row[7]),
+        )
+        for row in v_arr.tolist()
+    ]
+    return table, vehicles
+
+
+def _to_shared(arr: np.ndarray) -> shared_memory.SharedMemory:
+    shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+    view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+    view[...] = arr
+    return shm
+
+
+def _read_shared(name: str, shape: Tuple[int, ...]) -> np.ndarray:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=np.float64, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+
+
+# Per-worker state, filled once by _init_worker.
+_W_EVAL: Optional[TourEvaluator] = None
+
+
+def _init_worker(
+    c_name: str,
+    c_shape: Tuple[int, ...],
+    v_name: str,
+    v_shape: Tuple[int, ...],
+    roads: Optional[Tuple[str, Tuple[int, ...], str, Tuple[int, ...], str]] = None,
+) -> None:
+    global _W_EVAL
+    table, vehicles = unpack_instance(_read_shared(c_name, c_shape), _read_shared(v_name, v_shape))
+    if roads is not None:  # road-network costs of the parent
+        from vrp_roads import TravelCosts
+
+        p_name, p_shape, m_name, m_shape, digest = roads
+        points = [tuple(p) for p in _read_shared(p_name, p_shape).tolist()]
+        set_travel_costs(TravelCosts(points, _read_shared(m_name, m_shape), digest))
+    _W_EVAL = TourEvaluator(table, vehicles)
+
+
+def _evaluate_chunk(tours: np.ndarray) -> List[Violations]:
+    violations = _W_EVAL.violations
+    return [violations(row) for row in tours.tolist()]
+
+
+class ParallelEvaluator:
+    """Evaluates giant tours (as client indices) in a pool of worker processes.
+
+    The instance is written once to shared memory and rebuilt by each worker at
+    startup as a ClientTable; afterwards only integer tours (row indices) go out
+    and weight-free violation vectors come back, so the caller can change the
+    penalty weights without restarting the pool. Workers run the same
+    TourEvaluator on the same table (and the same road-network cost matrix,
+    when one is active) as the serial path, so the results are bit-identical.
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[Client] | ClientTable,
+        vehicles: Sequence[Vehicle],
+        weights: Optional[PenaltyWeights],
+        workers: int,
+        chunks_per_worker: int = 4,
+    ) -> None:
+        self.weights = weights
+        self.workers = workers
+        self.chunks_per_worker = chunks_per_worker
+        c_arr, v_arr = pack_instance(clients, vehicles)
+        self._shm = [_to_shared(c_arr), _to_shared(v_arr)]
+        roads = None
+        costs = get_travel_costs()
+        if costs is not None:
+            p_arr = np.asarray(costs.points, dtype=np.float64).reshape(-1, 2)
+            self._shm += [_to_shared(p_arr), _to_shared(costs.matrix)]
+            roads = (self._shm[2].name, p_arr.shape, self._shm[3].name, costs.matrix.shape, costs.digest)
+        self._pool = mp.get_context().Pool(
+            processes=workers,
+            initializer=_init_worker,
+            initargs=(self._shm[0].name, c_arr.shape, self._shm[1].name, v_arr.shape, roads),
+        )
+
+    def evaluate_violations(self, tours: Sequence[Sequence[int]]) -> List[Violations]:
+        if not tours:
+            return []
+        arr = np.asarray(tours, dtype=np.int32)
+        n_chunks = min(len(arr), self.workers * self.chunks_per_worker)
+        out: List[Violations] = []
+        for part in self._pool.map(_evaluate_chunk, np.array_split(arr, n_chunks)):
+            out.extend(part)
+        return out
+
+    def evaluate(self, tours: Sequence[Sequence[int]]) -> List[float]:
+        """Fitness values under the evaluator's weights."""
+        return [score(v, self.weights) for v in self.evaluate_violations(tours)]
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        for shm in self._shm:
+            shm.close()
+            shm.unlink()
+        self._shm = []
+
+    def __enter__(self) -> "ParallelEvaluator":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
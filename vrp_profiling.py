@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import json
+import time
+import tracemalloc
+from typing import Any, Dict, IO, Optional
+
+
+class _Phase:
+    __slots__ = ("prof", "name", "t0")
+
+    def __init__(self, prof: "Profiler", name: str) -> None:
+        self.prof = prof
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.prof._add(self.name, time.perf_counter() - self.t0)
+
+
+class Profiler:
+    """Opt-in per-phase instrumentation for the GA loops.
+
+    `with prof.phase("crossover"): ...` accumulates wall time and call counts
+    per phase. `end_generation` writes one JSON line per generation with
+    those totals, evaluations per second, cache hit rate and, with
+    `track_memory`, peak traced memory, then starts a new window. `close` writes a summary line for the
+    whole run and, if requested, dumps cProfile stats (open with snakeviz,
+    or turn into a flamegraph with flameprof / gprof2dot).
+
+    Memory tracking (tracemalloc) is off by default: it slows every
+    allocation down several times and would distort the phase timings.
+    """
+
+    enabled = True
+
+    def __init__(
+        self,
+        trace_path: Optional[str] = None,
+        cprofile_path: Optional[str] = None,
+        track_memory: bool = False,
+    ) -> None:
+        self.trace: Optional[IO[str]] = open(trace_path, "w", encoding="utf-8") if trace_path else None
+        self.cprofile_path = cprofile_path
+        self.track_memory = track_memory
+        self.times: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.total_times: Dict[str, float] = {}
+        self.total_calls: Dict[str, int] = {}
+        self.evaluations = 0
+        self.total_evaluations = 0
+        self._t_gen = self._t_start = time.perf_counter()
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._cprofile = cProfile.Profile() if cprofile_path else None
+        if self._cprofile is not None:
+            self._cprofile.enable()
+
+    def phase(self, name: str) -> _Phase:
+        return _Phase(self, name)
+
+    def _add(self, name: str, dt: float) -> None:
+        self.times[name] = self.times.get(name, 0.0) + dt
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def add_evaluations(self, n: int) -> None:
+        self.evaluations += n
+
+    def _peak_memory(self) -> Optional[int]:
+        return tracemalloc.get_traced_memory()[1] if self.track_memory and tracemalloc.is_tracing() else None
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if self.trace is not None:
+            self.trace.write(json.dumps(record) + "\n")
+            self.trace.flush()
+
+    def end_generation(self, generation: int, **extra: Any) -> Dict[str, Any]:
+        now = time.perf_counter()
+        dt = now - self._t_gen
+        record: Dict[str, Any] = {
+            "generation": generation,
+            "seconds": dt,
+            "phases": {k: {"seconds": v, "calls": self.calls[k]} for k, v in self.times.items()},
+            "evaluations": self.evaluations,
+            "evals_per_sec": self.evaluations / dt if dt > 0 else None,
+            "peak_memory_bytes": self._peak_memory(),
+        }
+        record.update(extra)
+        self._write(record)
+        for k, v in self.times.items():
+            self.total_times[k] = self.total_times.get(k, 0.0) + v
+            self.total_calls[k] = self.total_calls.get(k, 0) + self.calls[k]
+        self.total_evaluations += self.evaluations
+        self.times, self.calls, self.evaluations = {}, {}, 0
+        self._t_gen = now
+        return record
+
+    def summary(self) -> Dict[str, Any]:
+        dt = time.perf_counter() - self._t_start
+        times = dict(self.total_times)
+        calls = dict(self.total_calls)
+        for k, v in self.times.items():  # phases recorded after the last generation
+            times[k] = times.get(k, 0.0) + v
+            calls[k] = calls.get(k, 0) + self.calls[k]
+        evals = self.total_evaluations + self.evaluations
+        return {
+            "summary": True,
+            "seconds": dt,
+            "phases": {k: {"seconds": v, "calls": calls[k]} for k, v in times.items()},
+            "evaluations": evals,
+            "evals_per_sec": evals / dt if dt > 0 else None,
+            "peak_memory_bytes": self._peak_memory(),
+        }
+
+    def close(self) -> Dict[str, Any]:
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+            self._cprofile = None
+        record = self.summary()
+        self._write(record)
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return record
+
+
+class NullProfiler:
+    """Disabled profiler: same interface, no work."""
+
+    enabled = False
+    _null = contextlib.nullcontext()
+
+    def phase(self, name: str) -> contextlib.nullcontext:
+        return self._null
+
+    def add_evaluations(self, n: int) -> None:
+        pass
+
+    def end_generation(self, generation: int, **extra: Any) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+NULL_PROFILER = NullProfiler()
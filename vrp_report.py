@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+from dataclasses import dataclass, field
+from typing import IO, Iterator, List, Optional
+
+from vrp_models import Route, Solution
+from vrp_fitness import (
+    evaluate_route_time,
+    capacity_violation,
+    time_window_violation,
+    refrigeration_violation,
+    max_route_time_violation,
+)
+
+
+@dataclass
+class RouteMetrics:
+    """Everything the reports show about one route, computed once."""
+    index: int  # 1-based route number
+    vehicle_id: int
+    client_ids: List[int]
+    demand: float
+    distance: float
+    time: float
+    capacity: float
+    time_window: float
+    refrigeration: float
+    max_route_time: float
+
+    @property
+    def feasible(self) -> bool:
+        return not (self.capacity or self.time_window or self.refrigeration or self.max_route_time)
+
+
+@dataclass
+class ReportSummary:
+    """Totals over the routes, accumulated while they are written."""
+    routes: int = 0
+    clients: int = 0
+    demand: float = 0.0
+    distance: float = 0.0
+    capacity: float = 0.0
+    time_window: float = 0.0
+    refrigeration: float = 0.0
+    max_route_time: float = 0.0
+    infeasible_routes: List[int] = field(default_factory=list)
+
+    def add(self, m: RouteMetrics) -> None:
+        self.routes += 1
+        self.clients += len(m.client_ids)
+        self.demand += m.demand
+        self.distance += m.distance
+        self.capacity += m.capacity
+        self.time_window += m.time_window
+        self.refrigeration += m.refrigeration
+        self.max_route_time += m.max_route_time
+        if not m.feasible:
+            self.infeasible_routes.append(m.index)
+
+
+def route_metrics(route: Route, index: int) -> RouteMetrics:
+    return RouteMetrics(
+        index=index,
+        vehicle_id=route.vehicle.id,
+        client_ids=[c.id for c in route.clients],
+        demand=route.total_demand(),
+        distance=route.distance(),
+        time=evaluate_route_time(route),
+        capacity=capacity_violation(route),
+        time_window=time_window_violation(route),
+        refrigeration=refrigeration_violation(route),
+        max_route_time=max_route_time_violation(route),
+    )
+
+
+def iter_route_metrics(solution: Solution) -> Iterator[RouteMetrics]:
+    for idx, route in enumerate(solution.routes, start=1):
+        yield route_metrics(route, idx)
+
+
+def write_text(solution: Solution, f: IO[str]) -> ReportSummary:
+    """Plain-text report (the rotas_otimizadas.txt format)."""
+    summary = ReportSummary()
+    f.write("Relatório de Rotas Otimizadas\n\n")
+    for m in iter_route_metrics(solution):
+        f.write(f"Rota {m.index}:\n")
+        f.write(f"  Veículo: {m.vehicle_id}\n")
+        f.write(f"  Clientes: {m.client_ids}\n")
+        f.write(f"  Demanda total: {m.demand}\n")
+        f.write(f"  Distância: {m.distance:.2f}\n")
+        f.write(f"  Tempo estimado: {m.time:.2f}\n")
+        f.write(f"  Penalidades: cap={m.capacity:.2f}, tw={m.time_window:.2f}, refrig={m.refrigeration:.2f}, mrt={m.max_route_time:.2f}\n\n")
+        summary.add(m)
+    f.write("\nResumo:\n")
+    f.write(f"Distância total: {summary.distance:.2f}\n")
+    f.write(
+        f"Violação total: cap={summary.capacity:.2f}, tw={summary.time_window:.2f}, "
+        f"refrig={summary.refrigeration:.2f}, mrt={summary.max_route_time:.2f}\n"
+    )
+    return summary
+
+
+def _route_json(m: RouteMetrics) -> dict:
+    return {
+        "route": m.index,
+        "vehicle": m.vehicle_id,
+        "clients": m.client_ids,
+        "demand": m.demand,
+        "distance": m.distance,
+        "time": m.time,
+        "violations": {
+            "capacity": m.capacity,
+            "time_window": m.time_window,
+            "refrigeration": m.refrigeration,
+            "max_route_time": m.max_route_time,
+        },
+    }
+
+
+def write_json(solution: Solution, f: IO[str]) -> ReportSummary:
+    """JSON report: {"routes": [...], "summary": {...}}, written one route at a
+    time. The "routes"/"clients" layout is what vrp_warmstart.load_prior_routes reads."""
+    summary = ReportSummary()
+    f.write('{\n  "routes": [')
+    for m in iter_route_metrics(solution):
+        f.write(("\n    " if summary.routes == 0 else ",\n    ") + json.dumps(_route_json(m), ensure_ascii=False))
+        summary.add(m)
+    f.write('\n  ],\n  "summary": ')
+    json.dump(
+        {
+            "routes": summary.routes,
+            "clients": summary.clients,
+            "demand": summary.demand,
+            "distance": summary.distance,
+            "violations": {
+                "capacity": summary.capacity,
+                "time_window": summary.time_window,
+                "refrigeration": summary.refrigeration,
+                "max_route_time": summary.max_route_time,
+            },
+            "infeasible_routes": summary.infeasible_routes,
+        },
+        f,
+        ensure_ascii=False,
+    )
+    f.write("\n}\n")
+    return summary
+
+
+CSV_FIELDS = (
+    "route", "vehicle", "clients", "demand", "distance", "time",
+    "capacity_violation", "time_window_violation", "refrigeration_violation", "max_route_time_violation",
+)
+
+
+def write_csv(solution: Solution, f: IO[str]) -> ReportSummary:
+    """One CSV row per route; client ids are space-separated in one column."""
+    summary = ReportSummary()
+    writer = csv.writer(f)
+    writer.writerow(CSV_FIELDS)
+    for m in iter_route_metrics(solution):
+        writer.writerow([
+            m.index, m.vehicle_id, " ".join(str(c) for c in m.client_ids), m.demand,
+            f"{m.distance:.4f}", f"{m.time:.4f}",
+            f"{m.capacity:.4f}", f"{m.time_window:.4f}", f"{m.refrigeration:.4f}", f"{m.max_route_time:.4f}",
+        ])
+        summary.add(m)
+    return summary
+
+
+_WRITERS = {".txt": write_text, ".json": write_json, ".csv": write_csv}
+
+
+def export_solution(solution: Solution, path: str, fmt: Optional[str] = None) -> ReportSummary:
+    """Write a report to path; the format ("txt", "json", "csv") defaults to the extension."""
+    ext = "." + fmt if fmt else os.path.splitext(path)[1].lower()
+    if ext not in _WRITERS:
+        raise ValueError(f"formato de relatório não suportado: {ext!r} (use .txt, .json ou .csv)")
+    with open(path, "w", encoding="utf-8", newline="" if ext == ".csv" else None) as f:
+        return _WRITERS[ext](solution, f)
+
+
+def prompt_context(solution: Solution, max_routes: Optional[int] = 50) -> str:
+    """Compact route description for LLM prompts (llm_integration), built from
+    the Solution itself. At most max_routes routes are listed; the totals
+    always cover all of them."""
+    summary = ReportSummary()
+    out = io.StringIO()
+    for m in iter_route_metrics(solution):
+        summary.add(m)
+        if max_routes is not None and m.index > max_routes:
+            continue
+        problems = [
+            name for name, v in (
+                ("capacidade", m.capacity),
+                ("janela de tempo", m.time_window),
+                ("refrigeração", m.refrigeration),
+                ("tempo máximo", m.max_route_time),
+            ) if v
+        ]
+        out.write(
+            f"Rota {m.index} (veículo {m.vehicle_id}): clientes {m.client_ids}; demanda {m.demand:g}; "
+            f"distância {m.distance:.1f}; tempo {m.time:.1f}"
+            + (f"; violações: {', '.join(problems)}" if problems else "")
+            + "\n"
+        )
+    if max_routes is not None and summary.routes > max_routes:
+        out.write(f"... mais {summary.routes - max_routes} rotas\n")
+    out.write(
+        f"Total: {summary.routes} rotas, {summary.clients} clientes, distância {summary.distance:.1f}, "
+        f"rotas com violação: {summary.infeasible_routes or 'nenhuma'}\n"
+    )
+    return out.getvalue()
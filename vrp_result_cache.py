@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from vrp_models import Client, Vehicle, Route, Solution, get_travel_costs
+from vrp_parallel import pack_instance
+from vrp_table import ClientTable
+
+
+# iter_ga arguments that do not change the result (or are the instance itself).
+_IGNORED_PARAMS = {"clients", "vehicles", "verbose", "workers", "cache_size", "profiler", "stop"}
+
+
+def instance_digest(clients: Sequence[Client], vehicles: Sequence[Vehicle]) -> str:
+    """Hash of the normalized instance: the float64 client/vehicle matrices in
+    vrp_io column order, so JSON, binary and generated instances with the
+    same data hash alike."""
+    c_arr, v_arr = pack_instance(clients, vehicles)
+    h = hashlib.blake2b(digest_size=20)
+    for arr in (c_arr, v_arr):
+        h.update(str(arr.shape).encode())
+        h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+def result_key(instance: str, params: Dict[str, Any]) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    h.update(instance.encode())
+    h.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+@dataclass
+class CachedResult:
+    key: str
+    fitness: float
+    tour: List[int]  # giant tour as client ids
+    solution: Solution
+    meta: Dict[str, Any]
+
+
+class ResultCache:
+    """Content-addressed store of GA results under `root`.
+
+    One JSON file per key (root/ab/abcdef....json) holding the best giant tour,
+    the routes (vehicle and client ids) and metadata. Files are written
+    atomically; the access time is the file mtime, refreshed on every hit, and
+    `put` evicts the least recently used files once the directory exceeds
+    max_bytes.
+    """
+
+    def __init__(self, root: str = ".vrp_cache", max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".json")
+
+    def get(self, key: str, clients: Sequence[Client], vehicles: Sequence[Vehicle]) -> Optional[CachedResult]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        os.utime(path)
+        by_id = {c.id: c for c in clients}
+        vehicle_by_id = {v.id: v for v in vehicles}
+        try:
+            solution = Solution(routes=[
+                Route(vehicle=vehicle_by_id[r["vehicle"]], clients=[by_id[cid] for cid in r["clients"]])
+                for r in data["routes"]
+            ])
+        except KeyError:  # hash collision or hand-edited file
+            return None
+        return CachedResult(key, data["fitness"], data["tour"], solution, data.get("meta", {}))
+
+    def put(self, key: str, fitness: float, tour: Sequence[int], solution: Solution, meta: Optional[Dict[str, Any]] = None) -> None:
+        data = {
+            "fitness": fitness,
+            "tour": list(tour),
+            "routes": [{"vehicle": r.vehicle.id, "clients": [c.id for c in r.clients]} for r in solution.routes],
+            "meta": dict(meta or {}, created=time.time()),
+        }
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+        self.evict()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        out = []
+        for sub in os.scandir(self.root):
+            if not sub.is_dir():
+                continue
+            for e in os.scandir(sub.path):
+                if e.name.endswith(".json"):
+                    st = e.stat()
+                    out.append((st.st_mtime, st.st_size, e.path))
+        return out
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+
+def normalized_params(**ga_kwargs) -> Dict[str, Any]:
+    """All iter_ga parameters that influence the result, defaults filled in."""
+    from vrp_ga import iter_ga
+
+    bound = inspect.signature(iter_ga).bind_partial(**ga_kwargs)
+    bound.apply_defaults()
+    return {k: v for k, v in bound.arguments.items() if k not in _IGNORED_PARAMS}
+
+
+def solve_cached(
+    cache: ResultCache,
+    clients: Optional[Union[List[Client], ClientTable]] = None,
+    vehicles: Optional[List[Vehicle]] = None,
+    on_improvement: Optional[Callable[[Any], None]] = None,
+    **ga_kwargs,
+) -> Tuple[Solution, bool]:
+    """run_ga through the cache. Returns (solution, hit); on a miss,
+    on_improvement is called as in run_ga.
+
+    The key covers the instance, seed, penalty weights, every GA parameter
+    and the active road-network cost matrix, so a hit is the result the same
+    call computed before. Runs stopped by time_limit or using timed education
+    are not reproducible; for those the cache returns the earlier run's
+    result.
+    """
+    from vrp_ga import iter_ga, generate_random_clients, build_vehicles
+
+    params = normalized_params(**ga_kwargs)
+    costs = get_travel_costs()
+    if costs is not None:  # road-network costs change every fitness
+        params["travel_costs"] = costs.digest
+    # the default instance is only materialized for hashing: iter_ga must still
+    # build it itself to consume the random stream exactly as run_ga does
+    inst_clients = clients if clients is not None else generate_random_clients(18, params["seed"])
+    inst_vehicles = vehicles if vehicles is not None else build_vehicles()
+    key = result_key(instance_digest(inst_clients, inst_vehicles), params)
+    hit = cache.get(key, inst_clients, inst_vehicles)
+    if hit is not None:
+        if isinstance(clients, ClientTable):  # routes hold table rows
+            return clients.materialize(hit.solution), True
+        return hit.solution, True
+
+    last = None
+    t0 = time.perf_counter()
+    for last in iter_ga(clients=clients, vehicles=vehicles, **ga_kwargs):
+        if on_improvement is not None:
+            on_improvement(last)
+    cache.put(
+        key,
+        last.fitness,
+        [inst_clients[i].id for i in last.tour],
+        last.solution,
+        {"params": params, "generation": last.generation, "runtime": time.perf_counter() - t0},
+    )
+    return last.solution, False
@@ -0,0 +1,278 @@
+"""
+Custos de viagem pela malha viária (grafo de ruas local).
+
+Arquivo de grafo (texto, uma entrada por linha, '#' inicia comentário):
+
+    v <id> <x> <y>          nó (mesmas coordenadas dos clientes/depósitos)
+    e <u> <v> [custo]       via de mão dupla
+    a <u> <v> [custo]       via de mão única (u -> v)
+
+Sem custo, a aresta vale o comprimento em linha reta entre os nós. Cada ponto
+da instância é ligado ao nó mais próximo (trecho de acesso em linha reta), e
+os caminhos mínimos entre esses nós vêm de um Dijkstra por nó de origem,
+distribuído entre processos. A matriz resultante fica em cache no disco
+(.npy, chave = conteúdo do grafo + coordenadas dos pontos), então execuções
+seguintes pagam só a leitura.
+
+    python vrp_ga.py --data instancia.json --roads ruas.txt --roads-workers 4
+"""
+from __future__ import annotations
+
+import hashlib
+import heapq
+import math
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from vrp_models import Client, Vehicle, Point
+
+MATRIX_VERSION = 1
+
+
+class RoadGraph:
+    """Directed road graph in CSR form: the arcs leaving node i are
+    adj[start[i]:start[i + 1]] with costs weight[...]."""
+
+    def __init__(self, ids: np.ndarray, xy: np.ndarray, start: np.ndarray, adj: np.ndarray, weight: np.ndarray) -> None:
+        self.ids = ids
+        self.xy = xy
+        self.start = start
+        self.adj = adj
+        self.weight = weight
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def nearest_nodes(self, points: np.ndarray, chunk: int = 256) -> Tuple[np.ndarray, np.ndarray]:
+        """Nearest node index and straight-line distance for each point."""
+        nodes = np.empty(len(points), dtype=np.int64)
+        dists = np.empty(len(points), dtype=np.float64)
+        for lo in range(0, len(points), chunk):
+            p = points[lo:lo + chunk]
+            d2 = (p[:, None, 0] - self.xy[None, :, 0]) ** 2 + (p[:, None, 1] - self.xy[None, :, 1]) ** 2
+            k = d2.argmin(axis=1)
+            nodes[lo:lo + chunk] = k
+            dists[lo:lo + chunk] = np.hypot(p[:, 0] - self.xy[k, 0], p[:, 1] - self.xy[k, 1])
+        return nodes, dists
+
+
+def load_road_graph(path: str) -> RoadGraph:
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    index: Dict[str, int] = {}
+    ids: List[str] = []
+    xy: List[Tuple[float, float]] = []
+    arcs: List[Tuple[str, str, Optional[float], bool, int]] = []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        parts = line.split("#", 1)[0].split()
+        if not parts:
+            continue
+        kind = parts[0].lower()
+        try:
+            if kind == "v" and len(parts) == 4:
+                if parts[1] in index:
+                    raise ValueError(f"nó {parts[1]} repetido")
+                index[parts[1]] = len(ids)
+                ids.append(parts[1])
+                xy.append((float(parts[2]), float(parts[3])))
+            elif kind in ("e", "a") and len(parts) in (3, 4):
+                cost = float(parts[3]) if len(parts) == 4 else None
+                if cost is not None and not cost >= 0:
+                    raise ValueError("custo de aresta deve ser >= 0")
+                arcs.append((parts[1], parts[2], cost, kind == "a", lineno))
+            else:
+                raise ValueError(f"linha não reconhecida: {line.strip()!r}")
+        except ValueError as e:
+            raise ValueError(f"{path}:{lineno}: {e}") from None
+    if not ids:
+        raise ValueError(f"{path}: grafo sem nós")
+
+    src: List[int] = []
+    dst: List[int] = []
+    cost: List[float] = []
+    for u, v, c, oneway, lineno in arcs:
+        if u not in index or v not in index:
+            raise ValueError(f"{path}:{lineno}: aresta com nó desconhecido ({u} -> {v})")
+        i, j = index[u], index[v]
+        if c is None:
+            c = math.hypot(xy[i][0] - xy[j][0], xy[i][1] - xy[j][1])
+        src.append(i)
+        dst.append(j)
+        cost.append(c)
+        if not oneway:
+            src.append(j)
+            dst.append(i)
+            cost.append(c)
+
+    order = np.argsort(np.asarray(src, dtype=np.int64), kind="stable")
+    start = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(np.asarray(src, dtype=np.int64), minlength=len(ids)), out=start[1:])
+    return RoadGraph(
+        ids=np.asarray(ids),
+        xy=np.asarray(xy, dtype=np.float64),
+        start=start,
+        adj=np.asarray(dst, dtype=np.int64)[order],
+        weight=np.asarray(cost, dtype=np.float64)[order],
+    )
+
+
+# Per-worker graph, filled once by _init_dijkstra.
+_G_ARCS: List[List[Tuple[int, float]]] = []  # (head, cost) per tail node
+_G_TARGETS: List[int] = []
+
+
+def _init_dijkstra(start: np.ndarray, adj: np.ndarray, weight: np.ndarray, targets: np.ndarray) -> None:
+    global _G_ARCS, _G_TARGETS
+    heads, costs, bounds = adj.tolist(), weight.tolist(), start.tolist()
+    _G_ARCS = [list(zip(heads[bounds[i]:bounds[i + 1]], costs[bounds[i]:bounds[i + 1]])) for i in range(len(bounds) - 1)]
+    _G_TARGETS = targets.tolist()
+
+
+def _dijkstra_rows(sources: Sequence[int]) -> List[List[float]]:
+    """Shortest path cost from each source to every target (inf if
+    unreachable); each search stops once all targets are settled."""
+    arcs, targets = _G_ARCS, _G_TARGETS
+    push, pop = heapq.heappush, heapq.heappop
+    wanted = set(targets)
+    out = []
+    for s in sources:
+        dist = [math.inf] * len(arcs)
+        dist[s] = 0.0
+        heap = [(0.0, s)]
+        left = len(wanted)
+        while heap:
+            d, u = pop(heap)
+            if d > dist[u]:
+                continue
+            if u in wanted:
+                left -= 1
+                if left == 0:
+                    break
+            for v, c in arcs[u]:
+                nd = d + c
+                if nd < dist[v]:
+                    dist[v] = nd
+                    push(heap, (nd, v))
+        out.append([dist[t] for t in targets])
+    return out
+
+
+def shortest_path_matrix(graph: RoadGraph, nodes: Sequence[int], workers: int = 1) -> np.ndarray:
+    """Node-to-node shortest path costs among `nodes` (len(nodes) x len(nodes)),
+    one Dijkstra per source, sources spread over `workers` processes."""
+    targets = np.asarray(nodes, dtype=np.int64)
+    args = (graph.start, graph.adj, graph.weight, targets)
+    if workers > 1 and len(targets) > 1:
+        n_chunks = min(len(targets), workers * 4)
+        chunks = [c.tolist() for c in np.array_split(targets, n_chunks)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_dijkstra, initargs=args) as ex:
+            rows = [row for part in ex.map(_dijkstra_rows, chunks) for row in part]
+    else:
+        _init_dijkstra(*args)
+        rows = _dijkstra_rows(targets.tolist())
+    return np.asarray(rows, dtype=np.float64).reshape(len(targets), len(targets))
+
+
+class TravelCosts:
+    """Point-to-point travel costs looked up in a precomputed matrix.
+
+    `points` are the distinct instance points (client positions and depots)
+    and matrix[i][j] the cost from points[i] to points[j]. Calling the object
+    with two points returns the cost, so it can be set as the active cost
+    function (vrp_models.set_travel_costs). `rows` holds the matrix as lists
+    for the evaluator's per-leg lookups.
+    """
+
+    def __init__(self, points: Sequence[Point], matrix: np.ndarray, digest: str = "") -> None:
+        self.points = [tuple(p) for p in points]
+        self.matrix = matrix
+        self.digest = digest
+        self.index: Dict[Point, int] = {p: i for i, p in enumerate(self.points)}
+        self.rows: List[List[float]] = matrix.tolist()
+
+    def node(self, p: Point) -> int:
+        try:
+            return self.index[p]
+        except KeyError:
+            raise KeyError(f"ponto {p} fora da matriz de custos da malha viária (recalcule para esta instância)") from None
+
+    def __call__(self, a: Point, b: Point) -> float:
+        return self.rows[self.node(a)][self.node(b)]
+
+
+def instance_points(clients: Sequence[Client], vehicles: Sequence[Vehicle]) -> List[Point]:
+    """Distinct client positions and depots, in first-seen order."""
+    seen: Dict[Point, None] = {}
+    for c in clients:
+        seen.setdefault(c.pos, None)
+    for v in vehicles:
+        seen.setdefault(v.start_depot, None)
+        seen.setdefault(v.end_depot, None)
+    return list(seen)
+
+
+def matrix_key(graph_digest: str, points: Sequence[Point]) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{MATRIX_VERSION}:{graph_digest}:".encode())
+    h.update(np.asarray(points, dtype=np.float64).reshape(-1, 2).tobytes())
+    return h.hexdigest()
+
+
+def road_travel_costs(
+    graph_path: str,
+    clients: Sequence[Client],
+    vehicles: Sequence[Vehicle],
+    cache_dir: Optional[str] = ".vrp_cache",
+    workers: int = 1,
+    verbose: bool = True,
+) -> TravelCosts:
+    """Travel costs between every client and depot over the road graph.
+
+    cost(p, q) = access(p) + shortest path(node(p), node(q)) + access(q), where
+    node is the nearest graph node and access the straight-line distance to it;
+    cost(p, p) = 0. The matrix is read from cache_dir when the same graph file
+    and points were computed before, else computed and stored there.
+    """
+    points = instance_points(clients, vehicles)
+    with open(graph_path, "rb") as f:
+        graph_digest = hashlib.blake2b(f.read(), digest_size=20).hexdigest()
+    key = matrix_key(graph_digest, points)
+    path = os.path.join(cache_dir, "roads", key + ".npy") if cache_dir else None
+    if path is not None and os.path.exists(path):
+        matrix = np.load(path)
+        if matrix.shape == (len(points), len(points)):
+            if verbose:
+                print(f"Malha viária: matriz {len(points)}x{len(points)} lida do cache ({path})")
+            return TravelCosts(points, matrix, key)
+
+    t0 = time.perf_counter()
+    graph = load_road_graph(graph_path)
+    nodes, access = graph.nearest_nodes(np.asarray(points, dtype=np.float64))
+    uniq, inverse = np.unique(nodes, return_inverse=True)
+    paths = shortest_path_matrix(graph, uniq, workers)
+    matrix = access[:, None] + paths[inverse[:, None], inverse[None, :]] + access[None, :]
+    np.fill_diagonal(matrix, 0.0)
+    missing = np.argwhere(np.isinf(matrix))
+    if len(missing):
+        i, j = missing[0]
+        raise ValueError(
+            f"malha viária desconexa: {len(missing)} pares de pontos sem caminho "
+            f"(ex.: {points[i]} -> {points[j]}, nós {graph.ids[nodes[i]]} -> {graph.ids[nodes[j]]})"
+        )
+    if verbose:
+        print(
+            f"Malha viária: {len(graph)} nós, {len(graph.adj)} arcos; {len(uniq)} origens, "
+            f"matriz {len(points)}x{len(points)} em {time.perf_counter() - t0:.2f}s ({workers} processo(s))"
+        )
+    if path is not None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, matrix)
+        os.replace(tmp, path)
+    return TravelCosts(points, matrix, key)
@@ -0,0 +1,81 @@
+"""
+Serviço HTTP local de otimização VRP (fila de jobs + pool de workers aquecidos).
+
+    python vrp_service.py --workers 2 --port 5003 --result-cache .vrp_cache
+
+POST   /jobs              {"instance": {clients, vehicles}, "params": {n_gens, time_limit, seed, ...}}
+GET    /jobs              lista de jobs (sem rotas)
+GET    /jobs/<id>         status e melhor solução até agora
+DELETE /jobs/<id>         cancela (na fila: descarta; em execução: para na próxima geração)
+GET    /health            workers, fila e parâmetros aceitos
+"""
+import argparse
+import atexit
+
+from flask import Flask, jsonify, request
+
+from vrp_jobs import JobManager, QueueFullError, QUEUED, RUNNING
+
+
+def create_app(manager: JobManager) -> Flask:
+    app = Flask(__name__)
+
+    @app.route('/jobs', methods=['POST'])
+    def submit_job():
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict) or not isinstance(body.get("instance"), dict):
+            return jsonify(error="corpo JSON esperado: {\"instance\": {...}, \"params\": {...}}"), 400
+        try:
+            job = manager.submit(body["instance"], body.get("params") or {})
+        except QueueFullError as e:
+            return jsonify(error=str(e)), 503
+        except (ValueError, KeyError, TypeError) as e:
+            return jsonify(error=str(e)), 400
+        return jsonify(job.to_dict()), 202
+
+    @app.route('/jobs', methods=['GET'])
+    def list_jobs():
+        return jsonify([j.to_dict(routes=False) for j in manager.list()])
+
+    @app.route('/jobs/<int:job_id>', methods=['GET'])
+    def job_status(job_id):
+        job = manager.get(job_id)
+        if job is None:
+            return jsonify(error="job não encontrado"), 404
+        return jsonify(job.to_dict())
+
+    @app.route('/jobs/<int:job_id>', methods=['DELETE'])
+    def cancel_job(job_id):
+        job = manager.cancel(job_id)
+        if job is None:
+            return jsonify(error="job não encontrado"), 404
+        return jsonify(job.to_dict(routes=False))
+
+    @app.route('/health')
+    def health():
+        jobs = manager.list()
+        return jsonify(
+            workers=manager.workers,
+            queued=sum(j.status == QUEUED for j in jobs),
+            running=sum(j.status == RUNNING for j in jobs),
+            max_queued=manager.max_queued,
+            params=sorted(manager.allowed_params),
+        )
+
+    return app
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serviço local de otimização VRP")
+    parser.add_argument("--workers", type=int, default=2, help="Processos solucionadores (jobs simultâneos)")
+    parser.add_argument("--max-queued", type=int, default=100, help="Máximo de jobs aguardando na fila")
+    parser.add_argument("--result-cache", type=str, default=None, help="Diretório do cache de resultados compartilhado")
+    parser.add_argument("--result-cache-mb", type=float, default=256.0, help="Tamanho máximo do cache de resultados (MB)")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5003)
+    args = parser.parse_args()
+
+    # workers are forked before the server starts any threads
+    manager = JobManager(args.workers, args.max_queued, cache_dir=args.result_cache, cache_mb=args.result_cache_mb).start()
+    atexit.register(manager.close)
+    create_app(manager).run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from vrp_models import Client, Vehicle, Route, Solution, Point
+from vrp_io import CLIENT_COLUMNS, load_vrp, load_vrp_arrays, nan_if_none, none_if_nan, vehicles_from_columns
+
+
+# fields stored as NaN when missing
+_OPTIONAL_COLUMNS = ("tw_start", "tw_end")
+
+
+class ClientRow:
+    """Slotted view of one ClientTable row with the same attributes as Client.
+
+    Values are plain Python scalars taken once from the table columns, and `pos`
+    is built once, so hot loops pay a slot lookup instead of a dataclass
+    attribute plus a tuple allocation. Equality and hashing are by identity:
+    each client has exactly one row per table.
+    """
+
+    __slots__ = (
+        "index", "id", "x", "y", "demand", "service_time",
+        "tw_start", "tw_end", "requires_refrigeration", "pos",
+    )
+
+    def __init__(
+        self,
+        index: int,
+        id: int,
+        x: float,
+        y: float,
+        demand: float,
+        service_time: float,
+        tw_start: Optional[float],
+        tw_end: Optional[float],
+        requires_refrigeration: bool,
+    ) -> None:
+        self.index = index
+        self.id = id
+        self.x = x
+        self.y = y
+        self.demand = demand
+        self.service_time = service_time
+        self.tw_start = tw_start
+        self.tw_end = tw_end
+        self.requires_refrigeration = requires_refrigeration
+        self.pos: Point = (x, y)
+
+    def to_client(self) -> Client:
+        return Client(
+            id=self.id,
+            x=self.x,
+            y=self.y,
+            demand=self.demand,
+            service_time=self.service_time,
+            tw_start=self.tw_start,
+            tw_end=self.tw_end,
+            requires_refrigeration=self.requires_refrigeration,
+        )
+
+    def __repr__(self) -> str:
+        return f"ClientRow(index={self.index}, id={self.id})"
+
+
+class ClientTable:
+    """Struct-of-arrays client store.
+
+    `columns` holds one NumPy array per field (vrp_io.CLIENT_COLUMNS, NaN for
+    missing windows), possibly memory-mapped; nothing is copied at
+    construction. Scalar hot loops take whole columns as lists (`field`).
+    ClientRow views are built on first access (`table[i]`, iteration, `rows`)
+    and kept, so each client has one row per table. Client objects are only
+    built on demand (I/O, display) via `to_clients` / `materialize`.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]) -> None:
+        self.columns = columns
+        self._rows: List[Optional[ClientRow]] = [None] * len(columns["id"])
+        self._complete = False
+
+    def field(self, name: str) -> list:
+        """One column as a list of Python scalars, None for missing windows."""
+        col = self.columns[name]
+        values = col.tolist()
+        if name in _OPTIONAL_COLUMNS and np.isnan(col).any():
+            values = [None if v != v else v for v in values]
+        return values
+
+    def _row(self, i: int) -> ClientRow:
+        c = self.columns
+        return ClientRow(
+            i,
+            c["id"][i].item(),
+            c["x"][i].item(),
+            c["y"][i].item(),
+            c["demand"][i].item(),
+            c["service_time"][i].item(),
+            none_if_nan(c["tw_start"][i].item()),
+            none_if_nan(c["tw_end"][i].item()),
+            c["requires_refrigeration"][i].item(),
+        )
+
+    @property
+    def rows(self) -> List[ClientRow]:
+        """Every row, built in one pass over the columns on first use."""
+        if not self._complete:
+            rows = self._rows
+            cols = {name: self.field(name) for name in CLIENT_COLUMNS}
+            for i, row in enumerate(rows):
+                if row is None:
+                    rows[i] = ClientRow(
+                        i,
+                        cols["id"][i],
+                        cols["x"][i],
+                        cols["y"][i],
+                        cols["demand"][i],
+                        cols["service_time"][i],
+                        cols["tw_start"][i],
+                        cols["tw_end"][i],
+                        cols["requires_refrigeration"][i],
+                    )
+            self._complete = True
+        return self._rows
+
+    @classmethod
+    def from_clients(cls, clients: Sequence[Client]) -> "ClientTable":
+        return cls({
+            "id": np.array([c.id for c in clients], dtype=np.int64),
+            "x": np.array([c.x for c in clients], dtype=np.float64),
+            "y": np.array([c.y for c in clients], dtype=np.float64),
+            "demand": np.array([c.demand for c in clients], dtype=np.float64),
+            "service_time": np.array([c.service_time for c in clients], dtype=np.float64),
+            "tw_start": np.array([nan_if_none(c.tw_start) for c in clients], dtype=np.float64),
+            "tw_end": np.array([nan_if_none(c.tw_end) for c in clients], dtype=np.float64),
+            "requires_refrigeration": np.array([c.requires_refrigeration for c in clients], dtype=np.bool_),
+        })
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, i: int) -> ClientRow:
+        row = self._rows[i]
+        if row is None:
+            if i < 0:
+                i += len(self._rows)
+            row = self._rows[i] = self._row(i)
+        return row
+
+    def __iter__(self) -> Iterator[ClientRow]:
+        return iter(self.rows)
+
+    def to_clients(self, indices: Optional[Sequence[int]] = None) -> List[Client]:
+        rows = self.rows if indices is None else [self[i] for i in indices]
+        return [r.to_client() for r in rows]
+
+    def materialize(self, solution: Solution) -> Solution:
+        """Copy of a solution over table rows with Client objects in its routes."""
+        return Solution(routes=[
+            Route(vehicle=r.vehicle, clients=[c.to_client() if isinstance(c, ClientRow) else c for c in r.clients])
+            for r in solution.routes
+        ])
+
+
+def load_client_table(path: str) -> Tuple[ClientTable, List[Vehicle]]:
+    """Instance as a ClientTable (see vrp_io.load_vrp for the formats).
+
+    A binary instance directory goes straight from its memory-mapped columns
+    into the table, without Client objects; the text formats are parsed into
+    clients first.
+    """
+    if os.path.isdir(path):
+        clients, vehicles = load_vrp_arrays(path)
+        return ClientTable(clients), vehicles_from_columns(vehicles)
+    clients, vehicles = load_vrp(path)
+    return ClientTable.from_clients(clients), vehicles
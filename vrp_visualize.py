@@ -1,16 +1,342 @@
 from __future__ import annotations
 
+import math
+import time
+import numpy as np
 import pygame
-from typing import Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 from vrp_models import Solution
-from vrp_fitness import (
-    PenaltyWeights,
-    evaluate_route_time,
-    capacity_violation,
-    time_window_violation,
-    refrigeration_violation,
-    max_route_time_violation,
-)
+from vrp_fitness import PenaltyWeights
+from vrp_report import ReportSummary, iter_route_metrics
+
+if TYPE_CHECKING:
+    from vrp_live import LiveFeed
+
+Point = Tuple[float, float]
+Bounds = Tuple[float, float, float, float]  # min_x, min_y, max_x, max_y
+
+# Level of detail: polylines are simplified to LOD_TOLERANCE_PX on screen;
+# clients become a density heatmap once the visible ones are packed closer
+# than HEATMAP_SPACING_PX (binned in HEATMAP_CELL_PX cells).
+LOD_TOLERANCE_PX = 0.75
+HEATMAP_SPACING_PX = 6.0
+HEATMAP_CELL_PX = 6
+CHUNK_SEGMENTS = 32  # routes are culled in pieces of this many segments
+FADE_SECONDS = 0.4  # live view: cross-fade from the previous solution
+
+
+def _pt_seg_dist(p: Point, a: Point, b: Point) -> float:
+    (px, py), (ax, ay), (bx, by) = p, a, b
+    abx, aby = bx - ax, by - ay
+    apx, apy = px - ax, py - ay
+    ab2 = abx * abx + aby * aby
+    t = 0.0 if ab2 == 0 else max(0.0, min(1.0, (apx * abx + apy * aby) / ab2))
+    cx, cy = ax + t * abx, ay + t * aby
+    dx, dy = px - cx, py - cy
+    return (dx * dx + dy * dy) ** 0.5
+
+
+def _bounds(paths: Sequence[Sequence[Point]]) -> Optional[Bounds]:
+    xs = [p[0] for path in paths for p in path]
+    ys = [p[1] for path in paths for p in path]
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _fit_transform(bounds: Optional[Bounds], rect: pygame.Rect, pad: int) -> Tuple[float, Tuple[float, float]]:
+    """Scale and offset that fit bounds into rect (centered, keeping aspect)."""
+    if bounds is None:
+        return 1.0, (float(rect.x), float(rect.y))
+    min_x, min_y, max_x, max_y = bounds
+    span_x = max(1.0, max_x - min_x)
+    span_y = max(1.0, max_y - min_y)
+    sx = (rect.width - 2 * pad) / span_x
+    sy = (rect.height - 2 * pad) / span_y
+    s = min(sx, sy)
+    off_x = rect.x + pad - min_x * s + (rect.width - 2 * pad - span_x * s) / 2
+    off_y = rect.y + pad - min_y * s + (rect.height - 2 * pad - span_y * s) / 2
+    return s, (off_x, off_y)
+
+
+class SegmentGrid:
+    """Uniform grid over route segments in world coordinates, for hover
+    hit-testing. Each segment is registered in the cells it crosses (sampled
+    once per cell length), so a query only measures the segments around the
+    cursor. Cells are stored as sorted keys with offsets into one array of
+    segment ids, built with numpy so large solutions index quickly."""
+
+    def __init__(self, paths: Sequence[Sequence[Point]], per_cell: float = 2.0) -> None:
+        segs = [(ri, a, b) for ri, path in enumerate(paths) for a, b in zip(path[:-1], path[1:])]
+        self.route = np.array([ri for ri, _, _ in segs], dtype=int)
+        self.a = np.array([a for _, a, _ in segs], dtype=float).reshape(-1, 2)
+        self.b = np.array([b for _, _, b in segs], dtype=float).reshape(-1, 2)
+        self.keys = self.starts = self.ids = np.zeros(0, dtype=np.int64)
+        self.min_x = self.min_y = 0.0
+        self.cell = 1.0
+        self.cols = self.rows = 1
+        bounds = _bounds(paths)
+        n = len(segs)
+        if bounds is None or n == 0:
+            return
+        self.min_x, self.min_y = bounds[0], bounds[1]
+        span_x = max(1e-9, bounds[2] - bounds[0])
+        span_y = max(1e-9, bounds[3] - bounds[1])
+        self.cell = max(1e-9, math.sqrt(span_x * span_y * per_cell / n), max(span_x, span_y) / n)
+        self.cols = int(span_x / self.cell) + 1
+        self.rows = int(span_y / self.cell) + 1
+
+        d = self.b - self.a
+        steps = (np.hypot(d[:, 0], d[:, 1]) / self.cell).astype(np.int64) + 1
+        seg = np.repeat(np.arange(n), steps + 1)
+        k = np.arange(len(seg)) - np.repeat(np.cumsum(steps + 1) - (steps + 1), steps + 1)
+        t = (k / steps[seg])[:, None]
+        pts = self.a[seg] + d[seg] * t
+        cx = np.clip(((pts[:, 0] - self.min_x) / self.cell).astype(np.int64), 0, self.cols - 1)
+        cy = np.clip(((pts[:, 1] - self.min_y) / self.cell).astype(np.int64), 0, self.rows - 1)
+        key = cy * self.cols + cx
+        # a straight segment never re-enters a cell: dropping repeats of the
+        # previous sample leaves each (cell, segment) pair once
+        first = np.ones(len(key), dtype=bool)
+        first[1:] = (key[1:] != key[:-1]) | (seg[1:] != seg[:-1])
+        key, seg = key[first], seg[first]
+        order = np.argsort(key, kind="stable")
+        key, self.ids = key[order], seg[order]
+        self.keys, self.starts = np.unique(key, return_index=True)
+        self.starts = np.append(self.starts, len(self.ids))
+
+    def nearest(self, x: float, y: float, tol: float) -> Optional[int]:
+        """Route index of the segment closest to (x, y) within tol, or None."""
+        if not len(self.ids):
+            return None
+        cx = int(math.floor((x - self.min_x) / self.cell))
+        cy = int(math.floor((y - self.min_y) / self.cell))
+        r = int(tol / self.cell) + 2  # samples are at most one cell apart along the segment
+        xs = np.arange(max(0, cx - r), min(self.cols - 1, cx + r) + 1)
+        ys = np.arange(max(0, cy - r), min(self.rows - 1, cy + r) + 1)
+        if not len(xs) or not len(ys):
+            return None
+        wanted = (ys[:, None] * self.cols + xs[None, :]).ravel()
+        pos = np.searchsorted(self.keys, wanted)
+        pos = pos[pos < len(self.keys)]
+        pos = pos[np.isin(self.keys[pos], wanted)]
+        if not len(pos):
+            return None
+        cand = np.unique(np.concatenate([self.ids[self.starts[i]:self.starts[i + 1]] for i in pos]))
+        a, b = self.a[cand], self.b[cand]
+        ab = b - a
+        ab2 = (ab * ab).sum(axis=1)
+        t = np.clip(((x - a[:, 0]) * ab[:, 0] + (y - a[:, 1]) * ab[:, 1]) / np.where(ab2 == 0, 1, ab2), 0, 1)
+        t[ab2 == 0] = 0
+        dist = np.hypot(a[:, 0] + t * ab[:, 0] - x, a[:, 1] + t * ab[:, 1] - y)
+        best = int(np.argmin(dist))
+        return int(self.route[cand[best]]) if dist[best] <= tol else None
+
+
+def simplify_polyline(points: Sequence[Point], tol: float) -> List[Point]:
+    """Douglas-Peucker: drop points within tol of the simplified line.
+    The endpoints are always kept."""
+    n = len(points)
+    if n <= 2 or tol <= 0:
+        return list(points)
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        far, dmax = -1, tol
+        for k in range(i + 1, j):
+            d = _pt_seg_dist(points[k], points[i], points[j])
+            if d > dmax:
+                far, dmax = k, d
+        if far >= 0:
+            keep[far] = True
+            stack.append((i, far))
+            stack.append((far, j))
+    return [p for p, k in zip(points, keep) if k]
+
+
+def _boxes_overlap(a: Bounds, b: Bounds) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class _QuadNode:
+    __slots__ = ("box", "boxes", "ids", "children")
+
+    def __init__(self, box: Bounds) -> None:
+        self.box = box
+        self.boxes: List[Bounds] = []  # parallel to ids
+        self.ids: List[int] = []
+        self.children: Optional[List["_QuadNode"]] = None
+
+
+class QuadTree:
+    """Region quadtree over boxes in world coordinates, for viewport culling.
+
+    An item lives in the deepest node whose quadrant contains its whole box,
+    so points sink to the leaves and long route pieces stay near the root.
+    Leaves split once they hold more than `capacity` items."""
+
+    def __init__(self, bounds: Bounds, capacity: int = 16, max_depth: int = 12) -> None:
+        self.root = _QuadNode(bounds)
+        self.capacity = capacity
+        self.max_depth = max_depth
+
+    @staticmethod
+    def _child_for(node: _QuadNode, box: Bounds) -> Optional[_QuadNode]:
+        for child in node.children:
+            cb = child.box
+            if cb[0] <= box[0] and box[2] <= cb[2] and cb[1] <= box[1] and box[3] <= cb[3]:
+                return child
+        return None
+
+    def _split(self, node: _QuadNode) -> None:
+        x0, y0, x1, y1 = node.box
+        mx, my = (x0 + x1) / 2, (y0 + y1) / 2
+        node.children = [
+            _QuadNode((x0, y0, mx, my)), _QuadNode((mx, y0, x1, my)),
+            _QuadNode((x0, my, mx, y1)), _QuadNode((mx, my, x1, y1)),
+        ]
+        boxes, ids = node.boxes, node.ids
+        node.boxes, node.ids = [], []
+        for box, item in zip(boxes, ids):
+            target = self._child_for(node, box) or node
+            target.boxes.append(box)
+            target.ids.append(item)
+
+    def insert(self, item: int, box: Bounds) -> None:
+        node, depth = self.root, 0
+        while True:
+            if node.children is None:
+                if len(node.ids) < self.capacity or depth >= self.max_depth:
+                    break
+                self._split(node)
+            child = self._child_for(node, box)
+            if child is None:
+                break
+            node, depth = child, depth + 1
+        node.boxes.append(box)
+        node.ids.append(item)
+
+    def query(self, box: Bounds) -> List[int]:
+        """Items whose box overlaps box."""
+        out: List[int] = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            nb = node.box
+            if not _boxes_overlap(nb, box):
+                continue
+            if box[0] <= nb[0] and nb[2] <= box[2] and box[1] <= nb[1] and nb[3] <= box[3]:
+                self._collect(node, out)  # whole subtree visible
+                continue
+            out.extend(item for b, item in zip(node.boxes, node.ids) if _boxes_overlap(b, box))
+            if node.children is not None:
+                stack.extend(node.children)
+        return out
+
+    @staticmethod
+    def _collect(node: _QuadNode, out: List[int]) -> None:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            out.extend(node.ids)
+            if node.children is not None:
+                stack.extend(node.children)
+
+
+def _heat_surface(xy: np.ndarray, size: Tuple[int, int], cell: int) -> pygame.Surface:
+    """Client density heatmap for points in layer pixel coordinates."""
+    gw, gh = -(-size[0] // cell), -(-size[1] // cell)
+    counts, _, _ = np.histogram2d(xy[:, 1], xy[:, 0], bins=(gh, gw), range=((0, gh * cell), (0, gw * cell)))
+    t = np.log1p(counts) / np.log1p(max(1.0, counts.max()))
+    rgba = np.zeros((gh, gw, 4), dtype=np.uint8)
+    rgba[..., 0] = 230
+    rgba[..., 1] = (200 * (1 - t) + 40).astype(np.uint8)
+    rgba[..., 2] = (60 * (1 - t)).astype(np.uint8)
+    rgba[..., 3] = np.where(counts > 0, 70 + 170 * t, 0).astype(np.uint8)
+    surf = pygame.image.frombuffer(rgba.tobytes(), (gw, gh), "RGBA")
+    return pygame.transform.smoothscale(surf, (gw * cell, gh * cell))
+
+
+class _Scene:
+    """Everything the viewer derives from a solution, computed once: world
+    paths, per-route metrics, totals, bounds, the hover index and the
+    quadtrees used to cull clients and route pieces to the viewport."""
+
+    def __init__(self, sol: Solution) -> None:
+        self.sol = sol
+        self.paths: List[List[Point]] = [
+            [r.vehicle.start_depot] + [c.pos for c in r.clients] + [r.vehicle.end_depot] for r in sol.routes
+        ]
+        self.metrics = list(iter_route_metrics(sol))
+        self.totals = ReportSummary()
+        for m in self.metrics:
+            self.totals.add(m)
+        self.bounds = _bounds(self.paths)
+        self.segments = SegmentGrid(self.paths)
+
+        tree_box = self.bounds or (0.0, 0.0, 1.0, 1.0)
+        self.client_xy = np.array([c.pos for r in sol.routes for c in r.clients], dtype=float).reshape(-1, 2)
+        self.client_route = np.array([ri for ri, r in enumerate(sol.routes) for _ in r.clients], dtype=int)
+        self.client_tree = QuadTree(tree_box)
+        for i, (x, y) in enumerate(self.client_xy.tolist()):
+            self.client_tree.insert(i, (x, y, x, y))
+
+        # consecutive pieces share their end point, so drawing them all
+        # reproduces the route
+        self.chunks: List[Tuple[int, List[Point]]] = []
+        self.chunk_tree = QuadTree(tree_box)
+        for ri, path in enumerate(self.paths):
+            for start in range(0, max(1, len(path) - 1), CHUNK_SEGMENTS):
+                piece = path[start:start + CHUNK_SEGMENTS + 1]
+                if len(piece) >= 2:
+                    self.chunk_tree.insert(len(self.chunks), _bounds([piece]))
+                    self.chunks.append((ri, piece))
+        self._simplified: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def simplified(self, chunk: int, level: int) -> np.ndarray:
+        """Route piece simplified to 2**level world units, cached per level."""
+        pts = self._simplified.get((chunk, level))
+        if pts is None:
+            pts = np.array(simplify_polyline(self.chunks[chunk][1], 2.0 ** level), dtype=float)
+            self._simplified[(chunk, level)] = pts
+        return pts
+
+
+def _lod_level(scale: float) -> int:
+    """Simplification level (tolerance 2**level world units) for a scale in px per unit."""
+    return math.floor(math.log2(LOD_TOLERANCE_PX / scale))
+
+
+def _curve_surface(curve: Sequence[Tuple[int, float]], size: Tuple[int, int], font: pygame.font.Font) -> pygame.Surface:
+    """Best fitness per generation as a step plot (log scale on wide ranges)."""
+    surf = pygame.Surface(size)
+    surf.fill((250, 250, 250))
+    pygame.draw.rect(surf, (210, 210, 210), surf.get_rect(), width=1)
+    if not curve:
+        return surf
+    gens = [g for g, _ in curve]
+    fits = [f for _, f in curve]
+    log = min(fits) > 0 and max(fits) / min(fits) > 100
+    ys = [math.log10(f) for f in fits] if log else fits
+    g0, g1 = gens[0], max(gens[-1], gens[0] + 1)
+    y0, y1 = min(ys), max(ys)
+    y1 = y1 if y1 > y0 else y0 + 1
+    plot = pygame.Rect(8, 22, size[0] - 16, size[1] - 30)
+
+    def pt(g, y):
+        return (plot.x + int((g - g0) / (g1 - g0) * plot.width), plot.bottom - int((y - y0) / (y1 - y0) * plot.height))
+
+    pts = [pt(gens[0], ys[0])]
+    for g, y, y_prev in zip(gens[1:], ys[1:], ys[:-1]):
+        pts.append(pt(g, y_prev))
+        pts.append(pt(g, y))
+    if len(pts) >= 2:
+        pygame.draw.lines(surf, (66, 135, 245), False, pts, width=2)
+    label = f"melhor {fits[-1]:.1f} (ger. {gens[-1]})" + (" | log" if log else "")
+    surf.blit(font.render(label, True, (40, 40, 40)), (8, 4))
+    return surf
 
 
 def draw_solution(
@@ -19,10 +345,13 @@ def draw_solution(
     height: int = 520,
     scale_map: bool = True,
     weights: PenaltyWeights | None = None,
+    feed: Optional["LiveFeed"] = None,
 ) -> None:
+    """Interactive viewer. With feed (vrp_live), the solution is replaced by
+    the newest one the solver published, checked once per frame."""
     pygame.init()
     screen = pygame.display.set_mode((width, height))
-    pygame.display.set_caption("VRP Solution Viewer")
+    pygame.display.set_caption("VRP Solution Viewer" if feed is None else f"VRP ao vivo - {feed.status()}")
     clock = pygame.time.Clock()
 
     colors = [
@@ -58,31 +387,88 @@ def draw_solution(
     pan_x, pan_y = 0.0, 0.0
     pan_step = 30
 
-    def compute_map_scale_and_offset() -> Tuple[float, Tuple[float, float]]:
-        xs, ys = [], []
-        for r in sol.routes:
-            xs.extend([r.vehicle.start_depot[0], r.vehicle.end_depot[0]])
-            ys.extend([r.vehicle.start_depot[1], r.vehicle.end_depot[1]])
-            for c in r.clients:
-                xs.append(c.x)
-                ys.append(c.y)
-        if not xs or not ys:
-            return 1.0, (0.0, 0.0)
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
-        span_x = max(1.0, max_x - min_x)
-        span_y = max(1.0, max_y - min_y)
-        pad = 20
-        sx = (map_rect.width - 2 * pad) / span_x
-        sy = (map_rect.height - 2 * pad) / span_y
-        s = min(sx, sy)
-        off_x = map_rect.x + pad - min_x * s + (map_rect.width - 2 * pad - span_x * s) / 2
-        off_y = map_rect.y + pad - min_y * s + (map_rect.height - 2 * pad - span_y * s) / 2
-        return s, (off_x, off_y)
-
     def tx(pt, s, off):
         return int(pt[0] * s + off[0]), int(pt[1] * s + off[1])
 
+    scene = _Scene(sol)
+    s_fit, off_fit = (1.0, (0.0, 0.0)) if not scale_map else _fit_transform(scene.bounds, map_rect, 20)
+
+    # Mini-map: fixed transform, routes pre-rendered once per solution
+    mini_w, mini_h = 140, 100
+    mini_rect = pygame.Rect(map_rect.x + 10, map_rect.bottom - 10 - mini_h, mini_w, mini_h)
+
+    def build_mini_layer() -> Tuple[pygame.Surface, float, Tuple[float, float]]:
+        sm, offm = _fit_transform(scene.bounds, mini_rect, 6)
+        layer = pygame.Surface(mini_rect.size)
+        layer.fill((250, 250, 250))
+        pygame.draw.rect(layer, (210, 210, 210), layer.get_rect(), width=1)
+        mini_off = (offm[0] - mini_rect.x, offm[1] - mini_rect.y)
+        mini_level = _lod_level(sm)
+        for ci, (ri, _) in enumerate(scene.chunks):
+            pts = (scene.simplified(ci, mini_level) * sm + mini_off).astype(int).tolist()
+            pygame.draw.lines(layer, colors[ri % len(colors)], False, pts, width=1)
+        return layer, sm, offm
+
+    mini_layer, sm, offm = build_mini_layer()
+
+    # Live view: previous map layer being faded out, convergence curve
+    fade_from: Optional[pygame.Surface] = None
+    fade_t0 = 0.0
+    curve_rect = pygame.Rect(map_rect.right - 230, map_rect.y + 10, 220, 110)
+    curve_layer: Optional[pygame.Surface] = None
+    curve_len = -1
+
+    # Map layer: routes, clients and depots, redrawn only when zoom/pan change
+    map_layer = pygame.Surface(map_rect.size)
+    map_view = None
+
+    def render_map_layer(s_eff: float, off_eff: Tuple[float, float]) -> None:
+        off = np.array([off_eff[0] - map_rect.x, off_eff[1] - map_rect.y])
+        map_layer.fill((255, 255, 255))
+        # viewport in world coordinates, widened by the client circle radius
+        margin = 6
+        view = (
+            (-margin - off[0]) / s_eff, (-margin - off[1]) / s_eff,
+            (map_rect.width + margin - off[0]) / s_eff, (map_rect.height + margin - off[1]) / s_eff,
+        )
+        visible = scene.client_tree.query(view)
+        heatmap = bool(visible) and map_rect.width * map_rect.height / len(visible) < HEATMAP_SPACING_PX ** 2
+
+        # under the heatmap the routes are context only: one level coarser
+        level = _lod_level(s_eff) + (1 if heatmap else 0)
+        for ci in scene.chunk_tree.query(view):
+            ri = scene.chunks[ci][0]
+            pts = (scene.simplified(ci, level) * s_eff + off).astype(int).tolist()
+            pygame.draw.lines(map_layer, colors[ri % len(colors)], False, pts, width=1 if heatmap else 2)
+
+        if heatmap:
+            xy = scene.client_xy[visible] * s_eff + off
+            map_layer.blit(_heat_surface(xy, map_rect.size, HEATMAP_CELL_PX), (0, 0))
+        else:
+            xy = (scene.client_xy[visible] * s_eff + off).astype(int).tolist()
+            for i, p in zip(visible, xy):
+                pygame.draw.circle(map_layer, colors[scene.client_route[i] % len(colors)], p, 5)
+        for r in sol.routes:
+            x, y = r.vehicle.start_depot
+            if view[0] <= x <= view[2] and view[1] <= y <= view[3]:
+                pygame.draw.circle(map_layer, (0, 0, 0), tx(r.vehicle.start_depot, s_eff, off), 6, width=2)
+
+    # Rendered text and wrapped lines, reset when the font changes
+    text_cache: Dict[Tuple[str, Tuple[int, int, int]], pygame.Surface] = {}
+    wrap_cache: Dict[Tuple[str, int], List[str]] = {}
+
+    def render_text(text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        surf = text_cache.get((text, color))
+        if surf is None:
+            surf = text_cache[(text, color)] = font.render(text, True, color)
+        return surf
+
+    def wrapped(text: str, max_width: int) -> List[str]:
+        lines = wrap_cache.get((text, max_width))
+        if lines is None:
+            lines = wrap_cache[(text, max_width)] = wrap_text(text, font, max_width)
+        return lines
+
     def wrap_text(text: str, font_obj: pygame.font.Font, max_width: int) -> list[str]:
         words = text.split()
         lines = []
@@ -108,6 +494,23 @@ def draw_solution(
 
     running = True
     while running:
+        if feed is not None:
+            newest = feed.poll()  # only the latest update; stale ones are skipped
+            if newest is not None:
+                if sol.routes:
+                    fade_from, fade_t0 = map_layer.copy(), time.perf_counter()
+                sol = newest
+                scene = _Scene(sol)
+                if scale_map:
+                    s_fit, off_fit = _fit_transform(scene.bounds, map_rect, 20)
+                mini_layer, sm, offm = build_mini_layer()
+                map_view = None
+                text_cache.clear()
+                wrap_cache.clear()
+                pygame.display.set_caption(f"VRP ao vivo - {feed.status()}")
+            elif feed.done and not pygame.display.get_caption()[0].endswith("concluído"):
+                pygame.display.set_caption(f"VRP ao vivo - {feed.status()}")
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -124,6 +527,8 @@ def draw_solution(
                     ts = 18 if compact else base_title_size
                     font = pygame.font.SysFont(None, fs)
                     title_font = pygame.font.SysFont(None, ts)
+                    text_cache.clear()
+                    wrap_cache.clear()
                 elif event.key == pygame.K_PAGEUP:
                     page = max(0, page - 1)
                     scroll_offset = 0
@@ -168,62 +573,43 @@ def draw_solution(
             pygame.draw.rect(screen, (245, 245, 245), panel_rect)
             pygame.draw.rect(screen, (210, 210, 210), panel_rect, width=1)
 
-        s_fit, off_fit = (1.0, (0.0, 0.0)) if not scale_map else compute_map_scale_and_offset()
         s_eff = s_fit * zoom
         off_eff = (off_fit[0] + pan_x, off_fit[1] + pan_y)
+        if map_view != (s_eff, off_eff):
+            map_view = (s_eff, off_eff)
+            render_map_layer(s_eff, off_eff)
 
         # Map drawing
-        screen.set_clip(map_rect)
+        screen.blit(map_layer, map_rect)
+        if fade_from is not None:
+            t = (time.perf_counter() - fade_t0) / FADE_SECONDS
+            if t >= 1:
+                fade_from = None
+            else:
+                fade_from.set_alpha(int(255 * (1 - t)))
+                screen.blit(fade_from, map_rect)
+        if feed is not None:
+            if curve_len != len(feed.curve):
+                curve_len = len(feed.curve)
+                curve_layer = _curve_surface(feed.curve, curve_rect.size, font)
+            screen.blit(curve_layer, curve_rect)
         mouse_pos = pygame.mouse.get_pos()
         hover_info = None
-
-        def pt_seg_dist(p, a, b):
-            (px, py), (ax, ay), (bx, by) = p, a, b
-            abx, aby = bx - ax, by - ay
-            apx, apy = px - ax, py - ay
-            ab2 = abx * abx + aby * aby
-            t = 0.0 if ab2 == 0 else max(0.0, min(1.0, (apx * abx + apy * aby) / ab2))
-            cx, cy = ax + t * abx, ay + t * aby
-            dx, dy = px - cx, py - cy
-            return (dx * dx + dy * dy) ** 0.5
-
-        for idx, r in enumerate(sol.routes):
-            color = colors[idx % len(colors)]
-            pts = [r.vehicle.start_depot] + [c.pos for c in r.clients] + [r.vehicle.end_depot]
-            if len(pts) >= 2:
-                tpts = [tx(p, s_eff, off_eff) for p in pts]
-                pygame.draw.lines(screen, color, False, tpts, width=2)
-                if map_rect.collidepoint(mouse_pos):
-                    mind = 1e9
-                    for a, b in zip(tpts[:-1], tpts[1:]):
-                        d = pt_seg_dist(mouse_pos, a, b)
-                        if d < mind:
-                            mind = d
-                    if mind < 8.0:
-                        demand = r.total_demand()
-                        cap = r.vehicle.capacity
-                        dist = r.distance()
-                        rtime = evaluate_route_time(r)
-                        cap_v = capacity_violation(r)
-                        tw_v = time_window_violation(r)
-                        refr_v = refrigeration_violation(r)
-                        mrt_v = max_route_time_violation(r)
-                        hover_info = (
-                            mouse_pos,
-                            color,
-                            [
-                                f"Rota V{r.vehicle.id}",
-                                f"Clientes: {len(r.clients)} | Dem {demand}/{cap}",
-                                f"Dist {dist:.1f} | Tempo {rtime:.1f}",
-                                f"Viol: cap {cap_v:.1f}, tw {tw_v:.1f}, refr {refr_v:.1f}, mrt {mrt_v:.1f}",
-                            ],
-                        )
-            for c in r.clients:
-                cx, cy = tx((c.x, c.y), s_eff, off_eff)
-                pygame.draw.circle(screen, color, (int(cx), int(cy)), 5)
-            dx, dy = tx((r.vehicle.start_depot[0], r.vehicle.start_depot[1]), s_eff, off_eff)
-            pygame.draw.circle(screen, (0, 0, 0), (dx, dy), 6, width=2)
-        screen.set_clip(None)
+        if map_rect.collidepoint(mouse_pos) and s_eff != 0:
+            world = ((mouse_pos[0] - off_eff[0]) / s_eff, (mouse_pos[1] - off_eff[1]) / s_eff)
+            hit = scene.segments.nearest(world[0], world[1], 8.0 / s_eff)
+            if hit is not None:
+                m = scene.metrics[hit]
+                hover_info = (
+                    mouse_pos,
+                    colors[hit % len(colors)],
+                    [
+                        f"Rota V{m.vehicle_id}",
+                        f"Clientes: {len(m.client_ids)} | Dem {m.demand}/{sol.routes[hit].vehicle.capacity}",
+                        f"Dist {m.distance:.1f} | Tempo {m.time:.1f}",
+                        f"Viol: cap {m.capacity:.1f}, tw {m.time_window:.1f}, refr {m.refrigeration:.1f}, mrt {m.max_route_time:.1f}",
+                    ],
+                )
 
         # Tooltip
         if hover_info is not None:
@@ -242,45 +628,11 @@ def draw_solution(
             pygame.draw.rect(screen, color, tip_rect, width=2)
             cy = tip_y + pad
             for sline in lines:
-                surf = font.render(sline, True, (20, 20, 20))
-                screen.blit(surf, (tip_x + pad, cy))
+                screen.blit(render_text(sline, (20, 20, 20)), (tip_x + pad, cy))
                 cy += (18 if compact else 20)
 
         # Mini-map
-        mini_w, mini_h = 140, 100
-        mini_rect = pygame.Rect(map_rect.x + 10, map_rect.bottom - 10 - mini_h, mini_w, mini_h)
-        pygame.draw.rect(screen, (250, 250, 250), mini_rect)
-        pygame.draw.rect(screen, (210, 210, 210), mini_rect, width=1)
-
-        def compute_mini_transform():
-            xs, ys = [], []
-            for r in sol.routes:
-                xs.extend([r.vehicle.start_depot[0], r.vehicle.end_depot[0]])
-                ys.extend([r.vehicle.start_depot[1], r.vehicle.end_depot[1]])
-                for c in r.clients:
-                    xs.append(c.x)
-                    ys.append(c.y)
-            if not xs or not ys:
-                return 1.0, (mini_rect.x, mini_rect.y)
-            min_x, max_x = min(xs), max(xs)
-            min_y, max_y = min(ys), max(ys)
-            span_x = max(1.0, max_x - min_x)
-            span_y = max(1.0, max_y - min_y)
-            pad = 6
-            sx = (mini_rect.width - 2 * pad) / span_x
-            sy = (mini_rect.height - 2 * pad) / span_y
-            sm = min(sx, sy)
-            off_x = mini_rect.x + pad - min_x * sm + (mini_rect.width - 2 * pad - span_x * sm) / 2
-            off_y = mini_rect.y + pad - min_y * sm + (mini_rect.height - 2 * pad - span_y * sm) / 2
-            return sm, (off_x, off_y)
-
-        sm, offm = compute_mini_transform()
-        for idx, r in enumerate(sol.routes):
-            color = colors[idx % len(colors)]
-            pts = [r.vehicle.start_depot] + [c.pos for c in r.clients] + [r.vehicle.end_depot]
-            if len(pts) >= 2:
-                mpts = [tx(p, sm, offm) for p in pts]
-                pygame.draw.lines(screen, color, False, mpts, width=1)
+        screen.blit(mini_layer, mini_rect)
 
         vx0 = (map_rect.left - off_eff[0]) / (s_eff if s_eff != 0 else 1)
         vy0 = (map_rect.top - off_eff[1]) / (s_eff if s_eff != 0 else 1)
@@ -304,11 +656,9 @@ def draw_solution(
             line_h = (18 if compact else 20)
             detail_gap = (2 if compact else 4)
 
-            total_dist = sum(r.distance() for r in sol.routes)
-            tot_cap_v = sum(capacity_violation(r) for r in sol.routes)
-            tot_tw_v = sum(time_window_violation(r) for r in sol.routes)
-            tot_refr_v = sum(refrigeration_violation(r) for r in sol.routes)
-            tot_mrt_v = sum(max_route_time_violation(r) for r in sol.routes)
+            tot = scene.totals
+            total_dist = tot.distance
+            tot_cap_v, tot_tw_v, tot_refr_v, tot_mrt_v = tot.capacity, tot.time_window, tot.refrigeration, tot.max_route_time
             totals_line1 = f"Dist total: {total_dist:.1f}"
             if weights is not None:
                 pen_w = (
@@ -328,14 +678,14 @@ def draw_solution(
                     f"Viol (soma): cap {tot_cap_v:.1f}, tw {tot_tw_v:.1f}, refr {tot_refr_v:.1f}, mrt {tot_mrt_v:.1f}"
                 )
                 totals_line3 = None
-            t1 = font.render(totals_line1, True, (25, 25, 25))
-            t2 = font.render(totals_line2, True, (60, 60, 60))
+            t1 = render_text(totals_line1, (25, 25, 25))
+            t2 = render_text(totals_line2, (60, 60, 60))
             screen.blit(t1, (panel_rect.x + 10, panel_y))
             panel_y += (line_h if not compact else 16)
             screen.blit(t2, (panel_rect.x + 10, panel_y))
             panel_y += (line_h + 6 if not compact else 18)
             if totals_line3 is not None:
-                t3 = font.render(totals_line3, True, (25, 25, 25))
+                t3 = render_text(totals_line3, (25, 25, 25))
                 screen.blit(t3, (panel_rect.x + 10, panel_y))
                 panel_y += (line_h + 2 if not compact else 16)
 
@@ -353,39 +703,30 @@ def draw_solution(
 
             start_idx = page * routes_per_page
             end_idx = min(start_idx + routes_per_page, total_routes)
-            routes_slice = list(enumerate(sol.routes))[start_idx:end_idx]
+            routes_slice = [(i, sol.routes[i]) for i in range(start_idx, end_idx)]
 
             content_max_width = 0
             for idx, r in routes_slice:
                 color = colors[idx % len(colors)]
-                demand = r.total_demand()
-                cap = r.vehicle.capacity
-                dist = r.distance()
-                rtime = evaluate_route_time(r)
+                m = scene.metrics[idx]
                 sw = 12
                 pygame.draw.rect(screen, color, pygame.Rect(panel_rect.x + 10, panel_y + 3, sw, sw))
-                label = f"V{r.vehicle.id}: dem {demand}/{cap} | dist {dist:.1f} | time {rtime:.1f}"
+                label = f"V{m.vehicle_id}: dem {m.demand}/{r.vehicle.capacity} | dist {m.distance:.1f} | time {m.time:.1f}"
                 base_x = panel_rect.x + 10 + sw + 8
                 maxw = panel_rect.width - (base_x - panel_rect.x) - 10
-                wrapped = wrap_text(label, font, maxw)
-                measure_line = " ".join(wrapped) if wrapped else label
+                lines = wrapped(label, maxw)
+                measure_line = " ".join(lines) if lines else label
                 content_max_width = max(content_max_width, font.size(measure_line)[0])
-                for sub in wrapped:
-                    text = font.render(sub, True, (30, 30, 30))
-                    screen.blit(text, (base_x - int(h_scroll_offset), panel_y))
+                for sub in lines:
+                    screen.blit(render_text(sub, (30, 30, 30)), (base_x - int(h_scroll_offset), panel_y))
                     panel_y += line_h
 
-                cap_v = capacity_violation(r)
-                tw_v = time_window_violation(r)
-                refr_v = refrigeration_violation(r)
-                mrt_v = max_route_time_violation(r)
-                viol = f"viol: cap {cap_v:.1f}, tw {tw_v:.1f}, refr {refr_v:.1f}, mrt {mrt_v:.1f}"
-                wrapped2 = wrap_text(viol, font, maxw)
-                measure_line2 = " ".join(wrapped2) if wrapped2 else viol
+                viol = f"viol: cap {m.capacity:.1f}, tw {m.time_window:.1f}, refr {m.refrigeration:.1f}, mrt {m.max_route_time:.1f}"
+                lines2 = wrapped(viol, maxw)
+                measure_line2 = " ".join(lines2) if lines2 else viol
                 content_max_width = max(content_max_width, font.size(measure_line2)[0])
-                for sub in wrapped2:
-                    text2 = font.render(sub, True, (60, 60, 60))
-                    screen.blit(text2, (base_x - int(h_scroll_offset), panel_y))
+                for sub in lines2:
+                    screen.blit(render_text(sub, (60, 60, 60)), (base_x - int(h_scroll_offset), panel_y))
                     panel_y += line_h
                 panel_y += detail_gap
 
@@ -438,10 +779,10 @@ def draw_solution(
                 hthumb_rect = pygame.Rect(hthumb_x, htrack_rect.y + 1, hthumb_w, htrack_h - 2)
                 pygame.draw.rect(screen, (160, 160, 160), hthumb_rect)
 
-            footer = font.render(f"Página {page + 1}/{total_pages}", True, (90, 90, 90))
+            footer = render_text(f"Página {page + 1}/{total_pages}", (90, 90, 90))
             screen.blit(footer, (panel_rect.x + 10, panel_rect.bottom - 22))
 
         pygame.display.flip()
-        clock.tick(30)
+        clock.tick(60)
 
     pygame.quit()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import ast
+import json
+import random
+from typing import List, Sequence
+
+from vrp_models import Client, travel_cost
+from vrp_mutations import swap_mutation, relocate_mutation
+
+
+def load_prior_routes(path: str) -> List[List[int]]:
+    """Client ids per route from a previous run.
+
+    Accepts a JSON export ({"routes": [{"clients": [ids...]}, ...]} or
+    {"giant_tour": [ids...]}) or the text report written by vrp_ga.py
+    (rotas_otimizadas.txt, lines "Clientes: [..]").
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if path.endswith(".json"):
+        data = json.loads(text)
+        if "giant_tour" in data:
+            return [[int(i) for i in data["giant_tour"]]]
+        return [[int(i) for i in r["clients"]] for r in data.get("routes", [])]
+    routes: List[List[int]] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("Clientes:"):
+            routes.append([int(i) for i in ast.literal_eval(line.split(":", 1)[1].strip())])
+    return routes
+
+
+def map_to_instance(prior_ids: Sequence[int], clients: Sequence[Client]) -> List[int]:
+    """Giant tour of indices into `clients` following the prior order.
+    Removed clients are dropped; new ones are inserted where they add the
+    least distance between their tour neighbours."""
+    index_of = {c.id: i for i, c in enumerate(clients)}
+    tour: List[int] = []
+    seen = set()
+    for cid in prior_ids:
+        i = index_of.get(cid)
+        if i is not None and i not in seen:
+            tour.append(i)
+            seen.add(i)
+    for i, c in enumerate(clients):
+        if i in seen:
+            continue
+        best_pos, best_d = len(tour), float("inf")
+        for pos in range(len(tour) + 1):
+            d = 0.0
+            if pos > 0:
+                d += travel_cost(clients[tour[pos - 1]].pos, c.pos)
+            if pos < len(tour):
+                d += travel_cost(c.pos, clients[tour[pos]].pos)
+            if 0 < pos < len(tour):
+                d -= travel_cost(clients[tour[pos - 1]].pos, clients[tour[pos]].pos)
+            if d < best_d:
+                best_pos, best_d = pos, d
+        tour.insert(best_pos, i)
+        seen.add(i)
+    return tour
+
+
+def seed_population(tour: Sequence[int], n: int, strength: int = 3) -> List[List[int]]:
+    """The prior tour itself plus n - 1 copies perturbed by `strength` random
+    swap/relocate moves each."""
+    out = [list(tour)]
+    for _ in range(n - 1):
+        ind = list(tour)
+        for _ in range(random.randint(1, strength)):
+            random.choice([swap_mutation, relocate_mutation])(ind)
+        out.append(ind)
+    return out[:n]